@@ -8,6 +8,26 @@ import FreeCADGui
 import FreeCAD
 import os
 
+
+def _main_dialog_functions():
+    """
+    Import the BOQ dialog on first use and return its
+    (show_main_dialog, add_selected_objects), or None if it cannot load.
+    """
+    try:
+        from dialogs.main_dialog import show_main_dialog, add_selected_objects
+    except ImportError as e:
+        FreeCAD.Console.PrintError(f"Error importing main_dialog: {e}\n")
+        # Fallback to old qto_dialog if available
+        try:
+            import qto_dialog
+        except ImportError:
+            FreeCAD.Console.PrintError("Could not import dialog modules\n")
+            return None
+        return qto_dialog.show_dialog, qto_dialog.add_selected_objects
+    return show_main_dialog, add_selected_objects
+
+
 class QTOWorkbench(FreeCADGui.Workbench):
     """
     Quantity Takeoff Workbench
@@ -30,29 +50,17 @@ class QTOWorkbench(FreeCADGui.Workbench):
         """
         This function is executed when the workbench is first activated.
         It is executed only once in a FreeCAD session followed by the Activated function.
+        
+        Only commands are registered here; dialogs, Qt widgets and the
+        takeoff engine are imported when a command is first activated.
         """
-        # Import using absolute path with try/except for error handling
         import sys
-        import os
         
-        # Add current module path to sys.path
+        # Make the dialogs/utils packages importable for the commands
         module_path = os.path.dirname(__file__)
         if module_path not in sys.path:
             sys.path.insert(0, module_path)
         
-        try:
-            from dialogs.main_dialog import show_main_dialog, add_selected_objects
-        except ImportError as e:
-            FreeCAD.Console.PrintError(f"Error importing main_dialog: {e}\n")
-            # Fallback to old qto_dialog if available
-            try:
-                import qto_dialog
-                show_main_dialog = qto_dialog.show_dialog
-                add_selected_objects = qto_dialog.add_selected_objects
-            except ImportError:
-                FreeCAD.Console.PrintError("Could not import dialog modules\n")
-                return
-        
         # Create commands
         self.commands = ["QTO_OpenDialog", "QTO_ShowObjectInfo", "QTO_SelectObject"]
         
@@ -67,7 +75,9 @@ class QTOWorkbench(FreeCADGui.Workbench):
             
             def Activated(self):
                 """Called when the command is activated"""
-                show_main_dialog()
+                functions = _main_dialog_functions()
+                if functions:
+                    functions[0]()
             
             def IsActive(self):
                 """Return True when the command should be active"""
@@ -92,13 +102,6 @@ class QTOWorkbench(FreeCADGui.Workbench):
             def Activated(self):
                 """Called when the command is activated"""
                 try:
-                    # Import with absolute path
-                    import sys
-                    import os
-                    module_path = os.path.dirname(__file__)
-                    if module_path not in sys.path:
-                        sys.path.insert(0, module_path)
-                    
                     from dialogs.object_info_dialog import ObjectInfoDialog
                     
                     if not FreeCAD.ActiveDocument:
@@ -140,11 +143,46 @@ class QTOWorkbench(FreeCADGui.Workbench):
                 """Called when the command is activated"""
                 # Get selected objects
                 selection = FreeCADGui.Selection.getSelection()
-                if selection:
-                    add_selected_objects(selection)
-                    FreeCAD.Console.PrintMessage(f"เพิ่ม {len(selection)} ชิ้นงานเข้าตาราง\\n")
-                else:
+                if not selection:
                     FreeCAD.Console.PrintMessage("กรุณาเลือกชิ้นงานใน 3D view ก่อน\\n")
+                    return
+                functions = _main_dialog_functions()
+                if functions:
+                    functions[1](selection)
+                    FreeCAD.Console.PrintMessage(f"เพิ่ม {len(selection)} ชิ้นงานเข้าตาราง\\n")
+            
+            def IsActive(self):
+                """Return True when the command should be active"""
+                return FreeCAD.ActiveDocument is not None
+            
+            def _get_icon_path(self):
+                """Get the path to the command icon"""
+                icon_path = os.path.join(os.path.dirname(__file__), "resources", "icons", "qto.svg")
+                if os.path.exists(icon_path):
+                    return icon_path
+                return ""
+        
+        # Create the region takeoff commands (selection-driven, spatially indexed)
+        class QTORegionCommand:
+            """Base for commands that show the takeoff of part of the model"""
+            function_name = ""
+            menu_text = ""
+            tooltip = ""
+            
+            def GetResources(self):
+                return {
+                    'Pixmap': self._get_icon_path(),
+                    'MenuText': self.menu_text,
+                    'ToolTip': self.tooltip
+                }
+            
+            def Activated(self):
+                """Called when the command is activated"""
+                try:
+                    import dialogs.main_dialog as main_dialog
+                    getattr(main_dialog, self.function_name)(FreeCADGui.Selection.getSelection())
+                except Exception as e:
+                    FreeCAD.Console.PrintError(f"Error in region takeoff: {e}\n")
             
             def IsActive(self):
                 """Return True when the command should be active"""
@@ -157,14 +195,60 @@ class QTOWorkbench(FreeCADGui.Workbench):
                     return icon_path
                 return ""
         
+        class QTOTakeoffRegionCommand(QTORegionCommand):
+            function_name = "takeoff_region"
+            menu_text = "Takeoff in region"
+            tooltip = "Show the quantities of objects inside the bounding box of the selected objects"
+            
+            def IsActive(self):
+                """Active while objects that define the region are selected"""
+                return bool(FreeCADGui.Selection.getSelection())
+        
+        class QTOTakeoffLevelCommand(QTORegionCommand):
+            function_name = "takeoff_level"
+            menu_text = "Takeoff by level"
+            tooltip = "Show the quantities of one level: the selected level, or an elevation range"
+        
+        class QTOTakeoffIntersectingCommand(QTORegionCommand):
+            function_name = "takeoff_intersecting"
+            menu_text = "Takeoff intersecting solid"
+            tooltip = "Show the quantities of objects intersecting the selected solid"
+        
+        self.region_commands = ["QTO_TakeoffRegion", "QTO_TakeoffLevel", "QTO_TakeoffIntersecting"]
+        
+        # Create the profiling toggle command
+        class QTOToggleProfilingCommand:
+            def GetResources(self):
+                return {
+                    'MenuText': 'Record performance trace',
+                    'ToolTip': 'Record timings of loading, extraction, calculation and export '
+                               'to a Chrome trace file (open in chrome://tracing or Perfetto)',
+                    # Checkable menu item, unticked at startup since recording starts off
+                    'Checkable': False
+                }
+            
+            def Activated(self, checked=None):
+                """Start recording the trace when ticked, stop and write it when unticked"""
+                from utils.profiling import toggle_profiling
+                toggle_profiling(enable=None if checked is None else bool(checked))
+            
+            def IsActive(self):
+                """Return True when the command should be active"""
+                return True
+        
         # Register the commands
         FreeCADGui.addCommand('QTO_OpenDialog', QTOOpenDialogCommand())
         FreeCADGui.addCommand('QTO_ShowObjectInfo', QTOShowObjectInfoCommand())
         FreeCADGui.addCommand('QTO_SelectObject', QTOSelectObjectCommand())
+        FreeCADGui.addCommand('QTO_TakeoffRegion', QTOTakeoffRegionCommand())
+        FreeCADGui.addCommand('QTO_TakeoffLevel', QTOTakeoffLevelCommand())
+        FreeCADGui.addCommand('QTO_TakeoffIntersecting', QTOTakeoffIntersectingCommand())
+        FreeCADGui.addCommand('QTO_ToggleProfiling', QTOToggleProfilingCommand())
         
-        # Add to toolbar and menu
-        self.appendToolbar("Quantity Takeoff", self.commands)
-        self.appendMenu("Quantity Takeoff", self.commands)
+        # Add to toolbar and menu; profiling is a menu entry only
+        self.appendToolbar("Quantity Takeoff", self.commands + self.region_commands)
+        self.appendMenu("Quantity Takeoff", self.commands + ["Separator"] + self.region_commands
+                        + ["Separator", "QTO_ToggleProfiling"])
     
     def Activated(self):
         """
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+ExportWorker - Runs streaming exports on a worker thread with a progress bar
+"""
+
+try:
+    from PySide2.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+    from PySide2.QtCore import Qt, QThread, Signal
+except ImportError:
+    try:
+        from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+        from PyQt5.QtCore import Qt, QThread, pyqtSignal as Signal
+    except ImportError as e:
+        print(f"Error importing Qt modules: {e}")
+        QThread = object
+
+import os
+
+import FreeCAD
+
+from utils.exporters import available_formats, export_rows
+from utils.profiling import span
+
+
+class ExportCancelled(Exception):
+    """Raised inside the worker when the user cancels the export"""
+
+
+class ExportWorker(QThread):
+    """
+    Streams rows to a file on a worker thread.
+
+    ``rows`` must not read from Qt widgets; pass records of a
+    TableData snapshot so the table can keep changing meanwhile.
+    """
+
+    progress = Signal(int)
+    failed = Signal(str)
+
+    def __init__(self, filename, header, rows, parent=None):
+        super().__init__(parent)
+        self.filename = filename
+        self.header = header
+        self.rows = rows
+        self.written = 0
+        self.cancelled = False
+
+    def cancel(self):
+        """Ask the worker to stop at the next row"""
+        self.cancelled = True
+
+    def _checked_rows(self):
+        for row in self.rows:
+            if self.cancelled:
+                raise ExportCancelled()
+            yield row
+
+    def run(self):
+        try:
+            with span('export', filename=os.path.basename(self.filename)):
+                self.written = export_rows(self.filename, self.header, self._checked_rows(), self.progress.emit)
+        except ExportCancelled:
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+def get_export_filename(parent, title):
+    """Ask for an export file; the extension follows the selected format"""
+    formats = available_formats()
+    filename, selected_filter = QFileDialog.getSaveFileName(
+        parent, title, "", ";;".join(formats.values()))
+    if filename and not os.path.splitext(filename)[1]:
+        for extension, file_filter in formats.items():
+            if file_filter == selected_filter:
+                filename += extension
+                break
+    return filename
+
+
+def start_export(parent, filename, header, rows, total, done_message):
+    """Export ``rows`` to ``filename`` in the background, showing progress"""
+    progress_dialog = QProgressDialog("Exporting...", "Cancel", 0, max(total, 1), parent)
+    progress_dialog.setWindowTitle("Export")
+    progress_dialog.setWindowModality(Qt.WindowModal)
+    progress_dialog.setMinimumDuration(500)
+
+    worker = ExportWorker(filename, header, rows, parent)
+    errors = []
+
+    def on_failed(message):
+        errors.append(message)
+
+    def on_finished():
+        progress_dialog.close()
+        if errors:
+            QMessageBox.critical(parent, "Error", f"Error exporting data: {errors[0]}")
+            FreeCAD.Console.PrintError(f"Error exporting data: {errors[0]}\n")
+        elif not worker.cancelled:
+            QMessageBox.information(parent, "Success", f"{done_message} {filename}")
+            FreeCAD.Console.PrintMessage(f"{done_message} {filename}\n")
+        worker.deleteLater()
+
+    worker.progress.connect(progress_dialog.setValue)
+    worker.failed.connect(on_failed)
+    worker.finished.connect(on_finished)
+    progress_dialog.canceled.connect(worker.cancel)
+    worker.start()
+    return worker
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+GroupedBOQModel - Collapsible tree of BOQ groups with subtotal rows
+"""
+
+try:
+    from PySide2 import QtCore
+    from PySide2.QtCore import Qt, QAbstractItemModel, QModelIndex, Signal
+    from PySide2.QtGui import QFont
+except ImportError:
+    try:
+        from PyQt5 import QtCore
+        from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal as Signal
+        from PyQt5.QtGui import QFont
+    except ImportError as e:
+        print(f"Error importing Qt modules: {e}")
+        QtCore = None
+
+from dialogs.table_model import SORT_ROLE
+from utils.grouping import SUM_KEYS, BOQGroups
+from utils.table_data import TableData
+
+
+class _GroupNode:
+    """Parent marker stored in the internal pointer of a group's child indexes"""
+
+    def __init__(self, key):
+        self.key = key
+
+
+class GroupedBOQModel(QAbstractItemModel):
+    """
+    Two-level tree over BOQGroups: one subtotal row per group, with the
+    group's table rows as children.
+
+    Subtotals are read from the incrementally maintained group sums, so
+    no child rows are scanned to paint a group row.
+    """
+
+    # Emitted after the user edited a cell: (table row, column key)
+    valueEdited = Signal(int, str)
+
+    def __init__(self, data: TableData, groups: BOQGroups = None, parent=None):
+        super().__init__(parent)
+        self.table_data = data
+        self.groups = groups
+        self._root = _GroupNode(None)
+        self._nodes = {}
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self._italic = QFont()
+        self._italic.setItalic(True)
+
+    def set_groups(self, groups):
+        """Show ``groups`` (or nothing for None)"""
+        self.beginResetModel()
+        self.groups = groups
+        self._nodes = {}
+        self.endResetModel()
+
+    def groups_changed(self):
+        """Notify views that groups were added, removed or regrouped"""
+        self.beginResetModel()
+        self._nodes = {}
+        self.endResetModel()
+
+    def _node(self, key):
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = _GroupNode(key)
+        return node
+
+    def source_row(self, index):
+        """Return the table row of a child index, or None for a group index"""
+        if not index.isValid() or index.internalPointer() is self._root:
+            return None
+        return self.groups.groups[index.internalPointer().key].rows[index.row()]
+
+    # Qt model interface
+
+    def index(self, row, column, parent=QModelIndex()):
+        if self.groups is None or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, self._root)
+        return self.createIndex(row, column, self._node(self.groups.group(parent.row()).key))
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(self.groups.index_of(node.key), 0, self._root)
+
+    def rowCount(self, parent=QModelIndex()):
+        if self.groups is None:
+            return 0
+        if not parent.isValid():
+            return len(self.groups)
+        if parent.internalPointer() is self._root and parent.column() == 0:
+            return len(self.groups.group(parent.row()))
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.table_data.specs)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.table_data.specs[section].header
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        spec = self.table_data.specs[index.column()]
+        row = self.source_row(index)
+
+        if row is None:
+            group = self.groups.group(index.row())
+            if role == Qt.DisplayRole:
+                if index.column() == 0:
+                    return f"{group.key} ({len(group)})"
+                if spec.key in SUM_KEYS:
+                    return spec.formatter(group.sums[spec.key])
+                return ""
+            if role == SORT_ROLE:
+                return group.sums.get(spec.key, group.key)
+            if role == Qt.FontRole:
+                return self._bold
+        else:
+            if role == Qt.DisplayRole:
+                return self.table_data.display(row, index.column())
+            if role in (Qt.EditRole, SORT_ROLE):
+                return self.table_data.value(row, spec.key)
+            if role == Qt.ToolTipRole and spec.note is not None:
+                return self.table_data.note(row, index.column())
+            if role == Qt.FontRole and spec.note is not None and self.table_data.note(row, index.column()):
+                return self._italic
+        if role == Qt.TextAlignmentRole and spec.numeric:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.source_row(index) is not None and self.table_data.specs[index.column()].editable:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        row = self.source_row(index)
+        if role != Qt.EditRole or row is None:
+            return False
+        spec = self.table_data.specs[index.column()]
+        if not spec.editable:
+            return False
+        try:
+            value = float(str(value).replace(',', '') or 0)
+        except (ValueError, TypeError):
+            return False
+        self.table_data.set_value(row, spec.key, value)
+        self.dataChanged.emit(index, index)
+        self.valueEdited.emit(row, spec.key)
+        return True
+
+    # Incremental updates
+
+    def row_changed(self, row):
+        """Notify views that a table row and its group's subtotals changed"""
+        if self.groups is None:
+            return
+        group = self.groups.row_group(row)
+        position = self.groups.index_of(group.key)
+        last_col = self.columnCount() - 1
+        group_index = self.createIndex(position, 0, self._root)
+        self.dataChanged.emit(group_index, self.createIndex(position, last_col, self._root))
+        child = group.rows.index(row)
+        node = self._node(group.key)
+        self.dataChanged.emit(self.createIndex(child, 0, node), self.createIndex(child, last_col, node))
@@ -5,13 +5,13 @@ QuantityTakeoffMainDialog - Main BOQ Dialog for construction quantity takeoff
 
 try:
     from PySide2 import QtWidgets, QtCore, QtGui
-    from PySide2.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QFileDialog, QLabel
+    from PySide2.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QHeaderView, QMessageBox, QLabel, QProgressBar, QComboBox, QTreeView, QInputDialog, QCheckBox
     from PySide2.QtCore import Qt, QTimer, Signal
     from PySide2.QtGui import QFont
 except ImportError:
     try:
         from PyQt5 import QtWidgets, QtCore, QtGui
-        from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QFileDialog, QLabel
+        from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QHeaderView, QMessageBox, QLabel, QProgressBar, QComboBox, QTreeView, QInputDialog, QCheckBox
         from PyQt5.QtCore import Qt, QTimer, pyqtSignal as Signal
         from PyQt5.QtGui import QFont
     except ImportError as e:
@@ -20,16 +20,25 @@ except ImportError:
 
 import FreeCAD
 import FreeCADGui
-import csv
-import os
-import sys
-
-# Add the module path to sys.path for absolute imports
-module_path = os.path.dirname(os.path.dirname(__file__))
-if module_path not in sys.path:
-    sys.path.insert(0, module_path)
 
+from dialogs.export_worker import get_export_filename, start_export
+from dialogs.group_model import GroupedBOQModel
+from dialogs.table_model import ColumnarTableModel, RowFilterProxyModel
+from utils.approximation import PRECISION_KEY, precision_summary
+from utils.boq import BOQ_COLUMNS, PRICE_KEYS, BOQTotals, catalog_prices, new_boq_data
 from utils.calculations import QTOCalculator
+from utils.extraction import LAZY_KEYS, takeoff_objects
+from utils.grouping import GROUP_BY, group_boq
+from utils.profiling import span
+from utils.snapshot import (SIGNATURE_KEY, load_snapshot, object_signatures, save_snapshot,
+                            snapshot_path_for_document, stale_changes)
+from utils.spatial_index import SpatialGrid, level_range, object_bounds, query_solid, union_bounds
+from utils.takeoff_store import store_for_document
+
+# Delay used to coalesce bursts of document events into one table update (ms)
+SYNC_INTERVAL_MS = 300
+# Objects measured per event-loop turn while loading a document
+LOAD_CHUNK_SIZE = 200
 
 class QuantityTakeoffMainDialog(QMainWindow):
     """
@@ -39,8 +48,17 @@ class QuantityTakeoffMainDialog(QMainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.calculator = QTOCalculator()
+        self.store = None  # Shared takeoff values of the shown document
+        self.observer = None  # Subscription to the store's document changes
+        self._row_index = {}  # Object Name -> list of table rows
+        self._load_chunks = None  # Pending PropertyTable chunks while loading
+        self._snapshot_path = None  # Where the current takeoff is saved on close
+        self.approximate = False  # Fast estimate: solids are not measured
+        self._loaded_approximate = False  # Mode the rows in the table were loaded in
         self.setupUI()
         self.setupTable()
+        self.setupSyncTimer()
+        self.setupLoadTimer()
         self.load_objects_from_document()
         
     def setupUI(self):
@@ -80,17 +98,62 @@ class QuantityTakeoffMainDialog(QMainWindow):
         self.export_btn.clicked.connect(self.export_to_csv)
         button_layout.addWidget(self.export_btn)
         
+        button_layout.addWidget(QLabel("Group by:"))
+        self.group_by = QComboBox()
+        self.group_by.addItem("None")
+        self.group_by.addItems(list(GROUP_BY))
+        self.group_by.currentTextChanged.connect(self.set_group_by)
+        button_layout.addWidget(self.group_by)
+        
+        self.approximate_check = QCheckBox("Fast estimate")
+        self.approximate_check.setToolTip("Estimate Volume/Area from dimensions and bounding boxes "
+                                          "instead of measuring solids; estimated cells are shown in italics")
+        self.approximate_check.toggled.connect(self.set_approximate)
+        button_layout.addWidget(self.approximate_check)
+        
         button_layout.addStretch()
         layout.addLayout(button_layout)
+
+        # Loading progress (hidden unless a document is being loaded)
+        self.load_progress = QProgressBar()
+        self.load_progress.setFormat("Loading objects... %v / %m")
+        self.load_progress.hide()
+        self.cancel_load_btn = QPushButton("Cancel")
+        self.cancel_load_btn.clicked.connect(self.cancel_loading)
+        self.cancel_load_btn.hide()
+        progress_layout = QHBoxLayout()
+        progress_layout.addWidget(self.load_progress)
+        progress_layout.addWidget(self.cancel_load_btn)
+        layout.addLayout(progress_layout)
+
+        # Region/level takeoff scope (hidden unless a region is shown)
+        self.scope_label = QLabel()
+        self.scope_label.hide()
+        self.clear_scope_btn = QPushButton("Show All")
+        self.clear_scope_btn.clicked.connect(self.clear_scope)
+        self.clear_scope_btn.hide()
+        scope_layout = QHBoxLayout()
+        scope_layout.addWidget(self.scope_label)
+        scope_layout.addStretch()
+        scope_layout.addWidget(self.clear_scope_btn)
+        layout.addLayout(scope_layout)
         
-        # Table
-        self.table = QTableWidget()
+        # Table (flat) and tree (grouped); only one is visible
+        self.table = QTableView()
         layout.addWidget(self.table)
+        self.tree = QTreeView()
+        self.tree.hide()
+        layout.addWidget(self.tree)
         
         # Grand total layout
         total_layout = QHBoxLayout()
         total_layout.addStretch()
         
+        self.material_total_label = QLabel("Material: 0.00")
+        total_layout.addWidget(self.material_total_label)
+        self.labor_total_label = QLabel("Labor: 0.00")
+        total_layout.addWidget(self.labor_total_label)
+
         self.grand_total_label = QLabel("Grand Total: 0.00")
         self.grand_total_label.setFont(QFont("Arial", 12, QFont.Bold))
         total_layout.addWidget(self.grand_total_label)
@@ -99,178 +162,431 @@ class QuantityTakeoffMainDialog(QMainWindow):
         
     def setupTable(self):
         """Setup the main BOQ table"""
-        # BOQ columns for construction
-        self.columns = [
-            "Object Name", "Object Type", "Material", "Length (m)", "Width (m)", 
-            "Height (m)", "Volume (m³)", "Area (m²)", "Quantity", "Unit Weight (kg)",
-            "Material/unit", "Labor/unit", "Material Total", "Labor Total", "Total"
-        ]
-        
-        self.table.setColumnCount(len(self.columns))
-        self.table.setHorizontalHeaderLabels(self.columns)
+        self.columns = [spec.header for spec in BOQ_COLUMNS]
+        self.table_data = new_boq_data()
+        self.totals = BOQTotals()  # Running totals, kept in step with row edits
+        # Volume/Area are measured only for rows that are shown or exported
+        self.table_data.set_lazy(LAZY_KEYS, self.measure_rows, self.rows_measured)
+        self.model = ColumnarTableModel(self.table_data, self)
+        # Region takeoffs show a subset of rows through the proxy
+        self.proxy = RowFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table.setModel(self.proxy)
+        self.spatial_index = SpatialGrid()  # Object bounding boxes, kept in step with the rows
+        self._scope = None  # (description, query) of the region being shown
         
         # Set column widths
         header = self.table.horizontalHeader()
-        for i in range(len(self.columns)):
-            if i < 3:  # Name, Type, Material
-                header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
-            else:
-                header.setSectionResizeMode(i, QHeaderView.Interactive)
-                self.table.setColumnWidth(i, 100)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        for i, spec in enumerate(BOQ_COLUMNS):
+            self.table.setColumnWidth(i, spec.width)
         
-        # Enable editing for price columns only
+        # Enable editing for price columns only (see ColumnSpec.editable)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked)
-        self.table.itemChanged.connect(self.on_item_changed)
+        self.model.valueEdited.connect(self.on_value_edited)
+        
+        # Grouped view: subtotal rows with the objects of each group as children
+        self.groups = None
+        self.group_model = GroupedBOQModel(self.table_data, None, self)
+        self.tree.setModel(self.group_model)
+        self.tree.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked)
+        for i, spec in enumerate(BOQ_COLUMNS):
+            self.tree.setColumnWidth(i, spec.width)
+        self.group_model.valueEdited.connect(self.on_value_edited)
         
+    def setupSyncTimer(self):
+        """Setup the timer that batches document events into one table update"""
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(SYNC_INTERVAL_MS)
+        self.sync_timer.timeout.connect(self.sync_document_changes)
+
+    def setupLoadTimer(self):
+        """Setup the timer that measures one chunk of objects per event-loop turn"""
+        # FreeCAD objects must only be touched from the GUI thread, so loading
+        # is chunked through the event loop instead of running on a QThread
+        self.load_timer = QTimer(self)
+        self.load_timer.setInterval(0)
+        self.load_timer.timeout.connect(self.load_next_chunk)
+
+    def watch_document(self, doc):
+        """Subscribe to the document's takeoff store so edits patch only the affected rows"""
+        self.unwatch_document()
+        self.store = store_for_document(doc)
+        self.observer = self.store.subscribe(self.sync_timer.start)
+
+    def unwatch_document(self):
+        """Unsubscribe from the takeoff store, if any"""
+        if self.observer is not None:
+            self.observer.close()
+            self.observer = None
+        self.sync_timer.stop()
+
     def load_objects_from_document(self):
-        """Load objects from current FreeCAD document"""
+        """Start loading objects from the current FreeCAD document"""
+        if self.is_loading():
+            self.finish_loading()
+        self.write_snapshot()
         if not FreeCAD.ActiveDocument:
             return
-            
-        objects = FreeCAD.ActiveDocument.Objects
-        self.table.setRowCount(len(objects))
-        
-        for row, obj in enumerate(objects):
-            props = self.calculator.get_object_properties(obj)
-            
-            # Fill non-editable columns
-            for col, (key, value) in enumerate(props.items()):
-                if col < 10:  # First 10 columns are from object properties
-                    item = QTableWidgetItem(str(value))
-                    if col < 10:  # Make first 10 columns read-only
-                        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                    self.table.setItem(row, col, item)
-            
-            # Add editable price columns
-            for col in range(10, 15):
-                item = QTableWidgetItem("0")
-                if col in [10, 11]:  # Material/unit and Labor/unit are editable
-                    item.setFlags(item.flags() | Qt.ItemIsEditable)
-                else:  # Total columns are calculated
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row, col, item)
-        
-        self.calculate_totals()
+
+        doc = FreeCAD.ActiveDocument
+        self._loaded_approximate = self.approximate
+        # Containers, sketches and datum features never become rows
+        objects = takeoff_objects(doc.Objects)
+        self._snapshot_path = snapshot_path_for_document(doc)
+        with span('load.snapshot'):
+            # Snapshots hold measured takeoffs only
+            snapshot = None if self.approximate else load_snapshot(self._snapshot_path)
+            if snapshot is not None and snapshot.rows:
+                self.clear_scope()
+                self.restore_snapshot(doc, objects, snapshot)
+                return
+
+        # Edits made while loading are recorded and applied once loading ends
+        self.watch_document(doc)
+        self._load_position = 0
+        # Rows another view already extracted come from the store as they are
+        self._load_chunks = self.store.iter_properties(objects, LOAD_CHUNK_SIZE, self.approximate)
+        self.model.reset_rows()
+        self.totals.reset()
+        self.regroup()
+        self._row_index = {}
+        self.spatial_index.clear()
+        self.clear_scope()
+
+        self.set_loading(True, len(objects))
+        self.load_timer.start()
+
+    def load_next_chunk(self):
+        """Measure and append the next chunk of objects"""
+        try:
+            with span('load.extract', position=self._load_position):
+                objects, properties = next(self._load_chunks)
+        except StopIteration:
+            self.finish_loading()
+            return
+
+        # Unit prices are pre-filled from the material catalog
+        extra = catalog_prices(self.store.catalog, properties)
+        extra[SIGNATURE_KEY] = object_signatures(objects)
+        self.spatial_index.insert_objects(objects, self.store.bounds)
+        self._load_position += len(objects)
+        with span('populate', rows=len(properties)):
+            rows = self.model.append_properties(properties, extra)
+            self.rows_added(rows)
+        self.load_progress.setValue(self.load_progress.value() + len(properties))
+        self.update_grand_total()
+
+    def finish_loading(self):
+        """Stop loading and enable calculation and export"""
+        self.load_timer.stop()
+        self._load_chunks = None
+        self.store.save()
+        self.set_loading(False)
+        self.update_grand_total()
+        if self.approximate:
+            FreeCAD.Console.PrintMessage(f"Fast estimate: {self.precision_summary()}\n")
+        if self.observer is not None:
+            self.sync_timer.start()
+
+    def cancel_loading(self):
+        """Stop loading, keeping the rows loaded so far"""
+        if self._load_chunks is None:
+            return
+        self.finish_loading()
+        FreeCAD.Console.PrintMessage(f"Loading cancelled after {len(self.table_data)} objects\n")
+
+    def is_loading(self):
+        """Return True while a document is being loaded"""
+        return self._load_chunks is not None
+
+    def restore_snapshot(self, doc, objects, snapshot):
+        """
+        Show a saved takeoff (with its entered prices) immediately and
+        re-extract only the rows whose objects were added, changed or
+        deleted since it was saved.
+        """
+        self.model.replace_columns(snapshot.columns, snapshot.rows)
+        self.totals.recompute(self.table_data)
+        self.rebuild_row_index()
+        self.regroup()
+        bounds = {}
+        changes = stale_changes(self.table_data.column('Name'), self.table_data.column(SIGNATURE_KEY),
+                                objects, bounds)
+        self.spatial_index.clear()
+        self.spatial_index.insert_objects(objects, bounds)
+        self.watch_document(doc)
+        self.apply_changes(doc, changes)
+        FreeCAD.Console.PrintMessage(
+            f"Takeoff snapshot loaded: {snapshot.rows} rows, {len(changes.changed)} changed, "
+            f"{len(changes.created)} new, {len(changes.deleted)} deleted objects\n")
+
+    def write_snapshot(self):
+        """Save the current takeoff, entered prices included, next to its document"""
+        # Estimates are not saved: their signatures would hide that they were never measured.
+        # The rows' own mode is checked, as self.approximate has already changed when switching.
+        if self._snapshot_path and len(self.table_data) and not self._loaded_approximate:
+            save_snapshot(self._snapshot_path, self.table_data)
+
+    def set_loading(self, loading, total=0):
+        """Show the progress bar and disable Calculate/Export while loading"""
+        if loading:
+            self.load_progress.setRange(0, total)
+            self.load_progress.setValue(0)
+        self.load_progress.setVisible(loading)
+        self.cancel_load_btn.setVisible(loading)
+        self.calculate_btn.setEnabled(not loading)
+        self.export_btn.setEnabled(not loading)
 
     def append_objects(self, objects):
         """Append provided FreeCAD objects to the table"""
         if not objects:
             return
 
-        start_row = self.table.rowCount()
-        self.table.setRowCount(start_row + len(objects))
-
-        for index, obj in enumerate(objects):
-            row = start_row + index
-            props = self.calculator.get_object_properties(obj)
-
-            # Fill non-editable columns with object properties
-            for col, (key, value) in enumerate(props.items()):
-                if col < 10:
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                    self.table.setItem(row, col, item)
-
-            # Add editable and calculated price columns
-            for col in range(10, 15):
-                item = QTableWidgetItem("0")
-                if col in [10, 11]:
-                    item.setFlags(item.flags() | Qt.ItemIsEditable)
-                else:
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row, col, item)
-
-            # Initialize totals for the new row
-            self.calculate_row_totals(row)
+        objects = takeoff_objects(objects)
+        if not objects:
+            return
+        store = self.store or store_for_document(objects[0].Document)
+        properties = store.properties(objects, self.approximate)
+        extra = catalog_prices(store.catalog, properties)
+        extra[SIGNATURE_KEY] = object_signatures(objects)
+        rows = self.model.append_properties(properties, extra)
+        self.rows_added(rows)
+        if rows:
+            self.model.rows_changed(rows[0], rows[-1])
+        self.spatial_index.insert_objects(objects, store.bounds)
+        self.apply_scope()
 
         # Update grand total after appending
         self.update_grand_total()
 
-    def on_item_changed(self, item):
-        """Handle item changes in table"""
-        row = item.row()
-        col = item.column()
-        
+    def rows_added(self, rows):
+        """Index, total and group rows that were just appended to the table"""
+        for row in rows:
+            self._row_index.setdefault(self.table_data.value(row, 'Name'), []).append(row)
+            self.totals.update_row(self.table_data, row)
+        if self.groups is not None and rows:
+            self.groups.add_rows(rows)
+            self.group_model.groups_changed()
+
+    def rebuild_row_index(self):
+        """Rebuild the Object Name -> rows index from the table data"""
+        self._row_index = {}
+        for row, name in enumerate(self.table_data.column('Name')):
+            self._row_index.setdefault(name, []).append(row)
+
+    def sync_document_changes(self):
+        """Apply document changes recorded since the last sync to the table"""
+        if self.observer is None or self.is_loading():
+            return
+        if self.observer.document_closed:
+            self.unwatch_document()
+            self.write_snapshot()
+            return
+
+        changes = self.observer.take_changes()
+        if changes:
+            with span('sync', created=len(changes.created), changed=len(changes.changed),
+                      deleted=len(changes.deleted)):
+                self.apply_changes(FreeCAD.getDocument(self.observer.document_name), changes)
+
+    def apply_changes(self, doc, changes):
+        """Patch the rows of created, changed and deleted objects of ``doc``"""
+
+        # Remove deleted objects
+        deleted_rows = [row for name in changes.deleted for row in self._row_index.get(name, [])]
+        for name in changes.deleted:
+            self.spatial_index.remove(name)
+        if deleted_rows:
+            self.totals.remove_rows(self.table_data, deleted_rows)
+            if self.groups is not None:
+                self.groups.remove_rows(deleted_rows)
+            self.model.remove_rows(deleted_rows)
+            self.group_model.groups_changed()
+            self.rebuild_row_index()
+
+        # Re-measure changed objects in place; price columns are kept
+        changed = [doc.getObject(name) for name in changes.changed if name in self._row_index]
+        changed = [obj for obj in changed if obj is not None]
+        if changed:
+            properties = self.store.properties(changed, self.approximate)
+            self.spatial_index.insert_objects(changed, self.store.bounds)
+            signatures = object_signatures(changed)
+            for index in range(len(properties)):
+                for row in self._row_index[properties.value(index, 'Name')]:
+                    self.table_data.update_properties(row, properties, index)
+                    self.table_data.set_value(row, SIGNATURE_KEY, signatures[index])
+                    self.calculate_row_totals(row)
+
+        created = [doc.getObject(name) for name in sorted(changes.created)]
+        created = takeoff_objects(obj for obj in created if obj is not None)
+        if created:
+            self.append_objects(created)
+        else:
+            self.update_grand_total()
+            self.apply_scope()
+        self.store.save()
+
+    def current_document(self):
+        """Return the document shown in the table (the active one if none is watched)"""
+        if self.observer is not None and not self.observer.document_closed:
+            return FreeCAD.getDocument(self.observer.document_name)
+        return FreeCAD.ActiveDocument
+
+    def measure_rows(self, rows):
+        """Lazy provider: measure Volume/Area/weight of the objects in ``rows``"""
+        doc = self.current_document()
+        if doc is None:
+            return {}
+        objects = [doc.getObject(self.table_data.value(row, 'Name')) for row in rows]
+        with span('measure', rows=len(rows)):
+            return store_for_document(doc).measure(objects)
+
+    def rows_measured(self, rows):
+        """Add lazily measured values to the group subtotals"""
+        if self.groups is None:
+            return
+        self.groups.update_rows(rows)
+        for row in rows:
+            self.group_model.row_changed(row)
+
+    def closeEvent(self, event):
+        """Save lazily measured values to the geometry cache and the takeoff snapshot"""
+        if self.observer is not None and not self.observer.document_closed:
+            self.store.save()
+        self.write_snapshot()
+        super().closeEvent(event)
+
+    def set_approximate(self, approximate):
+        """Switch between measured and fast estimated quantities and reload"""
+        if approximate == self.approximate:
+            return
+        self.approximate = approximate
+        # Saves the current rows (if they were measured) before reloading
+        self.load_objects_from_document()
+
+    def precision_summary(self):
+        """Describe the precision tiers of the rows and the volume error bound"""
+        data = self.table_data
+        return precision_summary(data.column('Volume'), data.column('Area'), data.column(PRECISION_KEY))
+
+    def set_scope(self, description, query):
+        """
+        Show only the rows of the objects returned by ``query()``; the query
+        is re-run after document changes so the region stays current.
+        """
+        self.group_by.setCurrentText("None")
+        self._scope = (description, query)
+        self.apply_scope()
+
+    def apply_scope(self):
+        """Re-run the region query and update the visible rows and region totals"""
+        if self._scope is None:
+            return
+        description, query = self._scope
+        with span('region', description=description):
+            rows = {row for name in query() for row in self._row_index.get(name, [])}
+            self.proxy.set_accepted_rows(rows)
+            volume = sum(self.table_data.value(row, 'Volume') for row in rows)
+            area = sum(self.table_data.value(row, 'Area') for row in rows)
+            total = sum(self.table_data.value(row, 'Total') for row in rows)
+        self.scope_label.setText(f"{description}: {len(rows)} objects, Volume {volume:,.3f} m³, "
+                                 f"Area {area:,.2f} m², Total {total:,.2f}")
+        self.scope_label.show()
+        self.clear_scope_btn.show()
+
+    def clear_scope(self):
+        """Show every row again"""
+        self._scope = None
+        self.proxy.set_accepted_rows(None)
+        self.scope_label.hide()
+        self.clear_scope_btn.hide()
+
+    def takeoff_box(self, bounds, description, exclude=()):
+        """Show the objects whose bounding box overlaps ``bounds`` (mm)"""
+        exclude = set(exclude)
+        self.set_scope(description, lambda: self.spatial_index.query_box(bounds) - exclude)
+
+    def takeoff_level(self, bottom, top, description=None):
+        """Show the objects whose bottom lies between two elevations (mm)"""
+        description = description or f"Level {bottom / 1000:g} - {top / 1000:g} m"
+        self.set_scope(description, lambda: self.spatial_index.query_level(bottom, top))
+
+    def takeoff_intersecting(self, solid):
+        """Show the objects that share volume with the shape of ``solid``"""
+        name = solid.Name
+
+        def query():
+            doc = self.current_document()
+            solid = doc.getObject(name) if doc is not None else None
+            if solid is None:
+                return set()
+            return query_solid(self.spatial_index, solid, doc.getObject)
+
+        self.set_scope(f"Intersecting {solid.Label}", query)
+
+    def on_value_edited(self, row, key):
+        """Handle edits of the unit price columns"""
         # Only process changes to editable columns (Material/unit, Labor/unit)
-        if col in [10, 11]:
+        if key in PRICE_KEYS:
             self.calculate_row_totals(row)
             self.update_grand_total()
     
-    def calculate_row_totals(self, row):
-        """Calculate totals for a specific row"""
-        try:
-            # Block signals temporarily to prevent infinite loops
-            self.table.blockSignals(True)
-            
-            # Get values
-            quantity_item = self.table.item(row, 8)  # Quantity column
-            material_unit_item = self.table.item(row, 10)  # Material/unit
-            labor_unit_item = self.table.item(row, 11)  # Labor/unit
-            
-            if not all([quantity_item, material_unit_item, labor_unit_item]):
-                return
-                
-            quantity = float(quantity_item.text() or 0)
-            material_unit = float(material_unit_item.text() or 0)
-            labor_unit = float(labor_unit_item.text() or 0)
-            
-            # Calculate totals
-            material_total = self.calculator.calculate_material_total(quantity, material_unit)
-            labor_total = self.calculator.calculate_labor_total(quantity, labor_unit)
-            row_total = self.calculator.calculate_row_total(material_total, labor_total)
-            
-            # Update total columns
-            self.table.setItem(row, 12, QTableWidgetItem(f"{material_total:.2f}"))
-            self.table.setItem(row, 13, QTableWidgetItem(f"{labor_total:.2f}"))
-            self.table.setItem(row, 14, QTableWidgetItem(f"{row_total:.2f}"))
-            
-            # Make total columns read-only
-            for col in [12, 13, 14]:
-                item = self.table.item(row, col)
-                if item:
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                    
-        except (ValueError, TypeError) as e:
-            FreeCAD.Console.PrintError(f"Error calculating row totals: {e}\n")
-        finally:
-            # Re-enable signals
-            self.table.blockSignals(False)
+    def calculate_row_totals(self, row, notify=True):
+        """Calculate totals for a specific row and update the running totals and subtotals"""
+        self.totals.update_row(self.table_data, row)
+        if self.groups is not None:
+            if self.groups.update_row(row):
+                self.group_model.groups_changed()
+            elif notify:
+                self.group_model.row_changed(row)
+        if notify:
+            self.model.rows_changed(row)
+    
+    def set_group_by(self, group_by):
+        """Switch between the flat table and the grouped tree"""
+        self.regroup(group_by)
+        grouped = self.groups is not None
+        self.table.setVisible(not grouped)
+        self.tree.setVisible(grouped)
+    
+    def regroup(self, group_by=None):
+        """Rebuild the groups from scratch (after a reset or a full recalculation)"""
+        self.groups = group_boq(self.table_data, group_by or self.group_by.currentText())
+        self.group_model.set_groups(self.groups)
     
     def calculate_totals(self):
-        """Calculate all row totals"""
-        for row in range(self.table.rowCount()):
-            self.calculate_row_totals(row)
+        """Recalculate all row totals and the running totals from scratch"""
+        with span('calculate', rows=len(self.table_data)):
+            self.totals.recompute(self.table_data)
+            if self.groups is not None:
+                self.regroup()
+        row_count = len(self.table_data)
+        if row_count:
+            self.model.rows_changed(0, row_count - 1)
         self.update_grand_total()
     
     def update_grand_total(self):
-        """Update the grand total display"""
-        try:
-            total = 0.0
-            for row in range(self.table.rowCount()):
-                total_item = self.table.item(row, 14)  # Total column
-                if total_item:
-                    total += float(total_item.text() or 0)
-            
-            self.grand_total_label.setText(f"Grand Total: {total:,.2f}")
-            
-        except (ValueError, TypeError) as e:
-            FreeCAD.Console.PrintError(f"Error updating grand total: {e}\n")
+        """Update the total labels from the running totals"""
+        self.material_total_label.setText(f"Material: {self.totals.material:,.2f}")
+        self.labor_total_label.setText(f"Labor: {self.totals.labor:,.2f}")
+        self.grand_total_label.setText(f"Grand Total: {self.totals.grand:,.2f}")
     
     def refresh_data(self):
         """Refresh data from FreeCAD document"""
-        self.load_objects_from_document()
+        doc = FreeCAD.ActiveDocument
+        if self.observer is not None and doc and doc.Name == self.observer.document_name:
+            # Same document: apply pending edits without losing entered prices
+            self.sync_timer.stop()
+            self.sync_document_changes()
+        else:
+            self.load_objects_from_document()
         FreeCAD.Console.PrintMessage("Data refreshed\n")
     
     def show_object_info_dialog(self):
         """Show detailed object information dialog"""
         try:
-            # Import with absolute path
-            import sys
-            import os
-            module_path = os.path.dirname(os.path.dirname(__file__))
-            if module_path not in sys.path:
-                sys.path.insert(0, module_path)
-            
             from dialogs.object_info_dialog import ObjectInfoDialog
             
             # Get current document objects
@@ -292,32 +608,22 @@ class QuantityTakeoffMainDialog(QMainWindow):
             QMessageBox.critical(self, "Error", f"Error showing object info dialog: {e}")
     
     def export_to_csv(self):
-        """Export table data to CSV file"""
-        try:
-            filename, _ = QFileDialog.getSaveFileName(
-                self, "Export to CSV", "", "CSV Files (*.csv)")
-            
-            if filename:
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    
-                    # Write headers
-                    writer.writerow(self.columns)
-                    
-                    # Write data
-                    for row in range(self.table.rowCount()):
-                        row_data = []
-                        for col in range(self.table.columnCount()):
-                            item = self.table.item(row, col)
-                            row_data.append(item.text() if item else "")
-                        writer.writerow(row_data)
-                
-                QMessageBox.information(self, "Success", f"Data exported to {filename}")
-                FreeCAD.Console.PrintMessage(f"Data exported to {filename}\n")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error exporting data: {e}")
-            FreeCAD.Console.PrintError(f"Error exporting data: {e}\n")
+        """Export table data (CSV, XLSX or Parquet) on a worker thread"""
+        filename = get_export_filename(self, "Export BOQ")
+        if filename:
+            # Stream from a snapshot of the takeoff data, not from the view;
+            # lazy cells are measured here as the worker must not touch FreeCAD
+            rows = None
+            if self._scope is not None:
+                # Region takeoff: export the rows shown, in view order
+                rows = [self.proxy.mapToSource(self.proxy.index(proxy_row, 0)).row()
+                        for proxy_row in range(self.proxy.rowCount())]
+            with span('export.snapshot', rows=len(self.table_data) if rows is None else len(rows)):
+                self.table_data.resolve(rows)
+                data = self.table_data.snapshot()
+            self._export_worker = start_export(
+                self, filename, data.headers(), data.records(rows),
+                len(data) if rows is None else len(rows), "Data exported to")
 
 # Global dialog instance
 _main_dialog = None
@@ -345,3 +651,56 @@ def add_selected_objects(objects):
         _main_dialog.append_objects(objects)
     else:
         FreeCAD.Console.PrintMessage("Please open the main dialog first\n")
+
+
+def _dialog():
+    """Show the main dialog and return it (None if it could not be created)"""
+    show_main_dialog()
+    return _main_dialog
+
+
+def takeoff_region(objects):
+    """Show the takeoff of everything inside the bounding box of ``objects``"""
+    bounds = union_bounds(bounds for bounds in map(object_bounds, objects) if bounds is not None)
+    if bounds is None:
+        FreeCAD.Console.PrintMessage("The selected objects have no shape to define a region\n")
+        return
+    dialog = _dialog()
+    if dialog is not None:
+        labels = ", ".join(obj.Label for obj in objects[:3]) + ("..." if len(objects) > 3 else "")
+        dialog.takeoff_box(bounds, f"Region of {labels}", exclude=[obj.Name for obj in objects])
+
+
+def takeoff_level(objects=()):
+    """
+    Show the takeoff of one level: from a selected level (a Building
+    Storey or Arch Floor with a Height), otherwise from an elevation
+    range entered in metres.
+    """
+    for obj in objects:
+        elevations = level_range(obj)
+        if elevations:
+            dialog = _dialog()
+            if dialog is not None:
+                dialog.takeoff_level(*elevations, description=f"Level {obj.Label}")
+            return
+
+    dialog = _dialog()
+    if dialog is None:
+        return
+    bottom, ok = QInputDialog.getDouble(dialog, "Takeoff by Level", "Bottom elevation (m):", 0.0, -1e6, 1e6, 3)
+    if not ok:
+        return
+    top, ok = QInputDialog.getDouble(dialog, "Takeoff by Level", "Top elevation (m):", bottom + 3.0, bottom, 1e6, 3)
+    if ok and top > bottom:
+        dialog.takeoff_level(bottom * 1000.0, top * 1000.0)
+
+
+def takeoff_intersecting(objects):
+    """Show the takeoff of the objects intersecting the one selected solid"""
+    if len(objects) != 1 or not getattr(objects[0], 'Shape', None):
+        FreeCAD.Console.PrintMessage("Please select one solid\n")
+        return
+    dialog = _dialog()
+    if dialog is not None:
+        dialog.takeoff_intersecting(objects[0])
@@ -5,29 +5,81 @@ ObjectInfoDialog - Dialog for displaying detailed object information
 
 try:
     from PySide2 import QtWidgets, QtCore, QtGui
-    from PySide2.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QLabel, QLineEdit, QComboBox
-    from PySide2.QtCore import Qt
+    from PySide2.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QHeaderView, QMessageBox, QLabel, QLineEdit, QComboBox
+    from PySide2.QtCore import Qt, QTimer
     from PySide2.QtGui import QFont
 except ImportError:
     try:
         from PyQt5 import QtWidgets, QtCore, QtGui
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QLabel, QLineEdit, QComboBox
-        from PyQt5.QtCore import Qt
+        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QHeaderView, QMessageBox, QLabel, QLineEdit, QComboBox
+        from PyQt5.QtCore import Qt, QTimer
         from PyQt5.QtGui import QFont
     except ImportError as e:
         print(f"Error importing Qt modules: {e}")
         QtWidgets = None
 
 import FreeCAD
-import sys
-import os
-
-# Add the module path to sys.path for absolute imports
-module_path = os.path.dirname(os.path.dirname(__file__))
-if module_path not in sys.path:
-    sys.path.insert(0, module_path)
 
+from dialogs.export_worker import get_export_filename, start_export
+from dialogs.table_model import ColumnarTableModel, RowFilterProxyModel
 from utils.calculations import QTOCalculator
+from utils.column_stats import format_summary
+from utils.extraction import LAZY_KEYS, takeoff_objects
+from utils.filter_index import FilterIndex
+from utils.profiling import span
+from utils.property_table import FACE_KEYS
+from utils.table_data import ColumnSpec, TableData
+from utils.takeoff_store import store_for_document
+
+# Delay before a name search runs, so typing is not interrupted (ms)
+SEARCH_DEBOUNCE_MS = 200
+# Delay used to coalesce lazily measured batches into one summary update (ms)
+SUMMARY_DEBOUNCE_MS = 200
+# Delay used to coalesce bursts of document edits into one reload (ms)
+REFRESH_INTERVAL_MS = 300
+
+
+def type_color(value):
+    """Color coding based on object type"""
+    if "Part::Feature" in value:
+        return (230, 255, 230)  # Light green
+    if "Beam" in value:
+        return (255, 240, 230)  # Light orange
+    if "Column" in value:
+        return (230, 240, 255)  # Light blue
+    return None
+
+
+def status_color(value):
+    """Status color coding"""
+    if value == "Hidden":
+        return (255, 230, 230)  # Light red
+    return None
+
+
+# Extended columns for detailed object information
+OBJECT_INFO_COLUMNS = [
+    ColumnSpec('Name', "Object Name", width=120),
+    ColumnSpec('Label', "Label", width=120),
+    ColumnSpec('Type', "Object Type", background=type_color, width=150),
+    ColumnSpec('Material', "Material", width=100),
+    ColumnSpec('Length', "Length (m)", numeric=True, formatter=lambda value: f"{value:.2f}", width=80),
+    ColumnSpec('Width', "Width (m)", numeric=True, formatter=lambda value: f"{value:.2f}", width=80),
+    ColumnSpec('Height', "Height (m)", numeric=True, formatter=lambda value: f"{value:.2f}", width=80),
+    ColumnSpec('Volume', "Volume (m³)", numeric=True, formatter=lambda value: f"{value:.6f}"),
+    ColumnSpec('Area', "Area (m²)", numeric=True, formatter=lambda value: f"{value:.2f}"),
+    ColumnSpec('Formwork_Area', "Formwork (m²)", numeric=True, formatter=lambda value: f"{value:.2f}"),
+    ColumnSpec('Top_Area', "Top Finish (m²)", numeric=True, formatter=lambda value: f"{value:.2f}"),
+    ColumnSpec('Wall_Net_Area', "Net Wall (m²)", numeric=True, formatter=lambda value: f"{value:.2f}"),
+    ColumnSpec('Openings_Area', "Openings (m²)", numeric=True, formatter=lambda value: f"{value:.2f}"),
+    ColumnSpec('Quantity', "Quantity", numeric=True, formatter=lambda value: str(int(value)), width=80),
+    ColumnSpec('Unit_Weight', "Unit Weight (kg)", numeric=True, formatter=lambda value: f"{value:.2f}"),
+    ColumnSpec('Status', "Status", background=status_color, width=80),
+]
+
+# Columns totalled in the summary bar, with their units
+SUMMARY_COLUMNS = {'Volume': "m³", 'Area': "m²", 'Unit_Weight': "kg"}
+
 
 class ObjectInfoDialog(QDialog):
     """
@@ -36,10 +88,15 @@ class ObjectInfoDialog(QDialog):
     
     def __init__(self, objects, parent=None):
         super().__init__(parent)
-        self.objects = objects
+        # Containers, sketches and datum features never become rows
+        self.objects = takeoff_objects(objects)
+        # Rows and quantities the BOQ dialog already measured are reused
+        self.store = store_for_document(FreeCAD.ActiveDocument)
+        self.subscription = None
         self.calculator = QTOCalculator()
         self.setupUI()
         self.setupTable()
+        self.setupRefreshTimer()
         self.load_object_data()
         
     def setupUI(self):
@@ -68,7 +125,11 @@ class ObjectInfoDialog(QDialog):
         filter_layout.addWidget(QLabel("ค้นหาชื่อ:"))
         self.name_filter = QLineEdit()
         self.name_filter.setPlaceholderText("ใส่ชื่อชิ้นงานที่ต้องการค้นหา...")
-        self.name_filter.textChanged.connect(self.apply_filter)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.name_filter.textChanged.connect(self.search_timer.start)
         filter_layout.addWidget(self.name_filter)
         
         clear_filter_btn = QPushButton("Clear Filter")
@@ -79,7 +140,7 @@ class ObjectInfoDialog(QDialog):
         layout.addLayout(filter_layout)
         
         # Table
-        self.table = QTableWidget()
+        self.table = QTableView()
         layout.addWidget(self.table)
         
         # Summary section
@@ -87,6 +148,11 @@ class ObjectInfoDialog(QDialog):
         self.summary_label = QLabel("Total Objects: 0")
         self.summary_label.setFont(QFont("Arial", 10, QFont.Bold))
         summary_layout.addWidget(self.summary_label)
+        self._shown_rows = None  # Source rows the summary is computed over (None: all)
+        self.summary_timer = QTimer(self)
+        self.summary_timer.setSingleShot(True)
+        self.summary_timer.setInterval(SUMMARY_DEBOUNCE_MS)
+        self.summary_timer.timeout.connect(self.update_summary)
         summary_layout.addStretch()
         
         # Buttons
@@ -110,166 +176,167 @@ class ObjectInfoDialog(QDialog):
         
     def setupTable(self):
         """Setup the object information table"""
-        # Extended columns for detailed object information
-        self.columns = [
-            "Object Name", "Label", "Object Type", "Material", 
-            "Length (m)", "Width (m)", "Height (m)", "Volume (m³)", 
-            "Area (m²)", "Quantity", "Unit Weight (kg)", "Status"
-        ]
-        
-        self.table.setColumnCount(len(self.columns))
-        self.table.setHorizontalHeaderLabels(self.columns)
+        self.columns = [spec.header for spec in OBJECT_INFO_COLUMNS]
+        self.table_data = TableData(OBJECT_INFO_COLUMNS)
+        self.model = ColumnarTableModel(self.table_data, self)
+        self.proxy = RowFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table.setModel(self.proxy)
         
         # Set column widths
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.Interactive)
+        for i, spec in enumerate(OBJECT_INFO_COLUMNS):
+            self.table.setColumnWidth(i, spec.width)
         
-        # Set specific widths
-        column_widths = [120, 120, 150, 100, 80, 80, 80, 100, 100, 80, 100, 80]
-        for i, width in enumerate(column_widths):
-            self.table.setColumnWidth(i, width)
+        # Measured values change the summed columns; the summary follows them
+        self.table_data.set_lazy(LAZY_KEYS + FACE_KEYS, self.measure_rows,
+                                 lambda rows: self.summary_timer.start())
+        self.model.dataChanged.connect(self.summary_timer.start)
+        self.model.modelReset.connect(self.summary_timer.start)
         
         # Make table read-only
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         
-        # Enable sorting
+        # Enable sorting (on raw values, so numbers sort numerically)
         self.table.setSortingEnabled(True)
         
         # Enable row selection
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         
+    def setupRefreshTimer(self):
+        """Reload the table shortly after the document changes"""
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.document_changed)
+        self.subscription = self.store.subscribe(self.refresh_timer.start)
+
+    def document_changed(self):
+        """Reload after edits; unchanged objects come from the store without re-measuring"""
+        if not self.subscription.take_changes() or self.subscription.document_closed:
+            return
+        doc = FreeCAD.getDocument(self.store.document_name)
+        self.objects = takeoff_objects(doc.Objects)
+        self.load_object_data()
+        self.apply_filter()
+
     def load_object_data(self):
         """Load object data into the table"""
-        self.all_data = []  # Store all data for filtering
-        
-        for obj in self.objects:
-            props = self.calculator.get_object_properties(obj)
-            
-            # Add status information
-            status = "Active"
-            if hasattr(obj, 'Visibility') and not obj.Visibility:
-                status = "Hidden"
-            
-            row_data = [
-                props['Name'],
-                props.get('Label', props['Name']),
-                props['Type'],
-                props['Material'],
-                f"{props['Length']:.2f}",
-                f"{props['Width']:.2f}",
-                f"{props['Height']:.2f}",
-                f"{props['Volume']:.6f}",
-                f"{props['Area']:.2f}",
-                str(props['Quantity']),
-                f"{props['Unit_Weight']:.2f}",
-                status
-            ]
-            
-            self.all_data.append(row_data)
+        with span('load', objects=len(self.objects)):
+            self._load_object_data()
+
+    def _load_object_data(self):
+        """Extract the objects and fill the table"""
+        # Volume/Area and face quantities are measured lazily (see measure_rows)
+        properties = self.store.properties(self.objects)
+        
+        # Add status information
+        status = ["Hidden" if hasattr(obj, 'Visibility') and not obj.Visibility else "Active"
+                  for obj in self.objects]
+        extra = self.store.known_values(self.objects, FACE_KEYS)
+        extra['Status'] = status
+        with span('populate'):
+            self.model.reset_rows(properties, extra)
+        self.filter_index = FilterIndex(self.table_data.column('Name'),
+                                        self.table_data.column('Label'),
+                                        self.table_data.column('Type'))
         
         # Populate type filter
         self.populate_type_filter()
         
         # Display all data initially
-        self.display_data(self.all_data)
+        self.show_rows(None)
+        
+    def measure_rows(self, rows):
+        """Lazy provider: measure Volume/Area/weight and face quantities of ``rows``"""
+        objects = [self.objects[row] for row in rows]
+        with span('measure', rows=len(rows)):
+            return self.store.measure(objects, LAZY_KEYS + FACE_KEYS)
+        
+    def done(self, result):
+        """Save lazily measured values to the geometry cache when closing"""
+        self.subscription.close()
+        self.refresh_timer.stop()
+        self.summary_timer.stop()
+        self.store.save()
+        super().done(result)
         
     def populate_type_filter(self):
-        """Populate the type filter combobox"""
-        types = set()
-        for row_data in self.all_data:
-            types.add(row_data[2])  # Object Type column
-        
+        """Populate the type filter combobox, keeping the selected type if it still exists"""
+        selected = self.type_filter.currentText()
+        self.type_filter.blockSignals(True)
         self.type_filter.clear()
         self.type_filter.addItem("All Types")
-        for obj_type in sorted(types):
+        for obj_type in self.filter_index.types():
             self.type_filter.addItem(obj_type)
+        self.type_filter.setCurrentIndex(max(self.type_filter.findText(selected), 0))
+        self.type_filter.blockSignals(False)
     
-    def display_data(self, data):
-        """Display data in the table"""
-        self.table.setRowCount(len(data))
-        
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                item = QTableWidgetItem(str(value))
-                
-                # Color coding based on object type
-                if col == 2:  # Object Type column
-                    if "Part::Feature" in value:
-                        item.setBackground(QtGui.QColor(230, 255, 230))  # Light green
-                    elif "Beam" in value:
-                        item.setBackground(QtGui.QColor(255, 240, 230))  # Light orange
-                    elif "Column" in value:
-                        item.setBackground(QtGui.QColor(230, 240, 255))  # Light blue
-                
-                # Status color coding
-                if col == 11:  # Status column
-                    if value == "Hidden":
-                        item.setBackground(QtGui.QColor(255, 230, 230))  # Light red
-                
-                self.table.setItem(row, col, item)
-        
-        # Update summary
-        self.summary_label.setText(f"Total Objects: {len(data)}")
+    def show_rows(self, rows):
+        """Show only the given source rows (all rows for None)"""
+        self.proxy.set_accepted_rows(rows)
+        self._shown_rows = rows
+        self.update_summary()
+    
+    def update_summary(self):
+        """Show the object count and column sums of the displayed rows"""
+        self.summary_timer.stop()
+        count = self.proxy.rowCount()
+        summaries = self.proxy.column_index().summaries(SUMMARY_COLUMNS, self._shown_rows)
+        parts = [f"Total Objects: {count}"]
+        tips = []
+        for key, unit in SUMMARY_COLUMNS.items():
+            summary = summaries[key]
+            parts.append(f"{key.replace('_', ' ')}: {format_summary(summary, count, unit)}")
+            if summary.count:
+                tips.append(f"{key.replace('_', ' ')}: min {summary.minimum:,.2f}, "
+                            f"max {summary.maximum:,.2f} {unit}")
+        self.summary_label.setText("   ".join(parts))
+        self.summary_label.setToolTip("\n".join(tips))
     
     def apply_filter(self):
         """Apply filters to the data"""
-        filtered_data = []
-        
+        self.search_timer.stop()
         type_filter = self.type_filter.currentText()
-        name_filter = self.name_filter.text().lower()
+        if type_filter == "All Types":
+            type_filter = None
         
-        for row_data in self.all_data:
-            # Type filter
-            if type_filter != "All Types" and type_filter not in row_data[2]:
-                continue
-            
-            # Name filter
-            if name_filter and name_filter not in row_data[0].lower() and name_filter not in row_data[1].lower():
-                continue
-            
-            filtered_data.append(row_data)
-        
-        self.display_data(filtered_data)
+        with span('filter'):
+            self.show_rows(self.filter_index.search(self.name_filter.text(), type_filter))
     
     def clear_filters(self):
         """Clear all filters"""
         self.type_filter.setCurrentText("All Types")
         self.name_filter.clear()
-        self.display_data(self.all_data)
+        self.search_timer.stop()
+        self.show_rows(self.filter_index.search())
     
     def refresh_data(self):
         """Refresh object data"""
         if FreeCAD.ActiveDocument:
-            self.objects = FreeCAD.ActiveDocument.Objects
+            self.objects = takeoff_objects(FreeCAD.ActiveDocument.Objects)
+            if FreeCAD.ActiveDocument.Name != self.store.document_name:
+                self.subscription.close()
+                self.store = store_for_document(FreeCAD.ActiveDocument)
+                self.subscription = self.store.subscribe(self.refresh_timer.start)
             self.load_object_data()
+            # Keep the type and name filters the user had set
+            self.apply_filter()
             FreeCAD.Console.PrintMessage("Object information refreshed\n")
     
     def export_info(self):
-        """Export object information to CSV"""
-        try:
-            from PySide2.QtWidgets import QFileDialog
-        except ImportError:
-            from PyQt5.QtWidgets import QFileDialog
-        
-        filename, _ = QFileDialog.getSaveFileName(
-            self, "Export Object Info", "", "CSV Files (*.csv)")
+        """Export the displayed object information on a worker thread"""
+        filename = get_export_filename(self, "Export Object Info")
         
         if filename:
-            import csv
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Write headers
-                writer.writerow(self.columns)
-                
-                # Write current displayed data
-                for row in range(self.table.rowCount()):
-                    row_data = []
-                    for col in range(self.table.columnCount()):
-                        item = self.table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
-            
-            QMessageBox.information(self, "Success", f"Object information exported to {filename}")
-            FreeCAD.Console.PrintMessage(f"Object information exported to {filename}\n")
+            # Current displayed rows, in view order
+            rows = [self.proxy.mapToSource(self.proxy.index(proxy_row, 0)).row()
+                    for proxy_row in range(self.proxy.rowCount())]
+            # Lazy cells are measured here; the worker thread must not touch FreeCAD
+            with span('export.snapshot', rows=len(rows)):
+                self.table_data.resolve(rows)
+                data = self.table_data.snapshot()
+            self._export_worker = start_export(
+                self, filename, data.headers(), data.records(rows), len(rows),
+                "Object information exported to")
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+ColumnarTableModel - Qt model/view layer over columnar TableData
+"""
+
+try:
+    from PySide2 import QtCore, QtGui
+    from PySide2.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Signal
+except ImportError:
+    try:
+        from PyQt5 import QtCore, QtGui
+        from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, pyqtSignal as Signal
+    except ImportError as e:
+        print(f"Error importing Qt modules: {e}")
+        QtCore = None
+
+from utils.column_stats import ColumnIndex
+from utils.table_data import TableData
+
+# Role returning the raw (numeric) value, used for sorting
+SORT_ROLE = Qt.UserRole + 1
+
+
+class ColumnarTableModel(QAbstractTableModel):
+    """
+    Table model that renders TableData lazily.
+
+    No per-cell objects are created: display strings, editability,
+    background colours and notes come from the column specs when the
+    view asks. Cells with a note are shown in italics.
+    """
+
+    # Emitted after the user edited a cell: (row, column key)
+    valueEdited = Signal(int, str)
+
+    def __init__(self, data: TableData, parent=None):
+        super().__init__(parent)
+        self.table_data = data
+        self._colors = {}
+        self._italic = QtGui.QFont()
+        self._italic.setItalic(True)
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.table_data)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.table_data.specs)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.table_data.specs[section].header
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        spec = self.table_data.specs[col]
+
+        if role == Qt.DisplayRole:
+            return self.table_data.display(row, col)
+        if role in (Qt.EditRole, SORT_ROLE):
+            return self.table_data.value(row, spec.key)
+        if role == Qt.BackgroundRole and spec.background is not None:
+            return self._color(spec.background(self.table_data.value(row, spec.key)))
+        if role == Qt.ToolTipRole and spec.note is not None:
+            return self.table_data.note(row, col)
+        if role == Qt.FontRole and spec.note is not None and self.table_data.note(row, col):
+            return self._italic
+        if role == Qt.TextAlignmentRole and spec.numeric:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and self.table_data.specs[index.column()].editable:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        spec = self.table_data.specs[index.column()]
+        if not spec.editable:
+            return False
+        if spec.numeric:
+            try:
+                value = float(str(value).replace(',', '') or 0)
+            except (ValueError, TypeError):
+                return False
+        self.table_data.set_value(index.row(), spec.key, value)
+        self.dataChanged.emit(index, index)
+        self.valueEdited.emit(index.row(), spec.key)
+        return True
+
+    # Bulk updates
+
+    def _color(self, rgb):
+        if rgb is None:
+            return None
+        color = self._colors.get(rgb)
+        if color is None:
+            color = self._colors[rgb] = QtGui.QColor(*rgb)
+        return color
+
+    def column_index(self, key):
+        """Return the view column of a column key"""
+        for col, spec in enumerate(self.table_data.specs):
+            if spec.key == key:
+                return col
+        raise KeyError(key)
+
+    def reset_rows(self, properties=None, extra=None):
+        """Replace all rows (optionally with the rows of a PropertyTable)"""
+        self.beginResetModel()
+        self.table_data.clear()
+        if properties is not None:
+            self.table_data.append_properties(properties, extra)
+        self.endResetModel()
+
+    def replace_columns(self, columns, rows):
+        """Replace all rows with whole columns (e.g. from a saved snapshot)"""
+        self.beginResetModel()
+        self.table_data.replace_columns(columns, rows)
+        self.endResetModel()
+
+    def append_properties(self, properties, extra=None):
+        """Append the rows of a PropertyTable; returns the new row range"""
+        if not len(properties):
+            return range(len(self.table_data), len(self.table_data))
+        start = len(self.table_data)
+        self.beginInsertRows(QModelIndex(), start, start + len(properties) - 1)
+        rows = self.table_data.append_properties(properties, extra)
+        self.endInsertRows()
+        return rows
+
+    def remove_rows(self, rows):
+        """Remove the given rows"""
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        if len(rows) == 1:
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[0])
+            self.table_data.remove_rows(rows)
+            self.endRemoveRows()
+        else:
+            self.beginResetModel()
+            self.table_data.remove_rows(rows)
+            self.endResetModel()
+
+    def rows_changed(self, first_row, last_row=None):
+        """Notify views that rows ``first_row``..``last_row`` changed"""
+        last_row = first_row if last_row is None else last_row
+        self.dataChanged.emit(self.index(first_row, 0),
+                              self.index(last_row, self.columnCount() - 1))
+
+
+class RowFilterProxyModel(QSortFilterProxyModel):
+    """
+    Proxy that sorts on raw values and shows only an accepted set of
+    source rows (``None`` shows every row).
+
+    Columns of a ColumnarTableModel are sorted by the ranks of a cached
+    argsort (see utils.column_stats.ColumnIndex), so a comparison is two
+    lookups and re-sorting an unchanged column does not re-read it.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.accepted_rows = None
+        self.setSortRole(SORT_ROLE)
+        self._index = None
+        self._sort_key = None
+        self._ranks = None
+        self._ranks_version = None
+
+    def column_index(self):
+        """Return the ColumnIndex of the source model's table data (None for other models)"""
+        data = getattr(self.sourceModel(), 'table_data', None)
+        if data is None:
+            return None
+        if self._index is None or self._index.data is not data:
+            self._index = ColumnIndex(data)
+            self._ranks = None
+        return self._index
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        index = self.column_index()
+        self._sort_key = index.data.specs[column].key if index is not None and column >= 0 else None
+        self._ranks = None
+        super().sort(column, order)
+
+    def lessThan(self, left, right):
+        index = self.column_index()
+        if self._sort_key is None or index is None:
+            return super().lessThan(left, right)
+        # Rows may have changed since sort() (dynamic re-sorting after edits)
+        if self._ranks is None or self._ranks_version != index.data.column_version(self._sort_key):
+            self._ranks = index.ranks(self._sort_key)
+            self._ranks_version = index.data.column_version(self._sort_key)
+        return self._ranks[left.row()] < self._ranks[right.row()]
+
+    def set_accepted_rows(self, rows):
+        """Show only ``rows`` (a set of source rows), or all rows for None"""
+        self.accepted_rows = rows
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.accepted_rows is None or source_row in self.accepted_rows
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+qto_cli.py - Headless batch quantity takeoff for .FCStd files
+
+Runs without Qt, e.g. on a build server:
+
+    FreeCADCmd qto_cli.py --pass model.FCStd projects/ -o boq/
+    FreeCADCmd -c "import qto_cli; qto_cli.main(['projects/', '-o', 'boq/'])"
+
+Each document is written to its own ``<name>.boq.csv`` (same 15 columns as
+the BOQ dialog export; ``--format xlsx|parquet`` for other formats) as soon as it has been measured, and is closed
+before the next one is opened.
+
+With ``--approximate`` solids are not measured: Volume and Area are
+estimated from parametric dimensions and bounding boxes, and a Precision
+column gives the tier of each row (see utils/approximation.py).
+
+With ``--jobs N`` documents (or, with ``--chunks M``, slices of each
+document's objects) are measured by N worker processes. Workers are
+started with the ``spawn`` method, so run the CLI from a Python
+interpreter that can import FreeCAD (e.g. FreeCAD's bundled python).
+"""
+
+import argparse
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional
+
+# Add the module path to sys.path for absolute imports
+module_path = os.path.dirname(os.path.abspath(__file__))
+if module_path not in sys.path:
+    sys.path.insert(0, module_path)
+
+import FreeCAD
+
+from utils.approximation import PRECISION_KEY, precision_summary
+from utils.boq import calculate_totals, catalog_prices, new_boq_data
+from utils.calculations import QTOCalculator
+from utils.documents import opened_document
+from utils.exporters import EXPORT_WRITERS, export_rows
+from utils.extraction import takeoff_objects
+from utils.geometry_cache import cache_for_document
+from utils.materials import MaterialCatalog, catalog_for_document, catalog_for_file
+from utils.parallel import make_tasks, merge_batches, parallel_takeoff
+from utils.property_table import PropertyTable
+from utils.table_data import TableData
+
+FCSTD_EXTENSION = ".fcstd"
+BOQ_SUFFIX = ".boq"
+
+
+def iter_fcstd_files(paths: Iterable[str], recursive: bool = False) -> Iterator[str]:
+    """Yield .FCStd files from file and directory arguments, in sorted order"""
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                found = [os.path.join(root, name)
+                         for root, _, names in os.walk(path) for name in names]
+            else:
+                found = [os.path.join(path, name) for name in os.listdir(path)]
+            for filename in sorted(found):
+                if filename.lower().endswith(FCSTD_EXTENSION) and os.path.isfile(filename):
+                    yield filename
+        else:
+            yield path
+
+
+def output_path(filename: str, output_dir: Optional[str] = None, extension: str = ".csv") -> str:
+    """Return the BOQ export path for a document file"""
+    base = os.path.splitext(os.path.basename(filename))[0] + BOQ_SUFFIX + extension
+    return os.path.join(output_dir or os.path.dirname(filename), base)
+
+
+def boq_data(properties: PropertyTable, catalog: Optional[MaterialCatalog] = None) -> TableData:
+    """
+    Build BOQ table data (with totals) from extracted properties; estimated
+    properties get a Precision column
+    """
+    data = new_boq_data(precision=PRECISION_KEY in properties.keys())
+    data.append_properties(properties, catalog_prices(catalog, properties) if catalog else None)
+    calculate_totals(data)
+    return data
+
+
+def takeoff_document(filename: str, use_cache: bool = True, approximate: bool = False) -> TableData:
+    """Measure (or, if ``approximate``, estimate) every object of a .FCStd file into BOQ table data"""
+    with opened_document(filename) as doc:
+        cache = cache_for_document(doc) if use_cache and not approximate else None
+        catalog = catalog_for_document(doc)
+        properties = QTOCalculator.extract_properties(takeoff_objects(doc.Objects), cache, catalog=catalog,
+                                                      approximate=approximate)
+        if cache is not None:
+            cache.save()
+    if approximate:
+        summary = precision_summary(properties.column('Volume'), properties.column('Area'),
+                                    properties.column(PRECISION_KEY))
+        FreeCAD.Console.PrintMessage(f"{filename}: {summary}\n")
+    return boq_data(properties, catalog)
+
+
+def write_document_boq(filename: str, data: TableData, output_dir: Optional[str] = None,
+                       extension: str = ".csv"):
+    """Write the BOQ export of one document"""
+    target = output_path(filename, output_dir, extension)
+    export_rows(target, data.headers(), data.records())
+    FreeCAD.Console.PrintMessage(f"{filename}: {len(data)} objects -> {target}\n")
+
+
+def run(paths: Iterable[str], output_dir: Optional[str] = None,
+        recursive: bool = False, use_cache: bool = True, extension: str = ".csv",
+        approximate: bool = False) -> int:
+    """Write a BOQ file per document; returns the number of failed documents"""
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    failures = 0
+    for filename in iter_fcstd_files(paths, recursive):
+        try:
+            write_document_boq(filename, takeoff_document(filename, use_cache, approximate), output_dir, extension)
+        except Exception as e:
+            failures += 1
+            FreeCAD.Console.PrintError(f"Error processing {filename}: {e}\n")
+    return failures
+
+
+def run_parallel(paths: Iterable[str], output_dir: Optional[str] = None,
+                 recursive: bool = False, jobs: Optional[int] = None, chunks: int = 1,
+                 use_cache: bool = True, extension: str = ".csv") -> int:
+    """Like ``run``, measuring documents on ``jobs`` worker processes"""
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    tasks = make_tasks(iter_fcstd_files(paths, recursive), chunks, use_cache)
+    failures = 0
+    for filename, properties, errors in merge_batches(parallel_takeoff(tasks, jobs)):
+        try:
+            if errors:
+                raise RuntimeError("; ".join(errors))
+            write_document_boq(filename, boq_data(properties, catalog_for_file(filename)), output_dir, extension)
+        except Exception as e:
+            failures += 1
+            FreeCAD.Console.PrintError(f"Error processing {filename}: {e}\n")
+    return failures
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="qto_cli", description="Headless quantity takeoff of FreeCAD documents")
+    parser.add_argument("paths", nargs="+", help=".FCStd files or directories containing them")
+    parser.add_argument("-o", "--output-dir", help="directory for the BOQ files "
+                                                   "(default: next to each document)")
+    parser.add_argument("-f", "--format", default="csv",
+                        choices=sorted(extension[1:] for extension in EXPORT_WRITERS),
+                        help="BOQ file format (default: csv)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="search directories recursively")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the geometry cache")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (0 = one per CPU)")
+    parser.add_argument("--chunks", type=int, default=1,
+                        help="split each document into this many object chunks (with --jobs)")
+    parser.add_argument("--approximate", action="store_true",
+                        help="estimate Volume/Area from dimensions and bounding boxes instead of "
+                             "measuring solids, with a Precision column per row")
+    args = parser.parse_args(argv)
+    if args.approximate and (args.jobs != 1 or args.chunks != 1):
+        parser.error("--approximate runs in one process; it cannot be combined with --jobs/--chunks")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
+        # FreeCADCmd passes its own arguments; script arguments follow --pass
+        if "--pass" in argv:
+            argv = argv[argv.index("--pass") + 1:]
+    args = parse_args(argv)
+    extension = "." + args.format
+    if args.jobs == 1 and args.chunks == 1:
+        failures = run(args.paths, args.output_dir, args.recursive, not args.no_cache, extension,
+                       args.approximate)
+    else:
+        failures = run_parallel(args.paths, args.output_dir, args.recursive,
+                                args.jobs or None, max(args.chunks, 1), not args.no_cache, extension)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Synthetic FreeCAD documents for benchmarks: stub objects with fake
+Shape/BoundBox (modelled on the DummyShape of test_area_calculation.py),
+so the takeoff pipeline can be timed without a FreeCAD install.
+"""
+
+import random
+import types
+
+# (TypeId, Proxy type or None, has parametric Length/Width/Height)
+OBJECT_KINDS = (
+    ('Part::Box', None, True),
+    ('Part::Feature', None, False),
+    ('Part::FeaturePython', 'Wall', True),
+    ('Part::FeaturePython', 'Structure', True),
+    ('Part::Cylinder', None, False),
+)
+# Share of objects that are containers/annotations and never become rows
+NON_SOLID_RATIO = 0.05
+MATERIALS = ('Concrete', 'Reinforced Concrete', 'Steel', 'Brick', 'Wood', 'Glass', 'Custom Mix')
+
+
+class SyntheticBoundBox:
+    __slots__ = ('XMin', 'YMin', 'ZMin', 'XMax', 'YMax', 'ZMax', 'XLength', 'YLength', 'ZLength')
+
+    def __init__(self, x, y, z, dx, dy, dz):
+        self.XMin, self.YMin, self.ZMin = x, y, z
+        self.XMax, self.YMax, self.ZMax = x + dx, y + dy, z + dz
+        self.XLength, self.YLength, self.ZLength = dx, dy, dz
+
+
+class SyntheticShape:
+    """Box-like shape; Volume and Area are plain attributes like Part.Shape properties"""
+
+    ShapeType = 'Solid'
+    Vertexes = (None,) * 8
+    Edges = (None,) * 12
+    Faces = (None,) * 6
+    Solids = (None,)
+
+    def __init__(self, bbox, volume, area):
+        self.BoundBox = bbox
+        self.Volume = volume
+        self.Area = area
+
+    def isNull(self):
+        return False
+
+
+class SyntheticObject:
+    pass
+
+
+def make_object(index, rng):
+    """Return one synthetic takeoff object (dimensions in mm)"""
+    obj = SyntheticObject()
+    obj.Name = f"Object{index:06d}"
+    obj.Label = f"{('Wall', 'Slab', 'Beam', 'Column', 'Footing')[index % 5]}{index:03d}"
+    if rng.random() < NON_SOLID_RATIO:
+        obj.TypeId = 'App::DocumentObjectGroup'
+        return obj
+
+    type_id, proxy, parametric = OBJECT_KINDS[index % len(OBJECT_KINDS)]
+    obj.TypeId = type_id
+    if proxy:
+        obj.Proxy = types.SimpleNamespace(Type=proxy)
+    dx, dy, dz = (rng.uniform(100.0, 6000.0) for _ in range(3))
+    bbox = SyntheticBoundBox(rng.uniform(0, 1e5), rng.uniform(0, 1e5), 0.0, dx, dy, dz)
+    obj.Shape = SyntheticShape(bbox, dx * dy * dz, 2 * (dx * dy + dy * dz + dx * dz))
+    if parametric:
+        obj.Length, obj.Width, obj.Height = dx, dy, dz
+    obj.Material = MATERIALS[rng.randrange(len(MATERIALS))]
+    return obj
+
+
+def make_document(count, seed=0, name="Synthetic"):
+    """Return a document-like namespace with ``count`` deterministic objects"""
+    rng = random.Random(seed)
+    objects = [make_object(index, rng) for index in range(count)]
+    return types.SimpleNamespace(Name=f"{name}{count}", FileName="", Objects=objects,
+                                 getObject={obj.Name: obj for obj in objects}.get)
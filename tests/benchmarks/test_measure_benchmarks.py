@@ -0,0 +1,87 @@
+"""
+Serial versus threaded shape measurement (utils/measure_executor.py).
+
+Threaded measurement stays opt-in (``QTO_MEASURE_THREADS``) until these
+timings show a speedup on the target workstations. With FreeCAD's
+``Part`` module importable the shapes are real OCC solids; otherwise a
+synthetic shape stands in whose Volume does GIL-releasing work (hashing
+a buffer), the best case for threads. Compare the groups with:
+
+    python -m pytest tests/benchmarks/test_measure_benchmarks.py -m benchmark --benchmark-group-by=group,param:size
+"""
+
+import hashlib
+import os
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Opt-in: excluded from the default run by pytest.ini
+pytestmark = pytest.mark.benchmark
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from tests.benchmarks.synthetic import SyntheticShape, make_document
+from utils.extraction import extract_properties, takeoff_objects
+from utils.measure_executor import MeasureExecutor
+
+try:
+    import Part
+except ImportError:
+    Part = None
+
+SIZES = [int(size) for size in os.environ.get('QTO_BENCH_MEASURE_SIZES', '1000,10000').split(',')]
+THREADS = sorted({1, 2, 4, os.cpu_count() or 1})
+# Bytes hashed per synthetic Volume query, roughly the cost of a small solid
+KERNEL_WORK_BYTES = 64 * 1024
+_KERNEL_BUFFER = bytes(KERNEL_WORK_BYTES)
+
+
+class KernelShape(SyntheticShape):
+    """Synthetic shape whose Volume releases the GIL while it computes"""
+
+    @property
+    def Volume(self):
+        hashlib.blake2b(_KERNEL_BUFFER).digest()
+        return self._volume
+
+    @Volume.setter
+    def Volume(self, value):
+        self._volume = value
+
+
+def _kernel_shape(obj):
+    if Part is not None:
+        bbox = obj.Shape.BoundBox
+        box = Part.makeBox(bbox.XLength, bbox.YLength, bbox.ZLength)
+        return box.cut(Part.makeCylinder(min(bbox.XLength, bbox.YLength) / 4, bbox.ZLength))
+    shape = obj.Shape
+    return KernelShape(shape.BoundBox, shape.Volume, shape.Area)
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size // 1000}k")
+def objects(request):
+    objects = takeoff_objects(make_document(request.param).Objects)
+    for obj in objects:
+        obj.Shape = _kernel_shape(obj)
+    return objects
+
+
+@pytest.mark.parametrize("threads", THREADS)
+def test_measure_objects(benchmark, objects, threads):
+    benchmark.group = "measure"
+    if threads == 1:
+        table = benchmark(extract_properties, objects)
+    else:
+        with MeasureExecutor(threads) as executor:
+            table = benchmark(extract_properties, objects, executor=executor)
+    assert len(table) == len(objects)
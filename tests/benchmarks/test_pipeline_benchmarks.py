@@ -0,0 +1,108 @@
+"""
+Timing of the takeoff hot paths on synthetic documents.
+
+Run with pytest-benchmark installed, recording results so later runs can
+be compared against them:
+
+    python -m pytest tests/benchmarks -m benchmark --benchmark-autosave
+    python -m pytest tests/benchmarks -m benchmark --benchmark-compare --benchmark-compare-fail=mean:10%
+
+``QTO_BENCH_SIZES`` (comma separated) overrides the document sizes.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Opt-in: excluded from the default run by pytest.ini
+pytestmark = pytest.mark.benchmark
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from tests.benchmarks.synthetic import make_document
+from utils.boq import calculate_totals, new_boq_data
+from utils.calculations import QTOCalculator
+from utils.exporters import export_rows
+from utils.extraction import extract_properties, takeoff_objects
+from utils.filter_index import FilterIndex
+
+SIZES = [int(size) for size in os.environ.get('QTO_BENCH_SIZES', '1000,10000,100000').split(',')]
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size // 1000}k")
+def document(request):
+    return make_document(request.param)
+
+
+@pytest.fixture(scope="module")
+def objects(document):
+    return takeoff_objects(document.Objects)
+
+
+@pytest.fixture(scope="module")
+def boq(objects):
+    properties = extract_properties(objects)
+    data = new_boq_data()
+    count = len(properties)
+    data.append_properties(properties, {'Material_Unit': [1250.0] * count, 'Labor_Unit': [300.0] * count})
+    return data
+
+
+def test_get_object_properties(benchmark, objects):
+    # Per-object API, kept for callers outside the dialogs
+    sample = objects[:1000]
+    benchmark(lambda: [QTOCalculator.get_object_properties(obj) for obj in sample])
+
+
+def test_takeoff_prefilter(benchmark, document):
+    benchmark(takeoff_objects, document.Objects)
+
+
+def test_extract_properties(benchmark, objects):
+    table = benchmark(extract_properties, objects)
+    assert len(table) == len(objects)
+
+
+def test_extract_properties_deferred(benchmark, objects):
+    benchmark(extract_properties, objects, measure=False)
+
+
+def test_extract_properties_approximate(benchmark, objects):
+    benchmark(extract_properties, objects, approximate=True)
+
+
+def test_calculate_totals(benchmark, boq):
+    benchmark(calculate_totals, boq)
+
+
+def test_filter_index_build(benchmark, boq):
+    benchmark(FilterIndex, boq.column('Name'), boq.column('Label'), boq.column('Type'))
+
+
+def test_filter_search(benchmark, boq):
+    index = FilterIndex(boq.column('Name'), boq.column('Label'), boq.column('Type'))
+
+    def search():
+        # Typing a query character by character, then clearing it
+        for text in ("w", "wa", "wal", "wall"):
+            index.search(text, "Part::")
+        index.search("")
+
+    benchmark(search)
+
+
+def test_csv_export(benchmark, boq, tmp_path):
+    path = str(tmp_path / "boq.csv")
+    header = boq.headers()
+    rows = benchmark(lambda: export_rows(path, header, boq.records()))
+    assert rows == len(boq)
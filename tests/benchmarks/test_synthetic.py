@@ -0,0 +1,26 @@
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from tests.benchmarks.synthetic import make_document
+from utils.extraction import extract_properties, takeoff_objects
+
+
+def test_synthetic_documents_are_deterministic_and_measurable():
+    first, second = make_document(200, seed=3), make_document(200, seed=3)
+    assert [obj.Name for obj in first.Objects] == [obj.Name for obj in second.Objects]
+
+    objects = takeoff_objects(first.Objects)
+    assert 0 < len(objects) < len(first.Objects)
+    table = extract_properties(objects)
+    assert len(table) == len(objects)
+    assert all(volume > 0 for volume in table.column('Volume'))
+    assert first.getObject(objects[0].Name) is objects[0]
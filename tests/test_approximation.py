@@ -0,0 +1,108 @@
+import math
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.approximation import (BOUNDING_BOX, EXACT, MESH, PARAMETRIC, PRECISION_KEY,
+                                 precision_summary, volume_error_bounds)
+from utils.boq import approximation_note, new_boq_data
+from utils.extraction import extract_properties, takeoff_objects
+from utils.takeoff_store import TakeoffStore
+
+
+class DummyBoundBox:
+    def __init__(self, x, y, z):
+        self.XLength = x
+        self.YLength = y
+        self.ZLength = z
+        self.XMin = self.YMin = self.ZMin = 0.0
+        self.XMax, self.YMax, self.ZMax = x, y, z
+
+
+class UnmeasuredShape:
+    """Shape that fails if its solid is integrated"""
+
+    def __init__(self, x, y, z):
+        self.BoundBox = DummyBoundBox(x, y, z)
+
+    @property
+    def Volume(self):
+        raise AssertionError("solid measured in approximate mode")
+
+    Area = Volume
+
+
+class DummyMesh:
+    BoundBox = DummyBoundBox(1000, 1000, 1000)
+    Volume = 0.5e9
+    Area = 5e6
+
+
+def make_obj(name, type_id="Part::Feature", **attrs):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name
+    obj.TypeId = type_id
+    for key, value in attrs.items():
+        setattr(obj, key, value)
+    return obj
+
+
+def test_approximate_extraction_estimates_without_measuring_solids():
+    wall = make_obj("Wall", "Part::FeaturePython", Shape=UnmeasuredShape(4000, 300, 3000),
+                    Length=4000, Width=200, Height=3000)
+    part = make_obj("Part", Shape=UnmeasuredShape(2000, 1000, 500))
+    mesh = make_obj("Mesh", "Mesh::Feature", Mesh=DummyMesh())
+    objects = takeoff_objects([wall, part, mesh])
+    assert objects == [wall, part, mesh]
+
+    table = extract_properties(objects, approximate=True)
+    assert list(table.column(PRECISION_KEY)) == [PARAMETRIC, BOUNDING_BOX, MESH]
+    assert list(table.column('Volume')) == [2.4, 1.0, 0.5]
+    assert table.value(0, 'Area') == 26.8  # 2 × (4×0.2 + 0.2×3 + 4×3)
+    assert table.value(1, 'Area') == 7.0
+    assert table.value(2, 'Area') == 5.0
+    # Exact extraction reads meshes from their triangles too, without a tier column
+    exact = extract_properties([mesh])
+    assert exact.value(0, 'Volume') == 0.5
+    assert PRECISION_KEY not in exact.keys()
+
+
+def test_error_bounds_and_summary():
+    volumes, areas = [2.0, 1.0, 0.5], [10.0, 6.0, 5.0]
+    tiers = [EXACT, BOUNDING_BOX, MESH]
+    bounds = volume_error_bounds(volumes, areas, tiers)
+    assert bounds[:2] == [0.0, 1.0]
+    assert math.isclose(bounds[2], 5.0 * 0.0001)
+    assert precision_summary(volumes, areas, tiers) == \
+        "1 exact, 1 mesh, 1 bbox rows; volume 3.500 m³ (at most 1.000 m³ off)"
+
+
+def test_store_prefers_measured_values_over_estimates(tmp_path):
+    doc = types.SimpleNamespace(Name="Doc", FileName=str(tmp_path / "Doc.FCStd"), Objects=[])
+    box = make_obj("Box", Shape=UnmeasuredShape(1000, 1000, 1000), Document=doc)
+    store = TakeoffStore(doc)
+    assert store.properties([box], approximate=True).value(0, PRECISION_KEY) == BOUNDING_BOX
+
+    store._store([box], {'Volume': [0.75], 'Area': [5.5], 'Unit_Weight': [0.0]})
+    table = store.properties([box], approximate=True)
+    assert table.value(0, 'Volume') == 0.75
+    assert table.value(0, PRECISION_KEY) == EXACT
+
+
+def test_boq_marks_estimated_quantities():
+    data = new_boq_data()
+    assert PRECISION_KEY in data.keys()
+    assert PRECISION_KEY not in [spec.key for spec in data.specs]
+    assert new_boq_data(precision=True).headers()[-1] == "Precision"
+    assert approximation_note(EXACT) is None
+    assert approximation_note("") is None
+    assert "bounding box" in approximation_note(BOUNDING_BOX)
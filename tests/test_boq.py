@@ -0,0 +1,63 @@
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pytest
+
+from utils.boq import BOQTotals, new_boq_data
+from utils.property_table import PropertyTable, numeric_column
+
+
+def make_data(quantities):
+    data = new_boq_data()
+    data.append_properties(PropertyTable({
+        'Name': [f"Obj{i}" for i in range(len(quantities))],
+        'Quantity': numeric_column(quantities),
+    }))
+    return data
+
+
+def test_running_totals_follow_row_edits():
+    data = make_data([1, 2, 3])
+    totals = BOQTotals()
+    totals.recompute(data)
+    assert totals.grand == 0.0
+
+    data.set_value(1, 'Material_Unit', 10.0)
+    totals.update_row(data, 1)
+    data.set_value(2, 'Labor_Unit', 5.0)
+    totals.update_row(data, 2)
+    assert (totals.material, totals.labor, totals.grand) == (20.0, 15.0, 35.0)
+
+    # Changing a price again only applies the difference
+    data.set_value(1, 'Material_Unit', 4.0)
+    totals.update_row(data, 1)
+    assert totals.material == 8.0
+    assert totals.grand == 23.0
+
+
+def test_running_totals_match_recompute():
+    data = make_data([1, 2, 3, 4])
+    totals = BOQTotals()
+    for row in range(len(data)):
+        data.set_value(row, 'Material_Unit', 1.5 * row)
+        data.set_value(row, 'Labor_Unit', 0.25)
+        totals.update_row(data, row)
+
+    totals.remove_rows(data, [0, 2])
+    data.remove_rows([0, 2])
+
+    expected = BOQTotals()
+    expected.recompute(data)
+    assert totals.material == pytest.approx(expected.material)
+    assert totals.labor == pytest.approx(expected.labor)
+    assert totals.grand == pytest.approx(expected.grand)
+    assert expected.grand == pytest.approx(1.5 * 2 + 0.5 + 4.5 * 4 + 1.0)
@@ -0,0 +1,122 @@
+import csv
+import os
+import sys
+import types
+
+import pytest
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import qto_cli
+import utils.documents
+from utils.boq import BOQ_HEADERS
+
+
+class DummyBoundBox:
+    XLength = 2000
+    YLength = 1000
+    ZLength = 500
+
+
+class DummyShape:
+    BoundBox = DummyBoundBox()
+    Volume = 2000 * 1000 * 500
+    Area = 7000000
+
+
+def make_obj(name):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name
+    obj.TypeId = "Part::Box"
+    obj.Shape = DummyShape()
+    return obj
+
+
+def fake_freecad(opened, closed):
+    def open_document(filename, hidden=False):
+        if "broken" in filename:
+            raise IOError("cannot read file")
+        name = os.path.splitext(os.path.basename(filename))[0]
+        opened.append(name)
+        return types.SimpleNamespace(Name=name, FileName="", Objects=[make_obj("Box"), make_obj("Box001")])
+
+    return types.SimpleNamespace(
+        openDocument=open_document,
+        closeDocument=closed.append,
+        Console=types.SimpleNamespace(PrintMessage=lambda msg: None, PrintError=lambda msg: None),
+    )
+
+
+def test_iter_fcstd_files_filters_and_sorts(tmp_path):
+    for name in ["b.FCStd", "a.fcstd", "notes.txt"]:
+        (tmp_path / name).write_text("")
+    found = [os.path.basename(path) for path in qto_cli.iter_fcstd_files([str(tmp_path)])]
+    assert found == ["a.fcstd", "b.FCStd"]
+
+
+def test_run_writes_one_boq_per_document(tmp_path, monkeypatch):
+    opened, closed = [], []
+    freecad = fake_freecad(opened, closed)
+    monkeypatch.setattr(qto_cli, "FreeCAD", freecad)
+    monkeypatch.setattr(utils.documents, "FreeCAD", freecad)
+    for name in ["house.FCStd", "broken.FCStd", "office.FCStd"]:
+        (tmp_path / name).write_text("")
+    out_dir = tmp_path / "boq"
+
+    failures = qto_cli.run([str(tmp_path)], str(out_dir), use_cache=False)
+
+    assert failures == 1
+    assert opened == ["house", "office"]
+    assert closed == ["house", "office"]
+    with open(out_dir / "house.boq.csv", newline='', encoding='utf-8') as csvfile:
+        rows = list(csv.reader(csvfile))
+    assert rows[0] == BOQ_HEADERS
+    assert len(rows[0]) == 15
+    assert [row[0] for row in rows[1:]] == ["Box", "Box001"]
+    assert rows[1][6] == "1.0"
+    assert rows[1][8] == "1"
+
+
+def test_main_accepts_freecadcmd_pass_arguments(monkeypatch):
+    received = []
+    monkeypatch.setattr(qto_cli, "run", lambda *args: received.append(args) or 0)
+    monkeypatch.setattr(sys, "argv", ["FreeCADCmd", "qto_cli.py", "--pass", "model.FCStd", "-r"])
+    assert qto_cli.main() == 0
+    assert received == [(["model.FCStd"], None, True, True, ".csv", False)]
+
+
+def test_main_uses_worker_pool_for_jobs(monkeypatch):
+    received = []
+    monkeypatch.setattr(qto_cli, "run_parallel", lambda *args: received.append(args) or 1)
+    assert qto_cli.main(["projects", "-j", "0", "--chunks", "4"]) == 1
+    assert received == [(["projects"], None, False, None, 4, True, ".csv")]
+
+    received.clear()
+    assert qto_cli.main(["projects", "-j", "2", "--no-cache"]) == 1
+    assert received == [(["projects"], None, False, 2, 1, False, ".csv")]
+
+
+def test_approximate_run_adds_precision_column(tmp_path, monkeypatch):
+    freecad = fake_freecad([], [])
+    monkeypatch.setattr(qto_cli, "FreeCAD", freecad)
+    monkeypatch.setattr(utils.documents, "FreeCAD", freecad)
+    (tmp_path / "house.FCStd").write_text("")
+
+    assert qto_cli.run([str(tmp_path)], approximate=True) == 0
+    with open(tmp_path / "house.boq.csv", newline='', encoding='utf-8') as csvfile:
+        rows = list(csv.reader(csvfile))
+    assert rows[0] == BOQ_HEADERS + ["Precision"]
+    assert [row[-1] for row in rows[1:]] == ["bbox", "bbox"]
+    assert rows[1][6] == "1.0"
+
+
+def test_approximate_cannot_use_worker_pool():
+    with pytest.raises(SystemExit):
+        qto_cli.parse_args(["projects", "--approximate", "-j", "4"])
@@ -0,0 +1,76 @@
+import math
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.column_stats import ColumnIndex, format_summary, summarize
+from utils.property_table import PropertyTable, numeric_column
+from utils.table_data import ColumnSpec, TableData
+
+NAN = float('nan')
+
+SPECS = [
+    ColumnSpec('Name', "Object Name"),
+    ColumnSpec('Volume', "Volume (m³)", numeric=True),
+]
+
+
+def make_data(names, volumes):
+    data = TableData(SPECS)
+    data.append_properties(PropertyTable({'Name': list(names), 'Volume': numeric_column(volumes)}))
+    return data
+
+
+def test_numeric_columns_sort_by_value_with_stable_ties_and_nan_last():
+    data = make_data(["A", "B", "C", "D", "E"], [10.0, NAN, 9.0, 10.0, 2.5])
+    index = ColumnIndex(data)
+
+    assert list(index.order('Volume')) == [4, 2, 0, 3, 1]
+    assert list(index.ranks('Volume')) == [2, 4, 1, 3, 0]
+    assert list(index.order('Name')) == [0, 1, 2, 3, 4]
+
+
+def test_cached_order_is_recomputed_only_when_the_column_changes():
+    data = make_data(["A", "B", "C"], [3.0, 1.0, 2.0])
+    index = ColumnIndex(data)
+    order = index.order('Volume')
+
+    data.set_value(0, 'Name', "Z")
+    assert index.order('Volume') is order
+    assert list(index.order('Name')) == [1, 2, 0]
+
+    data.set_value(0, 'Volume', 0.5)
+    assert list(index.order('Volume')) == [0, 1, 2]
+
+    data.append_properties(PropertyTable({'Name': ["D"], 'Volume': numeric_column([0.1])}))
+    assert list(index.order('Volume')) == [3, 0, 1, 2]
+
+
+def test_lazy_columns_are_resolved_before_sorting():
+    data = make_data(["A", "B", "C"], [NAN, NAN, NAN])
+    data.set_lazy(('Volume',), lambda rows: {'Volume': [30.0 - row * 10 for row in rows]})
+    index = ColumnIndex(data)
+
+    assert list(index.order('Volume')) == [2, 1, 0]
+    assert not data.is_pending(0, 'Volume')
+
+
+def test_summaries_skip_unmeasured_cells():
+    data = make_data(["A", "B", "C", "D"], [1.5, NAN, 4.0, -0.5])
+    data.set_lazy(('Volume',), lambda rows: {'Volume': [99.0] * len(rows)})
+    summaries = ColumnIndex(data).summaries(['Volume'], rows={0, 1, 2})
+
+    assert summaries['Volume'] == (2, 1.5, 4.0, 5.5)
+    assert data.is_pending(1, 'Volume')
+    assert format_summary(summaries['Volume'], 3, "m³") == "Σ 5.50 m³ (2/3 measured)"
+
+    empty = summarize([NAN])
+    assert empty.count == 0 and math.isnan(empty.minimum)
@@ -0,0 +1,55 @@
+import os
+import sys
+import types
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.document_observer import ChangeSet, DocumentObserver
+
+
+def make_obj(name, doc):
+    return types.SimpleNamespace(Name=name, Document=doc)
+
+
+def test_change_set_coalesces_events():
+    changes = ChangeSet()
+    changes.add_created("Wall")
+    changes.add_changed("Wall")
+    changes.add_changed("Slab")
+    changes.add_deleted("Slab")
+    changes.add_created("Temp")
+    changes.add_deleted("Temp")
+
+    assert changes.created == {"Wall"}
+    assert changes.changed == set()
+    assert changes.deleted == {"Slab"}
+
+
+def test_observer_filters_document_and_properties():
+    doc = types.SimpleNamespace(Name="Model")
+    other = types.SimpleNamespace(Name="Other")
+    notifications = []
+    observer = DocumentObserver(doc, lambda: notifications.append(1))
+
+    observer.slotChangedObject(make_obj("Wall", doc), "Shape")
+    observer.slotChangedObject(make_obj("Wall2", doc), "Visibility")
+    observer.slotChangedObject(make_obj("Beam", other), "Shape")
+    observer.slotCreatedObject(make_obj("Column", doc))
+
+    changes = observer.take_changes()
+    assert changes.changed == {"Wall"}
+    assert changes.created == {"Column"}
+    assert len(notifications) == 2
+    assert not observer.take_changes()
+
+
+def test_observer_flags_closed_document():
+    doc = types.SimpleNamespace(Name="Model")
+    observer = DocumentObserver(doc)
+    observer.slotDeletedDocument(types.SimpleNamespace(Name="Other"))
+    assert not observer.document_closed
+    observer.slotDeletedDocument(doc)
+    assert observer.document_closed
@@ -0,0 +1,64 @@
+import csv
+import os
+import sys
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils import exporters
+from utils.exporters import ExportError, export_rows
+
+HEADER = ["Object Name", "Volume (m³)", "Quantity"]
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def make_rows(count):
+    return ([f"Wall<{index}>", index * 0.5, index] for index in range(count))
+
+
+def test_csv_export_streams_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporters, "CHUNK_SIZE", 4)
+    progress = []
+    path = str(tmp_path / "boq.csv")
+
+    assert export_rows(path, HEADER, make_rows(10), progress.append) == 10
+    assert progress == [4, 8, 10]
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        rows = list(csv.reader(csvfile))
+    assert rows[0] == HEADER
+    assert rows[3] == ["Wall<2>", "1.0", "2"]
+
+
+def test_xlsx_export_keeps_numbers_numeric(tmp_path):
+    path = str(tmp_path / "boq.xlsx")
+    assert export_rows(path, HEADER, make_rows(3)) == 3
+
+    with zipfile.ZipFile(path) as workbook:
+        assert "xl/workbook.xml" in workbook.namelist()
+        sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+    rows = sheet.findall("s:sheetData/s:row", SHEET_NS)
+    assert len(rows) == 4
+    name_cell, volume_cell, _ = rows[2].findall("s:c", SHEET_NS)
+    assert name_cell.find("s:is/s:t", SHEET_NS).text == "Wall<1>"
+    assert volume_cell.find("s:v", SHEET_NS).text == "0.5"
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ExportError):
+        export_rows(str(tmp_path / "boq.docx"), HEADER, make_rows(1))
+
+
+def test_parquet_requires_pyarrow(tmp_path):
+    path = str(tmp_path / "boq.parquet")
+    if exporters.pyarrow is None:
+        with pytest.raises(ExportError):
+            export_rows(path, HEADER, make_rows(2))
+        assert ".parquet" not in exporters.available_formats()
+    else:
+        assert export_rows(path, HEADER, make_rows(2)) == 2
@@ -0,0 +1,195 @@
+import os
+import pickle
+import sys
+import types
+
+import pytest
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.calculations import QTOCalculator
+from utils.property_table import PROPERTY_KEYS, PropertyRecord, PropertyTable
+
+
+class DummyBoundBox:
+    def __init__(self, x, y, z):
+        self.XLength = x
+        self.YLength = y
+        self.ZLength = z
+
+
+class DummyShape:
+    def __init__(self, x, y, z, area=None):
+        self.BoundBox = DummyBoundBox(x, y, z)
+        self.Volume = x * y * z
+        self.Area = 2 * (x * y + y * z + x * z) if area is None else area
+
+
+def make_obj(name, shape=None, **attrs):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name + "_label"
+    obj.TypeId = "Part::Feature"
+    if shape is not None:
+        obj.Shape = shape
+    for key, value in attrs.items():
+        setattr(obj, key, value)
+    return obj
+
+
+def test_extract_properties_columns():
+    objects = [
+        make_obj("Box", DummyShape(2000, 1000, 500)),
+        make_obj("Sketch"),
+        make_obj("Flat", DummyShape(3000, 2000, 10, area=0)),
+    ]
+    table = QTOCalculator.extract_properties(objects)
+
+    assert len(table) == 3
+    assert tuple(table.keys()) == PROPERTY_KEYS
+    assert list(table.column('Name')) == ["Box", "Sketch", "Flat"]
+    assert list(table.column('Length')) == [2.0, 0.0, 3.0]
+    assert list(table.column('Volume')) == [1.0, 0.0, 0.06]
+    assert list(table.column('Area')) == [7.0, 0.0, 6.0]
+    assert table.value(0, 'Quantity') == 1
+
+
+def test_extract_matches_single_object_api():
+    objects = [make_obj("A", DummyShape(1234, 567, 890)), make_obj("B", DummyShape(10, 20, 30))]
+    table = QTOCalculator.extract_properties(objects)
+    for index, obj in enumerate(objects):
+        assert table.row(index) == QTOCalculator.get_object_properties(obj)
+
+
+def test_rows_are_compact_typed_records():
+    material = types.SimpleNamespace(Label="Concrete C30")
+    obj = make_obj("A", DummyShape(2000, 1000, 500), Material=material)
+    record = QTOCalculator.get_object_properties(obj)
+    assert isinstance(record, PropertyRecord)
+    assert not hasattr(record, '__dict__')
+    assert record.Volume == record['Volume'] == 1.0
+    assert isinstance(record.Quantity, int)
+    assert record.Material is material
+    assert tuple(record.keys()) == PROPERTY_KEYS
+    with pytest.raises(KeyError):
+        record['Formwork_Area']
+
+    # Records for other processes carry the material label, and rebuild the table
+    shipped = pickle.loads(pickle.dumps(list(PropertyTable.from_records([record]).records())))
+    assert shipped[0].Material == "Concrete C30"
+    assert PropertyTable.from_records(shipped).row(0) == record._replace(Material="Concrete C30")
+
+
+def test_parametric_dimensions_override_bounding_box():
+    length = types.SimpleNamespace(Value=4000.0)
+    obj = make_obj("Wall", DummyShape(4100, 200, 3000), Length=length)
+    props = QTOCalculator.get_object_properties(obj)
+    assert props['Length'] == 4.0
+    assert props['Width'] == 0.2
+
+
+def test_object_area_used_when_shape_area_missing():
+    obj = make_obj("Slab", DummyShape(1000, 1000, 0, area=0), Area=2500000.0)
+    assert QTOCalculator.get_object_properties(obj)['Area'] == 2.5
+
+
+def test_broken_object_falls_back_to_defaults():
+    class BrokenShape:
+        @property
+        def BoundBox(self):
+            raise RuntimeError("no geometry")
+
+    table = QTOCalculator.extract_properties([make_obj("Broken", BrokenShape(), Material="Steel")])
+    row = table.row(0)
+    assert row['Name'] == "Broken"
+    assert row['Material'] == 'Unknown'
+    assert row['Volume'] == 0.0
+
+
+def test_iter_property_chunks_is_lazy():
+    from utils.extraction import iter_property_chunks
+
+    measured = []
+
+    class CountingShape(DummyShape):
+        @property
+        def BoundBox(self):
+            measured.append(self)
+            return DummyBoundBox(1000, 1000, 1000)
+
+        @BoundBox.setter
+        def BoundBox(self, value):
+            pass
+
+    objects = [make_obj(f"Box{i}", CountingShape(1000, 1000, 1000)) for i in range(5)]
+    chunks = iter_property_chunks(objects, 2)
+
+    first = next(chunks)
+    assert list(first.column('Name')) == ["Box0", "Box1"]
+    assert len(measured) == 2
+
+    rest = list(chunks)
+    assert [len(chunk) for chunk in rest] == [2, 1]
+    assert list(rest[-1].column('Volume')) == [1.0]
+
+
+class DeletedObject:
+    """Python wrapper of an object deleted from its document"""
+
+    @property
+    def Name(self):
+        raise RuntimeError("This object was deleted")
+
+
+def test_objects_deleted_while_loading_are_skipped():
+    from utils.extraction import iter_property_chunks
+
+    objects = [make_obj(f"Box{i}", DummyShape(1000, 1000, 1000)) for i in range(5)]
+    chunks = iter_property_chunks(objects, 2)
+    assert list(next(chunks).column('Name')) == ["Box0", "Box1"]
+
+    objects[2] = DeletedObject()
+    assert [list(chunk.column('Name')) for chunk in chunks] == [["Box3"], ["Box4"]]
+
+
+def test_takeoff_objects_skips_non_solids_without_touching_shapes():
+    from utils.extraction import takeoff_objects
+
+    class ExplodingShape:
+        def __getattr__(self, name):
+            raise AssertionError("shape accessed")
+
+    box = make_obj("Box", DummyShape(1000, 1000, 1000))
+    sketch = make_obj("Sketch", ExplodingShape(), TypeId="Sketcher::SketchObject")
+    origin = make_obj("Origin", ExplodingShape(), TypeId="App::Origin")
+    group = make_obj("Group")
+    assert takeoff_objects([origin, box, sketch, group]) == [box]
+
+
+def test_extract_without_measuring_leaves_lazy_columns_pending():
+    import math
+    from utils.extraction import measure_objects
+
+    box = make_obj("Box", DummyShape(2000, 1000, 500))
+    table = QTOCalculator.extract_properties([box], measure=False)
+    assert table.value(0, 'Length') == 2.0
+    assert math.isnan(table.value(0, 'Volume'))
+    assert math.isnan(table.value(0, 'Area'))
+
+    assert measure_objects([box, None]) == {'Volume': [1.0, 0.0], 'Area': [7.0, 0.0], 'Unit_Weight': [0.0, 0.0]}
+
+
+def test_unit_weight_from_material_density():
+    from utils.materials import MaterialCatalog, MaterialSpec
+
+    catalog = MaterialCatalog({"Concrete": MaterialSpec(density=2400)})
+    objects = [make_obj("Slab", DummyShape(2000, 1000, 500), Material="Concrete"),
+               make_obj("Box", DummyShape(1000, 1000, 1000))]
+    table = QTOCalculator.extract_properties(objects, catalog=catalog)
+    assert list(table.column('Unit_Weight')) == [2400.0, 0.0]
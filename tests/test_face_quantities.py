@@ -0,0 +1,124 @@
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.face_quantities import BOTTOM, SIDE, TOP, FaceClassifier, classify_face, extract_face_quantities
+
+
+class DummyVector:
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class DummyFace:
+    _next_hash = 0
+
+    def __init__(self, normal, area, wires=1, gross_area=None, hash_code=None):
+        DummyFace._next_hash += 1
+        self._hash = DummyFace._next_hash if hash_code is None else hash_code
+        self._tshape = object()
+        self._normal = DummyVector(*normal)
+        self.Area = area
+        self.Orientation = "Forward"
+        self.ParameterRange = (0.0, 1.0, 0.0, 1.0)
+        self.Wires = [object()] * wires
+        self.Surface = None
+        self.OuterWire = gross_area if gross_area is not None else area
+        self.normal_calls = 0
+
+    def hashCode(self):
+        return self._hash
+
+    def isSame(self, other):
+        return self._tshape is other._tshape
+
+    def normalAt(self, u, v):
+        self.normal_calls += 1
+        return self._normal
+
+
+def box_faces(x, y, z):
+    """Faces of an axis-aligned box (mm)"""
+    return [
+        DummyFace((0, 0, 1), x * y),
+        DummyFace((0, 0, -1), x * y),
+        DummyFace((1, 0, 0), y * z),
+        DummyFace((-1, 0, 0), y * z),
+        DummyFace((0, 1, 0), x * z),
+        DummyFace((0, -1, 0), x * z),
+    ]
+
+
+def make_obj(name, faces):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Shape = types.SimpleNamespace(Faces=faces)
+    return obj
+
+
+def test_classify_face_by_normal():
+    assert classify_face(DummyFace((0, 0, 1), 1.0)).face_class == TOP
+    assert classify_face(DummyFace((0, 0.2, -0.98), 1.0)).face_class == BOTTOM
+    assert classify_face(DummyFace((0.7, 0, 0.7), 1.0)).face_class == SIDE
+
+
+def test_slab_quantities():
+    # 4 m x 3 m x 0.2 m slab
+    table = extract_face_quantities([make_obj("Slab", box_faces(4000, 3000, 200))], FaceClassifier())
+
+    assert table.value(0, 'Top_Area') == 12.0
+    # Sides 2 * (3 * 0.2 + 4 * 0.2) = 2.8 plus soffit 12
+    assert table.value(0, 'Formwork_Area') == 14.8
+    assert table.value(0, 'Wall_Net_Area') == 0.8
+    assert table.value(0, 'Openings_Area') == 0.0
+
+
+def test_wall_net_area_excludes_openings(monkeypatch):
+    # Part.Face(surface, outer_wire).Area -> gross area stored on OuterWire
+    fake_part = types.SimpleNamespace(Face=lambda surface, wire: types.SimpleNamespace(Area=wire))
+    monkeypatch.setitem(sys.modules, 'Part', fake_part)
+
+    # 5 m x 3 m wall face with a 2 m² window in it
+    faces = [DummyFace((0, 1, 0), 13e6, wires=2, gross_area=15e6), DummyFace((0, -1, 0), 13e6, wires=2, gross_area=15e6),
+             DummyFace((0, 0, 1), 1e6)]
+    table = extract_face_quantities([make_obj("Wall", faces), types.SimpleNamespace(Name="Sketch")], FaceClassifier())
+
+    assert table.value(0, 'Wall_Net_Area') == 13.0
+    assert table.value(0, 'Openings_Area') == 2.0
+    assert list(table.column('Name')) == ["Wall", "Sketch"]
+    assert table.value(1, 'Formwork_Area') == 0.0
+
+
+def test_faces_are_classified_once():
+    faces = box_faces(1000, 1000, 1000)
+    classifier = FaceClassifier()
+    obj = make_obj("Box", faces)
+
+    first = extract_face_quantities([obj], classifier)
+    second = extract_face_quantities([obj], classifier)
+
+    assert first.value(0, 'Formwork_Area') == second.value(0, 'Formwork_Area') == 5.0
+    assert all(face.normal_calls == 1 for face in faces)
+    assert (classifier.misses, classifier.hits) == (6, 6)
+
+
+def test_reused_hash_code_is_not_a_cache_hit():
+    classifier = FaceClassifier()
+    old = DummyFace((0, 0, 1), 1000000)
+    assert classifier.face_info(old).face_class == TOP
+
+    # A face of a recomputed shape reporting the same hash code
+    new = DummyFace((1, 0, 0), 500000, hash_code=old.hashCode())
+    info = classifier.face_info(new)
+
+    assert (info.face_class, info.area) == (SIDE, 500000)
+    assert (classifier.misses, classifier.hits) == (2, 0)
+    assert classifier.face_info(new) is info
@@ -0,0 +1,39 @@
+import os
+import sys
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.filter_index import FilterIndex
+
+NAMES = ["Wall", "Wall001", "Beam", "Column", "Slab"]
+LABELS = ["Outer Wall", "Inner wall", "Main Beam", "C1", "Ground Slab"]
+TYPES = ["Part::FeaturePython", "Part::FeaturePython", "Part::Feature", "Part::Feature", "Part::Box"]
+
+
+def test_no_filter_shows_all_rows():
+    assert FilterIndex(NAMES, LABELS, TYPES).search() is None
+
+
+def test_search_matches_name_or_label_case_insensitive():
+    index = FilterIndex(NAMES, LABELS, TYPES)
+    assert index.search("WALL") == {0, 1}
+    assert index.search("ground") == {4}
+
+
+def test_type_filter_uses_substring_match():
+    index = FilterIndex(NAMES, LABELS, TYPES)
+    assert index.search(type_filter="Part::Feature") == {0, 1, 2, 3}
+    assert index.search(type_filter="Part::Box") == {4}
+    assert index.types() == ["Part::Box", "Part::Feature", "Part::FeaturePython"]
+
+
+def test_extended_query_narrows_previous_result():
+    index = FilterIndex(NAMES, LABELS, TYPES)
+    assert index.search("a") == {0, 1, 2, 4}
+    # Poison the index: a rescan would find row 3 again, narrowing cannot
+    index._names[3] = "ma"
+    assert index.search("ma") == {2}
+    assert index.search("ma", "Part::Feature") == {2, 3}
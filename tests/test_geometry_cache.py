@@ -0,0 +1,105 @@
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.calculations import QTOCalculator
+from utils.geometry_cache import GeometryCache, cache_path_for_document, shape_fingerprint
+
+
+class DummyBoundBox:
+    def __init__(self, x, y, z):
+        self.XLength = x
+        self.YLength = y
+        self.ZLength = z
+
+
+class CountingShape:
+    """Shape stub that counts how often Volume/Area are computed"""
+
+    def __init__(self, x, y, z):
+        self.BoundBox = DummyBoundBox(x, y, z)
+        self.measurements = 0
+        self._volume = x * y * z
+        self._area = 2 * (x * y + y * z + x * z)
+
+    @property
+    def Volume(self):
+        self.measurements += 1
+        return self._volume
+
+    @property
+    def Area(self):
+        self.measurements += 1
+        return self._area
+
+
+def make_obj(name, shape):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name
+    obj.TypeId = "Part::Feature"
+    obj.Shape = shape
+    return obj
+
+
+def test_cached_values_are_reused_across_sessions(tmp_path):
+    path = str(tmp_path / "model.qto-cache.json")
+    shape = CountingShape(2000, 1000, 500)
+    obj = make_obj("Box", shape)
+
+    cache = GeometryCache(path)
+    first = QTOCalculator.extract_properties([obj], cache).row(0)
+    cache.save()
+    assert shape.measurements == 2
+
+    reloaded = GeometryCache(path)
+    second = QTOCalculator.extract_properties([obj], reloaded).row(0)
+    assert shape.measurements == 2
+    assert reloaded.hits == 1
+    assert second == first
+
+
+def test_changed_shape_invalidates_entry():
+    cache = GeometryCache()
+    obj = make_obj("Box", CountingShape(1000, 1000, 1000))
+    QTOCalculator.extract_properties([obj], cache)
+
+    obj.Shape = CountingShape(2000, 1000, 1000)
+    props = QTOCalculator.extract_properties([obj], cache).row(0)
+    assert props['Volume'] == 2.0
+    assert cache.misses == 2
+    assert len(cache) == 1
+
+
+def test_lru_eviction_respects_size_cap():
+    cache = GeometryCache(max_entries=2)
+    cache.put("A", "fa", 1.0, 1.0)
+    cache.put("B", "fb", 2.0, 2.0)
+    assert cache.get("A", "fa") == (1.0, 1.0)
+    cache.put("C", "fc", 3.0, 3.0)
+
+    assert cache.get("B", "fb") is None
+    assert cache.get("A", "fa") is not None
+    assert cache.get("C", "fc") is not None
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "broken.qto-cache.json"
+    path.write_text("{not json")
+    assert len(GeometryCache(str(path))) == 0
+
+
+def test_fingerprint_and_cache_path():
+    shape = CountingShape(10, 20, 30)
+    assert shape_fingerprint(shape) == shape_fingerprint(CountingShape(10, 20, 30))
+    assert shape_fingerprint(shape) != shape_fingerprint(CountingShape(10, 20, 31))
+    doc = types.SimpleNamespace(Name="Model", FileName=os.path.join("projects", "model.FCStd"))
+    assert cache_path_for_document(doc) == os.path.join("projects", "model.qto-cache.json")
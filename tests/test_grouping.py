@@ -0,0 +1,132 @@
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pytest
+
+from utils.boq import calculate_row_totals, new_boq_data
+from utils.grouping import GROUP_BY, BOQGroups, group_boq, label_pattern
+from utils.property_table import PropertyTable, numeric_column
+
+
+def make_data(rows):
+    """rows: (label, type, material, volume)"""
+    data = new_boq_data()
+    data.append_properties(PropertyTable({
+        'Name': [f"Obj{i}" for i in range(len(rows))],
+        'Label': [row[0] for row in rows],
+        'Type': [row[1] for row in rows],
+        'Material': [row[2] for row in rows],
+        'Volume': numeric_column([row[3] for row in rows]),
+        'Quantity': numeric_column([1.0] * len(rows)),
+    }))
+    return data
+
+
+ROWS = [
+    ("Rebar001", "Arch::Rebar", "Steel", 0.01),
+    ("Rebar002", "Arch::Rebar", "Steel", 0.01),
+    ("Slab", "Arch::Structure", "Concrete", 2.0),
+    ("Rebar_3", "Arch::Rebar", "Steel", 0.02),
+]
+
+
+def test_label_pattern_strips_copy_numbers():
+    assert label_pattern("Rebar017") == "Rebar"
+    assert label_pattern("Column_12") == "Column"
+    assert label_pattern("Slab") == "Slab"
+    assert label_pattern("007") == "007"
+
+
+def test_groups_sum_rows_by_key():
+    data = make_data(ROWS)
+    groups = group_boq(data, 'Label pattern')
+
+    assert [groups.group(i).key for i in range(len(groups))] == ["Rebar", "Slab"]
+    rebar = groups.groups["Rebar"]
+    assert rebar.rows == [0, 1, 3]
+    assert rebar.sums['Quantity'] == 3.0
+    assert rebar.sums['Volume'] == pytest.approx(0.04)
+    assert group_boq(data, 'None') is None
+
+
+def test_row_updates_adjust_only_their_group():
+    data = make_data(ROWS)
+    groups = BOQGroups(data, GROUP_BY['Material'])
+
+    data.set_value(1, 'Material_Unit', 100.0)
+    calculate_row_totals(data, 1)
+    assert groups.update_row(1) is False
+    assert groups.groups["Steel"].sums['Total'] == 100.0
+    assert groups.groups["Concrete"].sums['Total'] == 0.0
+
+    # Changing the material moves the row to another group
+    data.set_value(1, 'Material', "Concrete")
+    assert groups.update_row(1) is True
+    assert groups.groups["Steel"].rows == [0, 3]
+    assert groups.groups["Concrete"].rows == [1, 2]
+    assert groups.groups["Concrete"].sums['Total'] == 100.0
+    assert groups.groups["Steel"].sums['Total'] == 0.0
+
+
+def test_add_and_remove_rows_match_rebuild():
+    data = make_data(ROWS)
+    groups = BOQGroups(data, GROUP_BY['Type'])
+
+    new_rows = data.append_properties(PropertyTable({
+        'Name': ["Beam"], 'Label': ["Beam"], 'Type': ["Arch::Beam"], 'Material': ["Steel"],
+        'Volume': numeric_column([0.5]), 'Quantity': numeric_column([1.0]),
+    }))
+    assert groups.add_rows(new_rows) is True
+
+    groups.remove_rows([2])
+    data.remove_rows([2])
+    assert "Arch::Structure" not in groups.groups
+    assert groups.groups["Arch::Beam"].rows == [3]
+
+    rebuilt = BOQGroups(data, GROUP_BY['Type'])
+    for key, group in rebuilt.groups.items():
+        assert groups.groups[key].rows == group.rows
+        assert groups.groups[key].sums == pytest.approx(group.sums)
+    assert groups.totals()['Volume'] == pytest.approx(0.54)
+
+
+def test_new_groups_keep_sorted_order():
+    data = make_data(ROWS)
+    groups = BOQGroups(data, GROUP_BY['Type'])
+
+    new_rows = data.append_properties(PropertyTable({
+        'Name': ["Beam"], 'Label': ["Beam"], 'Type': ["Arch::Beam"], 'Material': ["Steel"],
+        'Volume': numeric_column([0.5]), 'Quantity': numeric_column([1.0]),
+    }))
+    groups.add_rows(new_rows)
+    assert groups.order == ["Arch::Beam", "Arch::Rebar", "Arch::Structure"]
+    assert [groups.index_of(key) for key in groups.order] == [0, 1, 2]
+
+
+def test_pending_lazy_cells_are_not_measured_by_grouping():
+    data = make_data(ROWS)
+    for row in range(len(data)):
+        data.set_value(row, 'Volume', float('nan'))
+    measured = []
+
+    def provider(rows):
+        measured.extend(rows)
+        return {'Volume': [1.0] * len(rows)}
+
+    groups = BOQGroups(data, GROUP_BY['Type'])
+    data.set_lazy(('Volume',), provider, groups.update_rows)
+    assert measured == []
+    assert groups.groups["Arch::Rebar"].sums['Volume'] == 0.0
+
+    data.resolve([0, 1])
+    assert groups.groups["Arch::Rebar"].sums['Volume'] == 2.0
+    assert groups.groups["Arch::Structure"].sums['Volume'] == 0.0
@@ -0,0 +1,104 @@
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.calculations import QTOCalculator
+from utils.extraction import takeoff_objects
+from utils.instances import Instance, resolve_instance
+from utils.materials import MaterialCatalog, MaterialSpec
+
+
+class DummyBoundBox:
+    def __init__(self, x, y, z):
+        self.XLength = x
+        self.YLength = y
+        self.ZLength = z
+
+
+class CountingShape:
+    """Box shape that counts how often its volume is measured"""
+
+    def __init__(self, x, y, z):
+        self.BoundBox = DummyBoundBox(x, y, z)
+        self.Area = 2 * (x * y + y * z + x * z)
+        self._volume = x * y * z
+        self.volume_reads = 0
+
+    @property
+    def Volume(self):
+        self.volume_reads += 1
+        return self._volume
+
+
+def make_obj(name, type_id="Part::Feature", **attrs):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name
+    obj.TypeId = type_id
+    for key, value in attrs.items():
+        setattr(obj, key, value)
+    return obj
+
+
+def draft(name, kind, **attrs):
+    return make_obj(name, "Part::FeaturePython", Proxy=types.SimpleNamespace(Type=kind),
+                    Shape=CountingShape(1, 1, 1), **attrs)
+
+
+def test_resolve_links_clones_and_arrays():
+    base = make_obj("Bar", Shape=CountingShape(1000, 100, 100))
+    link = make_obj("Link", "App::Link", LinkedObject=base, ElementCount=0)
+    link_array = make_obj("LinkArray", "App::Link", LinkedObject=base, ElementCount=4)
+    scaled_link = make_obj("ScaledLink", "App::Link", LinkedObject=base, Scale=2.0)
+    stretched_link = make_obj("StretchedLink", "App::Link", LinkedObject=base, Scale=1.0,
+                              ScaleVector=types.SimpleNamespace(x=1.0, y=1.0, z=3.0))
+    clone = draft("Clone", "Clone", Objects=[base], Scale=types.SimpleNamespace(x=1.0, y=1.0, z=1.0))
+    scaled = draft("Scaled", "Clone", Objects=[base], Scale=types.SimpleNamespace(x=2.0, y=1.0, z=1.0))
+    ortho = draft("Array", "Array", Base=clone, ArrayType="ortho", NumberX=3, NumberY=2, NumberZ=1)
+    counted = draft("Polar", "Array", Base=link_array, Count=6)
+    fused = draft("Fused", "Array", Base=base, Count=6, Fuse=True)
+
+    assert resolve_instance(base) == Instance(base, 1)
+    assert resolve_instance(link) == Instance(base, 1)
+    assert resolve_instance(link_array) == Instance(base, 4)
+    assert resolve_instance(scaled_link) == Instance(scaled_link, 1)
+    assert resolve_instance(stretched_link) == Instance(stretched_link, 1)
+    assert resolve_instance(clone) == Instance(base, 1)
+    assert resolve_instance(scaled) == Instance(scaled, 1)
+    assert resolve_instance(ortho) == Instance(base, 6)
+    assert resolve_instance(counted) == Instance(base, 24)
+    assert resolve_instance(fused) == Instance(fused, 1)
+
+
+def test_shared_geometry_is_measured_once_and_multiplied():
+    shape = CountingShape(1000, 1000, 500)
+    base = make_obj("Block", Shape=shape, Material="Concrete")
+    link = make_obj("Link", "App::Link", LinkedObject=base)
+    array = draft("Array", "Array", Base=base, ArrayType="ortho", NumberX=10, NumberY=1, NumberZ=1)
+    catalog = MaterialCatalog({"Concrete": MaterialSpec(density=2400)})
+
+    table = QTOCalculator.extract_properties([base, link, array], catalog=catalog)
+
+    assert shape.volume_reads == 1
+    assert list(table.column('Quantity')) == [1, 1, 10]
+    assert list(table.column('Volume')) == [0.5, 0.5, 5.0]
+    assert list(table.column('Length')) == [1.0, 1.0, 1.0]
+    assert list(table.column('Material')) == ["Concrete", "Concrete", "Concrete"]
+    assert list(table.column('Unit_Weight')) == [1200.0, 1200.0, 1200.0]
+    assert table.value(2, 'Type') == "Part::FeaturePython"
+
+
+def test_links_to_non_solids_are_skipped():
+    sketch = make_obj("Sketch", "Sketcher::SketchObject", Shape=CountingShape(1, 1, 0))
+    base = make_obj("Box", Shape=CountingShape(1, 1, 1))
+    link_to_sketch = make_obj("Link", "App::Link", LinkedObject=sketch)
+    link_to_box = make_obj("Link001", "App::Link", LinkedObject=base)
+    assert takeoff_objects([link_to_sketch, link_to_box]) == [link_to_box]
@@ -0,0 +1,81 @@
+import json
+import os
+import sqlite3
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils import materials
+from utils.boq import catalog_prices
+from utils.materials import (
+    UNKNOWN_MATERIAL, MaterialCatalog, MaterialSpec, catalog_paths, load_catalog, load_catalogs
+)
+from utils.property_table import PropertyTable, numeric_column
+
+
+def write_json(path, entries):
+    path.write_text(json.dumps({"materials": entries}), encoding="utf-8")
+    return str(path)
+
+
+def test_load_json_and_sqlite(tmp_path):
+    json_path = write_json(tmp_path / "materials.json",
+                           {"Concrete": {"density": 2400, "unit_price": 2500, "labor_rate": 400}})
+    assert load_catalog(json_path).resolve("concrete") == MaterialSpec(2400.0, 2500.0, 400.0)
+
+    db_path = str(tmp_path / "materials.sqlite")
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE materials (name TEXT, density REAL, unit_price REAL, labor_rate REAL)")
+    connection.execute("INSERT INTO materials VALUES ('Steel', 7850, 30, NULL)")
+    connection.commit()
+    connection.close()
+    assert load_catalog(db_path).resolve("Steel") == MaterialSpec(7850.0, 30.0, 0.0)
+
+
+def test_later_catalogs_override_earlier(tmp_path):
+    base = write_json(tmp_path / "base.json", {"Concrete": {"density": 2400}, "Steel": {"density": 7850}})
+    project = write_json(tmp_path / "model.materials.json", {"concrete": {"density": 2400, "unit_price": 3000}})
+    catalog = load_catalogs([base, str(tmp_path / "missing.json"), project])
+
+    assert catalog.resolve("Concrete").unit_price == 3000.0
+    assert catalog.resolve("Steel").density == 7850.0
+    assert catalog.resolve("Unobtainium") == UNKNOWN_MATERIAL
+
+
+def test_catalog_paths_include_project_catalog():
+    paths = catalog_paths(os.path.join("projects", "model.FCStd"))
+    assert paths[0] == materials.BUNDLED_CATALOG
+    assert paths[-2:] == [os.path.join("projects", "model.materials.json"),
+                          os.path.join("projects", "model.materials.sqlite")]
+    assert load_catalogs([materials.BUNDLED_CATALOG]).resolve("Concrete").density == 2400.0
+
+
+def test_each_distinct_material_is_resolved_once(monkeypatch):
+    catalog = MaterialCatalog({"Concrete": MaterialSpec(2400, 2500, 400), "Steel": MaterialSpec(7850, 30, 5)})
+    resolved = []
+    original = catalog.resolve
+    monkeypatch.setattr(catalog, "resolve", lambda material: resolved.append(material) or original(material))
+
+    arch_material = types.SimpleNamespace(Label="Block", Material={"Density": "1400 kg/m^3"})
+    names = ["Concrete", "Steel", "Concrete", arch_material, "Unknown", "Steel", arch_material]
+    columns = catalog.columns(names)
+
+    assert resolved == ["Concrete", "Steel", arch_material, "Unknown"]
+    assert list(columns['Density']) == [2400, 7850, 2400, 1400, 0, 7850, 1400]
+    assert list(columns['Material_Unit']) == [2500, 30, 2500, 0, 0, 30, 0]
+    assert list(catalog.weights(names[:2], numeric_column([0.5, 0.01]))) == [1200.0, 78.5]
+
+
+def test_catalog_prices_prefill_boq_rows():
+    catalog = MaterialCatalog({"Concrete": MaterialSpec(2400, 2500, 400)})
+    properties = PropertyTable({'Name': ["Slab", "Box"], 'Material': ["Concrete", "Unknown"]})
+    prices = catalog_prices(catalog, properties)
+    assert list(prices['Material_Unit']) == [2500.0, 0.0]
+    assert list(prices['Labor_Unit']) == [400.0, 0.0]
@@ -0,0 +1,103 @@
+import math
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from tests.benchmarks.synthetic import SyntheticBoundBox, make_document
+from utils import measure_executor
+from utils.extraction import extract_properties, measure_objects, takeoff_objects
+from utils.geometry_cache import GeometryCache
+from utils.measure_executor import MeasureExecutor, ShapeError, default_executor
+
+
+class ThreadRecordingShape:
+    """Shape that records which threads measured it"""
+
+    def __init__(self, size, threads):
+        self._size = size
+        self._threads = threads
+        self.BoundBox = SyntheticBoundBox(0, 0, 0, size, size, size)
+        self.Area = 6 * size * size
+
+    @property
+    def Volume(self):
+        self._threads.add(threading.get_ident())
+        if self._size < 0:
+            raise RuntimeError("invalid shape")
+        return self._size ** 3
+
+
+def test_results_keep_shape_order_across_workers():
+    threads = set()
+    shapes = [ThreadRecordingShape(size, threads) for size in range(1, 201)]
+    with MeasureExecutor(workers=4, min_parallel=1) as executor:
+        results = executor.map(shapes, ('Volume', 'Area'))
+    assert [volume for volume, _ in results] == [size ** 3 for size in range(1, 201)]
+    assert threading.get_ident() not in threads
+
+
+def test_small_batches_and_failures_stay_per_shape():
+    threads = set()
+    executor = MeasureExecutor(workers=4)
+    results = executor.map([ThreadRecordingShape(2, threads), ThreadRecordingShape(-1, threads)], ('Volume',))
+    # Below min_parallel the calling thread measures, and no pool is started
+    assert threads == {threading.get_ident()}
+    assert executor._pool is None
+    assert results[0] == (8,)
+    assert isinstance(results[1], ShapeError)
+
+
+def test_only_allow_listed_operations_run_on_workers():
+    with pytest.raises(ValueError):
+        MeasureExecutor(workers=2).map([], ('Volume', 'common'))
+
+
+def test_threaded_extraction_matches_serial_extraction(tmp_path):
+    objects = takeoff_objects(make_document(500, seed=3).Objects)
+    serial = extract_properties(objects)
+    with MeasureExecutor(workers=4, min_parallel=1) as executor:
+        threaded = extract_properties(objects, executor=executor)
+        deferred = extract_properties(objects, measure=False, executor=executor)
+        cache = GeometryCache(str(tmp_path / "cache.json"))
+        extract_properties(objects, cache, executor=executor)
+        assert cache.misses == len(objects)
+        cached = measure_objects(objects, cache, executor=executor)
+
+    assert list(threaded.records()) == list(serial.records())
+    assert list(deferred.column('Length')) == list(serial.column('Length'))
+    assert all(math.isnan(value) for value in deferred.column('Volume'))
+    assert cache.hits == len(objects)
+    assert list(cached['Volume']) == list(serial.column('Volume'))
+
+
+def test_failed_shape_only_fails_its_object():
+    objects = takeoff_objects(make_document(100, seed=1).Objects)
+    objects[5].Shape = ThreadRecordingShape(-1, set())
+    with MeasureExecutor(workers=4, min_parallel=1) as executor:
+        table = extract_properties(objects, executor=executor)
+    assert table.value(5, 'Volume') == 0.0
+    assert table.value(6, 'Volume') == extract_properties([objects[6]]).value(0, 'Volume')
+
+
+def test_default_executor_is_opt_in(monkeypatch):
+    monkeypatch.setattr(measure_executor, '_default_executor', None)
+    monkeypatch.delenv(measure_executor.THREADS_ENV, raising=False)
+    assert default_executor() is None
+    monkeypatch.setenv(measure_executor.THREADS_ENV, "1")
+    assert default_executor() is None
+    monkeypatch.setenv(measure_executor.THREADS_ENV, "3")
+    executor = default_executor()
+    assert executor.workers == 3
+    assert default_executor() is executor
+    executor.close()
@@ -0,0 +1,57 @@
+import os
+import sys
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.parallel import RowBatch, make_tasks, merge_batches, parallel_takeoff
+from utils.property_table import PROPERTY_KEYS
+
+
+def fake_worker(task):
+    """Pretend every document holds six objects named after the file"""
+    if "broken" in task.filename:
+        raise ValueError("unreadable document")
+    if "crash" in task.filename:
+        os._exit(1)
+    names = [f"{task.filename}-{index}" for index in range(6)]
+    start = len(names) * task.chunk // task.chunks
+    stop = len(names) * (task.chunk + 1) // task.chunks
+    records = [(name, name, "Part::Box", "Concrete", 1.0, 1.0, 1.0, 1.0, 6.0, 1, 0.0)
+               for name in names[start:stop]]
+    return RowBatch(task, records)
+
+
+def test_make_tasks_orders_files_then_chunks():
+    tasks = make_tasks(["a", "b"], chunks=2)
+    assert [(task.index, task.filename, task.chunk) for task in tasks] == [
+        (0, "a", 0), (1, "a", 1), (2, "b", 0), (3, "b", 1)]
+    assert all(task.use_cache for task in tasks)
+    assert not any(task.use_cache for task in make_tasks(["a"], use_cache=False))
+
+
+def test_in_process_run_merges_chunks_in_order():
+    tasks = make_tasks(["a", "broken", "b"], chunks=3)
+    merged = list(merge_batches(parallel_takeoff(tasks, workers=0, worker=fake_worker)))
+
+    assert [filename for filename, _, _ in merged] == ["a", "broken", "b"]
+    filename, table, errors = merged[0]
+    assert errors == []
+    assert list(table.column('Name')) == [f"a-{index}" for index in range(6)]
+    assert tuple(table.keys()) == PROPERTY_KEYS
+    assert len(merged[1][2]) == 3
+    assert "unreadable document" in merged[1][2][0]
+
+
+def test_process_pool_isolates_failures_and_keeps_order():
+    tasks = make_tasks(["a", "crash", "broken", "b"], chunks=2)
+    batches = list(parallel_takeoff(tasks, workers=2, worker=fake_worker))
+
+    assert [batch.task.index for batch in batches] == list(range(len(tasks)))
+    by_file = {filename: (len(table), errors) for filename, table, errors in merge_batches(batches)}
+    assert by_file["a"] == (6, [])
+    assert by_file["b"] == (6, [])
+    assert by_file["broken"][1]
+    assert by_file["crash"][1]
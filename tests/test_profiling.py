@@ -0,0 +1,92 @@
+import json
+import os
+import pstats
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils import profiling
+from utils.calculations import QTOCalculator
+from utils.geometry_cache import GeometryCache
+from utils.profiling import Profiler
+
+
+class DummyBoundBox:
+    XLength = 1000
+    YLength = 1000
+    ZLength = 1000
+
+
+class DummyShape:
+    BoundBox = DummyBoundBox()
+    Area = 6000000
+    Volume = 1000000000
+
+
+def make_obj(name):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name
+    obj.TypeId = "Part::Box"
+    obj.Shape = DummyShape()
+    return obj
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.span('load'):
+        profiler.count('shape.read')
+    assert profiler.events == []
+    assert profiler.counters == {}
+
+
+def test_chrome_trace_contains_spans_and_counters(tmp_path):
+    profiler = Profiler()
+    path = str(tmp_path / "trace.json")
+    profiler.start(path)
+    with profiler.span('load', objects=2):
+        with profiler.span('extract'):
+            profiler.count('shape.read', 2)
+    assert profiler.stop() == path
+
+    with open(path, encoding='utf-8') as trace_file:
+        trace = json.load(trace_file)
+    spans = {event['name']: event for event in trace['traceEvents'] if event['ph'] == 'X'}
+    assert spans['load']['args'] == {'objects': 2}
+    assert spans['load']['dur'] >= spans['extract']['dur']
+    assert trace['otherData']['counters'] == {'shape.read': 2}
+    assert profiler.summary()['extract']['calls'] == 1
+
+
+def test_cprofile_stats_are_written_for_prof_paths(tmp_path):
+    profiler = Profiler()
+    path = str(tmp_path / "trace.prof")
+    profiler.start(path)
+    sum(range(1000))
+    profiler.stop()
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_extraction_counts_shape_and_cache_accesses(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling.FreeCAD.Console, 'PrintMessage', lambda msg: None, raising=False)
+    objects = [make_obj("A"), make_obj("B")]
+    cache = GeometryCache(str(tmp_path / "cache.json"))
+
+    assert profiling.toggle_profiling(str(tmp_path / "trace.json"))
+    QTOCalculator.extract_properties(objects, cache)
+    QTOCalculator.extract_properties(objects, cache)
+    counters = dict(profiling.PROFILER.counters)
+    assert not profiling.toggle_profiling()
+    assert not profiling.toggle_profiling(enable=False)
+
+    assert counters == {'shape.read': 4, 'shape.measure': 2,
+                        'geometry_cache.miss': 2, 'geometry_cache.hit': 2}
+    assert profiling.PROFILER.summary()['extract']['calls'] == 2
+    assert os.path.exists(tmp_path / "trace.json")
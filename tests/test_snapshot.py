@@ -0,0 +1,115 @@
+import math
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.boq import calculate_totals, new_boq_data
+from utils.property_table import PropertyTable, numeric_column
+from utils.snapshot import (SIGNATURE_KEY, load_snapshot, object_signature, object_signatures,
+                            save_snapshot, snapshot_path_for_document, stale_changes)
+
+
+class DummyBoundBox:
+    def __init__(self, x, y, z):
+        self.XLength = x
+        self.YLength = y
+        self.ZLength = z
+
+
+class DummyShape:
+    def __init__(self, x, y, z):
+        self.BoundBox = DummyBoundBox(x, y, z)
+        self.Faces = [object()] * 6
+
+    @property
+    def Volume(self):
+        raise AssertionError("signatures must not measure shapes")
+
+
+def make_obj(name, size=(1000, 1000, 1000), material="Concrete"):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name
+    obj.TypeId = "Part::Feature"
+    obj.Material = material
+    obj.Shape = DummyShape(*size)
+    return obj
+
+
+def make_data():
+    data = new_boq_data()
+    properties = PropertyTable({
+        'Name': ["Wall", "Slab"],
+        'Type': ["Part::Feature", "Part::Feature"],
+        'Material': ["Concrete", "Brick"],
+        'Label': ["Wall", "Slab"],
+        'Volume': numeric_column([1.5, math.nan]),
+        'Quantity': numeric_column([1, 4]),
+    })
+    data.append_properties(properties, {'Material_Unit': [100.0, 2.5], SIGNATURE_KEY: ["a", "b"]})
+    calculate_totals(data)
+    return data
+
+
+def test_snapshot_round_trip_keeps_prices_and_pending_cells(tmp_path):
+    data = make_data()
+    path = str(tmp_path / "model.qto-snapshot")
+    save_snapshot(path, data)
+
+    snapshot = load_snapshot(path)
+    assert snapshot.rows == 2
+    restored = new_boq_data()
+    restored.replace_columns(snapshot.columns, snapshot.rows)
+
+    assert restored.column('Name') == ["Wall", "Slab"]
+    assert restored.column(SIGNATURE_KEY) == ["a", "b"]
+    assert restored.value(0, 'Volume') == 1.5
+    assert restored.is_pending(1, 'Volume')
+    assert list(restored.column('Total')) == [100.0, 10.0]
+
+
+def test_invalid_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "model.qto-snapshot"
+    assert load_snapshot(str(path)) is None
+
+    path.write_bytes(b"not a snapshot")
+    assert load_snapshot(str(path)) is None
+
+    save_snapshot(str(path), make_data())
+    path.write_bytes(path.read_bytes()[:40])
+    assert load_snapshot(str(path)) is None
+
+
+def test_snapshot_path_follows_document(tmp_path):
+    doc = types.SimpleNamespace(Name="Model", FileName=str(tmp_path / "Model.FCStd"))
+    assert snapshot_path_for_document(doc) == str(tmp_path / "Model.qto-snapshot")
+
+
+def test_stale_changes_only_reports_modified_objects():
+    wall, slab, beam = make_obj("Wall"), make_obj("Slab"), make_obj("Beam")
+    names = ["Wall", "Slab", "Column"]
+    saved = object_signatures([wall, slab]) + ["c"]
+
+    slab.Shape = DummyShape(1000, 1000, 200)
+    changes = stale_changes(names, saved, [wall, slab, beam])
+
+    assert changes.changed == {"Slab"}
+    assert changes.created == {"Beam"}
+    assert changes.deleted == {"Column"}
+
+
+def test_signature_tracks_material():
+    obj = make_obj("Wall")
+    before = object_signature(obj)
+    assert object_signature(obj) == before
+
+    obj.Material = "Brick"
+    assert object_signature(obj) != before
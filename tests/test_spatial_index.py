@@ -0,0 +1,160 @@
+import os
+import random
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.extraction import extract_properties
+from utils.spatial_index import SpatialGrid, intersects, level_range, object_bounds, query_solid, union_bounds
+
+
+def box(x, y, z, dx, dy, dz):
+    return (x, y, z, x + dx, y + dy, z + dz)
+
+
+class DummyBoundBox:
+    def __init__(self, bounds):
+        self.XMin, self.YMin, self.ZMin, self.XMax, self.YMax, self.ZMax = bounds
+        self.XLength, self.YLength, self.ZLength = (bounds[3] - bounds[0], bounds[4] - bounds[1],
+                                                    bounds[5] - bounds[2])
+
+
+class DummyShape:
+    def __init__(self, bounds, volume_with=None):
+        self.BoundBox = DummyBoundBox(bounds)
+        self._volume_with = volume_with or {}
+
+    def common(self, other):
+        return types.SimpleNamespace(Volume=self._volume_with.get(id(other), 0.0))
+
+
+class CountingShape:
+    """Shape that counts how often its bounding box is read"""
+
+    def __init__(self, bounds):
+        self._bbox = DummyBoundBox(bounds)
+        self.reads = 0
+
+    @property
+    def BoundBox(self):
+        self.reads += 1
+        return self._bbox
+
+
+def make_obj(name, bounds):
+    return types.SimpleNamespace(Name=name, Label=name, TypeId="Part::Box", Shape=DummyShape(bounds))
+
+
+def test_box_queries_match_a_full_scan():
+    rng = random.Random(7)
+    grid = SpatialGrid(cell_size=2000)
+    boxes = {f"O{i}": box(rng.uniform(-2e4, 2e4), rng.uniform(-2e4, 2e4), rng.uniform(0, 1e4),
+                          rng.uniform(10, 6000), rng.uniform(10, 6000), rng.uniform(10, 3000))
+             for i in range(500)}
+    boxes["Site"] = box(-1e6, -1e6, -500, 2e6, 2e6, 500)  # Oversized object
+    for name, bounds in boxes.items():
+        grid.insert(name, bounds)
+
+    for _ in range(50):
+        query = box(rng.uniform(-3e4, 3e4), rng.uniform(-3e4, 3e4), rng.uniform(-1e3, 1e4),
+                    rng.uniform(0, 2e4), rng.uniform(0, 2e4), rng.uniform(0, 5e3))
+        expected = {name for name, bounds in boxes.items() if intersects(bounds, query)}
+        assert grid.query_box(query) == expected
+    assert "Site" in grid.query_box(box(0, 0, -100, 1, 1, 1))
+    assert len(grid.query_box((-1e7, -1e7, -1e7, 1e7, 1e7, 1e7))) == len(boxes)
+
+
+def test_moved_and_removed_objects_leave_their_old_cells():
+    grid = SpatialGrid(cell_size=1000)
+    grid.insert("Wall", box(0, 0, 0, 3000, 200, 3000))
+    grid.insert("Wall", box(50000, 0, 0, 3000, 200, 3000))
+
+    assert grid.query_box(box(0, 0, 0, 100, 100, 100)) == set()
+    assert grid.query_box(box(51000, 0, 0, 10, 10, 10)) == {"Wall"}
+    grid.remove("Wall")
+    grid.remove("Missing")
+    assert len(grid) == 0
+    assert grid.query_box(box(51000, 0, 0, 10, 10, 10)) == set()
+
+
+def test_level_query_assigns_objects_by_bottom_elevation():
+    grid = SpatialGrid()
+    grid.insert("Slab1", box(0, 0, 3000, 5000, 5000, 200))
+    grid.insert("Column1", box(0, 0, 3200, 400, 400, 2800))
+    grid.insert("Slab2", box(0, 0, 6000, 5000, 5000, 200))
+    grid.insert("Footing", box(0, 0, -1000, 1000, 1000, 1000))
+
+    assert grid.query_level(3000, 6000) == {"Slab1", "Column1"}
+    assert grid.query_level(6000, 9000) == {"Slab2"}
+    assert grid.query_level(-2000, 0) == {"Footing"}
+
+
+def test_objects_without_shape_are_not_indexed_and_solid_query_is_exact():
+    inside = make_obj("Inside", box(0, 0, 0, 10, 10, 10))
+    touching = make_obj("Touching", box(10, 0, 0, 10, 10, 10))
+    zone = make_obj("Zone", box(0, 0, 0, 10, 10, 10))
+    # Only Inside shares volume with the zone; Touching shares a face
+    zone.Shape = DummyShape(box(0, 0, 0, 10, 10, 10), volume_with={id(inside.Shape): 1000.0})
+    group = types.SimpleNamespace(Name="Group", TypeId="App::DocumentObjectGroup")
+    objects = {obj.Name: obj for obj in (inside, touching, zone, group)}
+
+    grid = SpatialGrid(cell_size=5)
+    grid.insert_objects(objects.values())
+    assert "Group" not in grid and object_bounds(group) is None
+    assert grid.query_box(box(0, 0, 0, 10, 10, 10)) == {"Inside", "Touching", "Zone"}
+    assert query_solid(grid, zone, objects.get) == {"Inside"}
+
+
+def test_union_bounds():
+    assert union_bounds([]) is None
+    assert union_bounds([box(0, 0, 0, 1, 1, 1), box(5, -1, 2, 1, 1, 1)]) == (0, -1, 0, 6, 1, 3)
+
+
+def test_level_range_only_reads_levels():
+    placement = types.SimpleNamespace(Base=types.SimpleNamespace(z=3000.0))
+    storey = types.SimpleNamespace(IfcType="Building Storey", Height=3000.0, Placement=placement)
+    floor = types.SimpleNamespace(Proxy=types.SimpleNamespace(Type="Floor"), Height=2800.0, Placement=placement)
+    wall = types.SimpleNamespace(IfcType="Wall", Height=3000.0, Placement=placement)
+
+    assert level_range(storey) == (3000.0, 6000.0)
+    assert level_range(floor) == (3000.0, 5800.0)
+    assert level_range(wall) is None
+    assert level_range(types.SimpleNamespace(IfcType="Building Storey", Height=0.0, Placement=placement)) is None
+
+
+def test_non_finite_bounds_are_kept_aside():
+    inf, nan = float('inf'), float('nan')
+    grid = SpatialGrid(cell_size=1000)
+    grid.insert("Wall", box(0, 0, 0, 3000, 200, 3000))
+    grid.insert("Infinite", (-inf, -inf, -inf, inf, inf, inf))
+    grid.insert("Broken", (nan, 0.0, nan, nan, 1.0, nan))
+    # FreeCAD reports an empty shape with a void box of +/- DBL_MAX
+    grid.insert("Void", (1.7e308, 1.7e308, 1.7e308, -1.7e308, -1.7e308, -1.7e308))
+
+    assert grid.query_box(box(0, 0, 0, 10, 10, 10)) == {"Wall", "Infinite"}
+    assert grid.query_box((-inf, -inf, -inf, inf, inf, inf)) == {"Wall", "Infinite", "Void"}
+    assert grid.query_level(-1, 1) == {"Wall"}
+    for name in ("Infinite", "Broken", "Void"):
+        grid.remove(name)
+    assert len(grid) == 1 and grid.query_box(box(0, 0, 0, 10, 10, 10)) == {"Wall"}
+
+
+def test_grid_reuses_bounds_read_by_extraction():
+    objects = [types.SimpleNamespace(Name=f"Box{i}", Label=f"Box{i}", TypeId="Part::Box",
+                                     Shape=CountingShape(box(i * 100, 0, 0, 10, 10, 10)))
+               for i in range(3)]
+    bounds = {}
+    extract_properties(objects, measure=False, bounds=bounds)
+    assert sorted(bounds) == ["Box0", "Box1", "Box2"]
+
+    grid = SpatialGrid()
+    grid.insert_objects(objects, bounds)
+    assert grid.bounds("Box1") == box(100, 0, 0, 10, 10, 10)
+    assert [obj.Shape.reads for obj in objects] == [1, 1, 1]
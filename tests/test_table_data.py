@@ -0,0 +1,90 @@
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.property_table import PropertyTable, numeric_column
+from utils.table_data import ColumnSpec, TableData
+
+SPECS = [
+    ColumnSpec('Name', "Object Name"),
+    ColumnSpec('Volume', "Volume (m³)", numeric=True, formatter=lambda value: f"{value:.3f}"),
+    ColumnSpec('Price', "Price", numeric=True, editable=True),
+    ColumnSpec('Status', "Status", background=lambda value: (255, 0, 0) if value == "Hidden" else None),
+]
+
+
+def make_properties(names, volumes):
+    return PropertyTable({'Name': list(names), 'Volume': numeric_column(volumes)})
+
+
+def test_append_properties_fills_defaults_and_extra_columns():
+    data = TableData(SPECS)
+    rows = data.append_properties(make_properties(["A", "B"], [1.5, 2.25]), {'Status': ["Active", "Hidden"]})
+
+    assert list(rows) == [0, 1]
+    assert len(data) == 2
+    assert data.value(1, 'Volume') == 2.25
+    assert data.value(0, 'Price') == 0.0
+    assert data.display(1, 1) == "2.250"
+    assert data.specs[3].background(data.value(1, 'Status')) == (255, 0, 0)
+
+
+def test_update_and_remove_rows_keep_other_columns():
+    data = TableData(SPECS)
+    data.append_properties(make_properties(["A", "B", "C"], [1.0, 2.0, 3.0]))
+    data.set_value(1, 'Price', "12.5")
+
+    data.update_properties(1, make_properties(["B"], [9.0]), 0)
+    assert data.value(1, 'Volume') == 9.0
+    assert data.value(1, 'Price') == 12.5
+
+    data.remove_rows([0, 2])
+    assert list(data.column('Name')) == ["B"]
+    assert list(data.column('Price')) == [12.5]
+
+
+def test_clear_empties_all_columns():
+    data = TableData(SPECS, extra_keys=('Label',))
+    data.append_properties(make_properties(["A"], [1.0]))
+    assert list(data.column('Label')) == [""]
+    data.clear()
+    assert len(data) == 0
+    assert list(data.column('Label')) == []
+
+
+def test_lazy_columns_are_computed_on_first_read():
+    requested = []
+
+    def provider(rows):
+        requested.append(list(rows))
+        return {'Volume': [row * 10.0 for row in rows]}
+
+    data = TableData(SPECS)
+    data.append_properties(make_properties(["A", "B", "C", "D"], [float('nan')] * 4))
+    data.lazy_batch_size = 2
+    data.set_lazy(('Volume',), provider)
+
+    assert data.is_pending(0, 'Volume')
+    assert data.display(1, 1) == "10.000"
+    assert requested == [[1, 2]]
+    assert not data.is_pending(2, 'Volume')
+    assert data.is_pending(3, 'Volume')
+
+    # Exporting resolves only the remaining rows
+    assert [record[1] for record in data.records()] == [0.0, 10.0, 20.0, 30.0]
+    assert requested == [[1, 2], [0, 3]]
+
+
+def test_lazy_cells_the_provider_skips_become_zero():
+    data = TableData(SPECS)
+    data.append_properties(make_properties(["A"], [float('nan')]))
+    data.set_lazy(('Volume',), lambda rows: {})
+    assert data.value(0, 'Volume') == 0.0
@@ -0,0 +1,156 @@
+import math
+import os
+import sys
+import types
+
+# Stub the FreeCAD module used by calculations
+sys.modules.setdefault('FreeCAD', types.SimpleNamespace(Console=types.SimpleNamespace(PrintError=lambda msg: None)))
+
+# Ensure the repository root is on sys.path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils import takeoff_store
+from utils.extraction import LAZY_KEYS
+from utils.takeoff_store import TakeoffStore, store_for_document
+
+
+class DummyBoundBox:
+    def __init__(self, x, y, z):
+        self.XLength = x
+        self.YLength = y
+        self.ZLength = z
+        self.XMin = self.YMin = self.ZMin = 0.0
+        self.XMax, self.YMax, self.ZMax = x, y, z
+
+
+class CountingShape:
+    """Box shape that counts bounding box and volume reads"""
+
+    def __init__(self, x, y, z):
+        self._bbox = DummyBoundBox(x, y, z)
+        self.Area = 2 * (x * y + y * z + x * z)
+        self._volume = x * y * z
+        self.reads = 0
+
+    @property
+    def BoundBox(self):
+        self.reads += 1
+        return self._bbox
+
+    @property
+    def Volume(self):
+        self.reads += 1
+        return self._volume
+
+
+class DeletedObject:
+    """Python wrapper of an object deleted from its document"""
+
+    @property
+    def Name(self):
+        raise RuntimeError("This object was deleted")
+
+
+def make_doc(tmp_path, name="Doc"):
+    return types.SimpleNamespace(Name=name, FileName=str(tmp_path / f"{name}.FCStd"), Objects=[])
+
+
+def make_obj(doc, name, shape=None, type_id="Part::Box", **attrs):
+    obj = type("Obj", (), {})()
+    obj.Name = name
+    obj.Label = name
+    obj.TypeId = type_id
+    obj.Document = doc
+    obj.Shape = shape or CountingShape(1000, 1000, 1000)
+    for key, value in attrs.items():
+        setattr(obj, key, value)
+    doc.Objects.append(obj)
+    return obj
+
+
+def test_properties_and_measurements_are_extracted_once(tmp_path):
+    doc = make_doc(tmp_path)
+    wall, slab = make_obj(doc, "Wall"), make_obj(doc, "Slab")
+    store = TakeoffStore(doc)
+
+    first = store.properties([wall, slab])
+    assert math.isnan(first.value(0, 'Volume'))
+    reads = wall.Shape.reads
+    store.properties([wall])
+    assert wall.Shape.reads == reads
+
+    assert store.measure([wall, None])['Volume'] == [1.0, 0.0]
+    reads = wall.Shape.reads
+    assert store.measure([wall])['Volume'] == [1.0]
+    assert wall.Shape.reads == reads
+    # A later view gets the measured values instead of pending cells
+    assert store.properties([wall, slab]).value(0, 'Volume') == 1.0
+    assert math.isnan(store.properties([wall, slab]).value(1, 'Volume'))
+    assert math.isnan(store.known_values([slab], ['Top_Area'])['Top_Area'][0])
+    # Bounding boxes read while extracting are kept for the spatial index
+    assert store.bounds["Wall"] == (0.0, 0.0, 0.0, 1000, 1000, 1000)
+
+
+def test_changes_invalidate_values_and_reach_every_subscriber(tmp_path):
+    doc = make_doc(tmp_path)
+    base = make_obj(doc, "Bar")
+    link = make_obj(doc, "Link", type_id="App::Link", LinkedObject=base, ElementCount=2)
+    store = TakeoffStore(doc)
+    assert store.measure([base, link])['Volume'] == [1.0, 2.0]
+
+    notified = []
+    main, info = store.subscribe(lambda: notified.append("main")), store.subscribe(lambda: notified.append("info"))
+    base.Shape = CountingShape(2000, 1000, 1000)
+    store.observer.slotChangedObject(base, 'Length')
+    store.observer.slotCreatedObject(make_obj(doc, "Beam"))
+
+    assert notified == ["main", "info", "main", "info"]
+    assert main.take_changes().changed == {"Bar"}
+    assert info.take_changes().created == {"Beam"}
+    # The link is re-measured too, since its geometry is the base's
+    assert store.measure([base, link])['Volume'] == [2.0, 4.0]
+    assert "Bar" not in store.bounds
+
+    info.close()
+    store.observer.slotDeletedObject(base)
+    assert notified[-1] == "main"
+    assert main.take_changes().deleted == {"Bar"}
+
+
+def test_one_store_per_open_document(tmp_path, monkeypatch):
+    observers = []
+    monkeypatch.setattr(takeoff_store.FreeCAD, 'addDocumentObserver', observers.append, raising=False)
+    monkeypatch.setattr(takeoff_store.FreeCAD, 'removeDocumentObserver', observers.remove, raising=False)
+    monkeypatch.setattr(takeoff_store, '_stores', {})
+    doc = make_doc(tmp_path, "Shared")
+
+    store = store_for_document(doc)
+    assert store_for_document(doc) is store
+    assert observers == [store.observer]
+
+    store.observer.slotDeletedDocument(doc)
+    assert store.subscribe().document_closed
+    reopened = store_for_document(doc)
+    assert reopened is not store
+    assert observers == [reopened.observer]
+    assert set(store.measure([], LAZY_KEYS)) == set(LAZY_KEYS)
+
+
+def test_objects_deleted_while_loading_are_skipped(tmp_path):
+    doc = make_doc(tmp_path)
+    objects = [make_obj(doc, f"Box{index}") for index in range(5)]
+    store = TakeoffStore(doc)
+    chunks = store.iter_properties(objects, 2)
+
+    first_objects, first = next(chunks)
+    assert first_objects == objects[:2]
+    assert list(first.column('Name')) == ["Box0", "Box1"]
+
+    store.observer.slotDeletedObject(objects[2])
+    objects[2] = DeletedObject()
+
+    rest = list(chunks)
+    assert [[obj.Name for obj in chunk] for chunk, _ in rest] == [["Box3"], ["Box4"]]
+    assert [list(table.column('Name')) for _, table in rest] == [["Box3"], ["Box4"]]
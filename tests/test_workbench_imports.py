@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+# Repository root, the directory FreeCAD imports the workbench from
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Importing the workbench and registering its commands must stay below this
+IMPORT_BUDGET_MS = 50.0
+
+# Runs in a fresh interpreter so modules imported by other tests do not count
+STARTUP_SCRIPT = """
+import json, sys, time, types
+
+class Workbench:
+    def appendToolbar(self, name, commands):
+        pass
+
+    def appendMenu(self, name, commands):
+        pass
+
+commands = {}
+
+def add_command(name, command):
+    # FreeCAD reads the resources (menu text, icon, checkable) on registration
+    command.GetResources()
+    commands[name] = command
+
+sys.modules['FreeCAD'] = types.SimpleNamespace(Console=types.SimpleNamespace(
+    PrintError=print, PrintMessage=print), ActiveDocument=None)
+sys.modules['FreeCADGui'] = types.SimpleNamespace(Workbench=Workbench, addCommand=add_command)
+
+start = time.perf_counter()
+import QTOWorkbench
+QTOWorkbench.QTOWorkbench().Initialize()
+elapsed = (time.perf_counter() - start) * 1000.0
+
+# Dialogs, the takeoff engine, Qt and csv must only load when a command is used
+print(json.dumps({'ms': elapsed, 'commands': sorted(commands),
+                  'modules': sorted(name for name in sys.modules if name.split('.')[0] in
+                                    ('dialogs', 'utils', 'PySide2', 'PyQt5', 'csv'))}))
+"""
+
+
+def run_startup():
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=ROOT_DIR,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_workbench_registers_commands_without_heavy_imports():
+    startup = run_startup()
+
+    assert startup['commands'] == ['QTO_OpenDialog', 'QTO_SelectObject', 'QTO_ShowObjectInfo',
+                                   'QTO_TakeoffIntersecting', 'QTO_TakeoffLevel', 'QTO_TakeoffRegion',
+                                   'QTO_ToggleProfiling']
+    assert startup['modules'] == []
+
+
+def test_workbench_startup_is_within_budget():
+    # Best of a few runs, so a busy machine does not fail the check
+    elapsed = min(run_startup()['ms'] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS, f"workbench startup took {elapsed:.1f} ms"
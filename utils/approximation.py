@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Approximate takeoff - precision tiers and error bounds of fast estimates
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Extra property/BOQ column holding the precision tier of each row
+PRECISION_KEY = 'Precision'
+
+# Precision tiers, from most to least precise:
+# exact       - OCC volume/area of the solid (or values measured before)
+# mesh        - triangles of a mesh object; within MESH_DEVIATION of the surface
+# parametric  - Length × Width × Height of Arch/Part primitives; an upper
+#               bound (openings and cut-outs are not subtracted)
+# bbox        - bounding box of the shape; an upper bound
+EXACT = 'exact'
+MESH = 'mesh'
+PARAMETRIC = 'parametric'
+BOUNDING_BOX = 'bbox'
+PRECISION_TIERS = (EXACT, MESH, PARAMETRIC, BOUNDING_BOX)
+
+PRECISION_DESCRIPTIONS = {
+    EXACT: "Exact (measured solid)",
+    MESH: "Mesh triangles (within the mesh deviation)",
+    PARAMETRIC: "Approximate: Length × Width × Height (upper bound)",
+    BOUNDING_BOX: "Approximate: bounding box (upper bound)",
+}
+
+# Largest distance (mm) assumed between a mesh and the surface it was made
+# from; FreeCAD's default mesh deviation
+MESH_DEVIATION = 0.1
+
+
+def box_quantities(x: float, y: float, z: float) -> Tuple[float, float]:
+    """Return (volume, surface area) of an x × y × z box"""
+    return x * y * z, 2.0 * (x * y + y * z + x * z)
+
+
+def mesh_quantities(source: Any) -> Optional[Tuple[Any, float, float]]:
+    """
+    Return (BoundBox, volume, area) of a mesh object from its triangles,
+    or None if ``source`` has no mesh.
+    """
+    mesh = getattr(source, 'Mesh', None)
+    if mesh is None or not hasattr(mesh, 'Volume'):
+        return None
+    return mesh.BoundBox, mesh.Volume, mesh.Area
+
+
+def approximate_quantities(bbox: Any, lengths: Sequence[Optional[float]]) -> Tuple[float, float, str]:
+    """
+    Return (volume, area, tier) of a solid without integrating its
+    geometry: parametric dimensions when all three are set, otherwise
+    the bounding box (``bbox`` may be None for objects without a shape).
+    """
+    if all(lengths):
+        return box_quantities(*lengths) + (PARAMETRIC,)
+    if bbox is None:
+        return 0.0, 0.0, EXACT
+    return box_quantities(bbox.XLength, bbox.YLength, bbox.ZLength) + (BOUNDING_BOX,)
+
+
+def volume_error_bounds(volumes: Sequence[float], areas: Sequence[float],
+                        tiers: Sequence[str]) -> List[float]:
+    """
+    Return the largest possible volume error (m³) of each row from its
+    tier: 0 for exact rows, area × deviation for meshes, and the whole
+    volume for upper-bound tiers (the solid may be anywhere in 0..V).
+    """
+    deviation_m = MESH_DEVIATION / 1000.0
+    bounds = []
+    for volume, area, tier in zip(volumes, areas, tiers):
+        if tier == MESH:
+            bounds.append(area * deviation_m)
+        elif tier in (PARAMETRIC, BOUNDING_BOX):
+            bounds.append(volume)
+        else:
+            bounds.append(0.0)
+    return bounds
+
+
+def precision_summary(volumes: Sequence[float], areas: Sequence[float], tiers: Sequence[str]) -> str:
+    """Describe rows per tier and the volume error bound, e.g. for a status message"""
+    counts: Dict[str, int] = {}
+    for tier in tiers:
+        counts[tier] = counts.get(tier, 0) + 1
+    parts = [f"{counts[tier]} {tier}" for tier in PRECISION_TIERS if counts.get(tier)]
+    total = sum(volumes)
+    error = sum(volume_error_bounds(volumes, areas, tiers))
+    return f"{', '.join(parts) or 'no'} rows; volume {total:.3f} m³ (at most {error:.3f} m³ off)"
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+BOQ definitions shared by the BOQ dialog and the headless takeoff tools
+"""
+
+import math
+import operator
+from array import array
+from typing import Dict, Iterable
+
+from utils.approximation import EXACT, PRECISION_DESCRIPTIONS, PRECISION_KEY
+from utils.calculations import QTOCalculator
+from utils.materials import MaterialCatalog
+from utils.property_table import Column, PropertyTable
+from utils.snapshot import SIGNATURE_KEY
+from utils.table_data import ColumnSpec, TableData
+
+
+def approximation_note(tier: str):
+    """Note rule: describe quantities that were estimated instead of measured"""
+    if not tier or tier == EXACT:
+        return None
+    return PRECISION_DESCRIPTIONS.get(tier, tier)
+
+
+# Quantity columns are annotated with the precision tier of fast estimates
+_PRECISION_NOTE = dict(note_key=PRECISION_KEY, note=approximation_note)
+
+# BOQ columns for construction
+BOQ_COLUMNS = [
+    ColumnSpec('Name', "Object Name", width=150),
+    ColumnSpec('Type', "Object Type", width=150),
+    ColumnSpec('Material', "Material", width=120),
+    ColumnSpec('Length', "Length (m)", numeric=True, formatter=QTOCalculator.format_dimension),
+    ColumnSpec('Width', "Width (m)", numeric=True, formatter=QTOCalculator.format_dimension),
+    ColumnSpec('Height', "Height (m)", numeric=True, formatter=QTOCalculator.format_dimension),
+    ColumnSpec('Volume', "Volume (m³)", numeric=True, formatter=lambda value: f"{value:.6f}", **_PRECISION_NOTE),
+    ColumnSpec('Area', "Area (m²)", numeric=True, formatter=QTOCalculator.format_dimension, **_PRECISION_NOTE),
+    ColumnSpec('Quantity', "Quantity", numeric=True, formatter=QTOCalculator.format_quantity),
+    ColumnSpec('Unit_Weight', "Unit Weight (kg)", numeric=True, formatter=QTOCalculator.format_dimension,
+               **_PRECISION_NOTE),
+    ColumnSpec('Material_Unit', "Material/unit", numeric=True, formatter=QTOCalculator.format_currency, editable=True),
+    ColumnSpec('Labor_Unit', "Labor/unit", numeric=True, formatter=QTOCalculator.format_currency, editable=True),
+    ColumnSpec('Material_Total', "Material Total", numeric=True, formatter=QTOCalculator.format_currency),
+    ColumnSpec('Labor_Total', "Labor Total", numeric=True, formatter=QTOCalculator.format_currency),
+    ColumnSpec('Total', "Total", numeric=True, formatter=QTOCalculator.format_currency),
+]
+
+BOQ_HEADERS = [spec.header for spec in BOQ_COLUMNS]
+
+# Extra column of approximate BOQ exports (qto_cli.py --approximate)
+PRECISION_COLUMN = ColumnSpec(PRECISION_KEY, "Precision", width=90)
+
+# Editable unit price columns
+PRICE_KEYS = ('Material_Unit', 'Labor_Unit')
+
+
+def new_boq_data(precision: bool = False) -> TableData:
+    """
+    Return empty BOQ table data. Label (for grouping), Signature (the
+    object state a row was measured from, see utils.snapshot) and
+    Precision (the tier of estimated rows) are kept but not shown;
+    ``precision=True`` shows the Precision column last.
+    """
+    specs = BOQ_COLUMNS + [PRECISION_COLUMN] if precision else BOQ_COLUMNS
+    return TableData(specs, extra_keys=('Label', SIGNATURE_KEY, PRECISION_KEY))
+
+
+def calculate_row_totals(data: TableData, row: int):
+    """Calculate the Material/Labor/row totals of one BOQ row"""
+    quantity = data.value(row, 'Quantity')
+    material_total = QTOCalculator.calculate_material_total(quantity, data.value(row, 'Material_Unit'))
+    labor_total = QTOCalculator.calculate_labor_total(quantity, data.value(row, 'Labor_Unit'))
+    data.set_value(row, 'Material_Total', material_total)
+    data.set_value(row, 'Labor_Total', labor_total)
+    data.set_value(row, 'Total', QTOCalculator.calculate_row_total(material_total, labor_total))
+
+
+def calculate_totals(data: TableData):
+    """Calculate the totals of every BOQ row in one pass over whole columns"""
+    quantity = data.column('Quantity')
+    material_total = array('d', map(operator.mul, quantity, data.column('Material_Unit')))
+    labor_total = array('d', map(operator.mul, quantity, data.column('Labor_Unit')))
+    data.set_column('Material_Total', material_total)
+    data.set_column('Labor_Total', labor_total)
+    data.set_column('Total', map(operator.add, material_total, labor_total))
+
+
+def catalog_prices(catalog: MaterialCatalog, properties: PropertyTable) -> Dict[str, Column]:
+    """Unit price columns for new BOQ rows, pre-filled from the material catalog"""
+    columns = catalog.columns(properties.column('Material'))
+    return {key: columns[key] for key in PRICE_KEYS}
+
+
+class BOQTotals:
+    """
+    Running Material, Labor and grand totals of a BOQ table.
+
+    Row updates adjust the totals by the difference between the row's
+    old and new stored totals, so an edit costs O(1) instead of a pass
+    over every row. ``recompute`` rebuilds them from scratch.
+    """
+
+    def __init__(self):
+        self.material = 0.0
+        self.labor = 0.0
+        self.grand = 0.0
+
+    def reset(self):
+        """Set all totals to zero (e.g. after the table was cleared)"""
+        self.material = self.labor = self.grand = 0.0
+
+    def update_row(self, data: TableData, row: int):
+        """Recalculate one row's totals and apply the change to the running totals"""
+        old_material = data.value(row, 'Material_Total')
+        old_labor = data.value(row, 'Labor_Total')
+        old_total = data.value(row, 'Total')
+        calculate_row_totals(data, row)
+        self.material += data.value(row, 'Material_Total') - old_material
+        self.labor += data.value(row, 'Labor_Total') - old_labor
+        self.grand += data.value(row, 'Total') - old_total
+
+    def remove_rows(self, data: TableData, rows: Iterable[int]):
+        """Subtract rows that are about to be removed from ``data``"""
+        for row in set(rows):
+            self.material -= data.value(row, 'Material_Total')
+            self.labor -= data.value(row, 'Labor_Total')
+            self.grand -= data.value(row, 'Total')
+
+    def recompute(self, data: TableData):
+        """Recalculate every row and rebuild the totals from the columns"""
+        calculate_totals(data)
+        self.material = math.fsum(data.column('Material_Total'))
+        self.labor = math.fsum(data.column('Labor_Total'))
+        self.grand = math.fsum(data.column('Total'))
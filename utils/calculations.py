@@ -3,9 +3,16 @@
 QTOCalculator - Calculation utilities for Quantity Takeoff
 """
 
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, Optional
 
-import FreeCAD
+from utils.extraction import extract_properties
+from utils.face_quantities import FaceClassifier, extract_face_quantities
+from utils.geometry_cache import GeometryCache
+from utils.materials import MaterialCatalog
+from utils.measure_executor import MeasureExecutor
+from utils.profiling import span
+from utils.property_table import PropertyRecord, PropertyTable
+from utils.spatial_index import Bounds
 
 class QTOCalculator:
     """
@@ -13,66 +20,30 @@ class QTOCalculator:
     """
     
     @staticmethod
-    def get_object_properties(obj: Any) -> Dict[str, Union[str, float, int]]:
+    def get_object_properties(obj: Any) -> PropertyRecord:
         """Extract properties from FreeCAD object"""
-        try:
-            properties = {
-                'Name': obj.Name,
-                'Label': obj.Label,
-                'Type': obj.TypeId,
-                'Material': getattr(obj, 'Material', 'Unknown'),
-                'Length': 0.0,
-                'Width': 0.0,
-                'Height': 0.0,
-                'Volume': 0.0,
-                'Area': 0.0,
-                'Quantity': 1,
-                'Unit_Weight': 0.0
-            }
-            
-            # Get dimensions based on object type
-            if hasattr(obj, 'Shape') and obj.Shape:
-                bbox = obj.Shape.BoundBox
-                # Convert from mm to m
-                properties['Length'] = round(bbox.XLength / 1000, 2)
-                properties['Width'] = round(bbox.YLength / 1000, 2)
-                properties['Height'] = round(bbox.ZLength / 1000, 2)
-                properties['Volume'] = round(obj.Shape.Volume / 1000000000, 6)  # mm³ to m³
+        return extract_properties([obj]).row(0)
+
+    @staticmethod
+    def extract_properties(objects: Iterable[Any], cache: Optional[GeometryCache] = None,
+                           measure: bool = True, catalog: Optional[MaterialCatalog] = None,
+                           bounds: Optional[Dict[str, Bounds]] = None,
+                           executor: Optional[MeasureExecutor] = None,
+                           approximate: bool = False) -> PropertyTable:
+        """
+        Extract properties from many FreeCAD objects into a columnar table;
+        shapes are measured on ``executor``'s threads when one is given,
+        and only estimated (with a precision tier per row) if ``approximate``
+        """
+        with span('extract', measure=measure, threaded=executor is not None, approximate=approximate):
+            return extract_properties(objects, cache, measure, catalog, bounds, executor, approximate)
 
-                # Prefer actual shape area when available
-                if hasattr(obj.Shape, 'Area') and obj.Shape.Area:
-                    properties['Area'] = round(obj.Shape.Area / 1000000, 2)  # mm² to m²
-                elif hasattr(obj, 'Area') and obj.Area:
-                    properties['Area'] = round(obj.Area / 1000000, 2)  # mm² to m²
-                elif properties['Height'] > 0:
-                    # Fallback to bounding box approximation
-                    properties['Area'] = round((properties['Length'] * properties['Width']), 2)
-            
-            # Try to get specific properties for different object types
-            if hasattr(obj, 'Length'):
-                properties['Length'] = round(obj.Length.Value / 1000, 2)
-            if hasattr(obj, 'Width'):
-                properties['Width'] = round(obj.Width.Value / 1000, 2)
-            if hasattr(obj, 'Height'):
-                properties['Height'] = round(obj.Height.Value / 1000, 2)
-                
-            return properties
-            
-        except Exception as e:
-            FreeCAD.Console.PrintError(f"Error extracting object properties: {e}\n")
-            return {
-                'Name': getattr(obj, 'Name', 'Unknown'),
-                'Label': getattr(obj, 'Label', 'Unknown'),
-                'Type': getattr(obj, 'TypeId', 'Unknown'),
-                'Material': 'Unknown',
-                'Length': 0.0,
-                'Width': 0.0,
-                'Height': 0.0,
-                'Volume': 0.0,
-                'Area': 0.0,
-                'Quantity': 1,
-                'Unit_Weight': 0.0
-            }
+    @staticmethod
+    def extract_face_quantities(objects: Iterable[Any],
+                                classifier: Optional[FaceClassifier] = None) -> PropertyTable:
+        """Extract formwork, top finish and net wall areas from classified faces"""
+        with span('extract.faces'):
+            return extract_face_quantities(objects, classifier)
     
     @staticmethod
     def calculate_material_total(quantity: float, material_per_unit: float) -> float:
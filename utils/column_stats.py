@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+ColumnIndex - Cached sort permutations and one-pass summaries of table columns
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional inside FreeCAD
+    np = None
+
+from utils.table_data import TableData
+
+NAN = float('nan')
+
+
+class ColumnSummary(NamedTuple):
+    """Count, minimum, maximum and sum of the known (non-NaN) values of a column"""
+    count: int
+    minimum: float
+    maximum: float
+    total: float
+
+
+def summarize(column: Sequence[float], rows: Optional[Iterable[int]] = None) -> ColumnSummary:
+    """
+    Summarize a numeric column (or only ``rows`` of it) in one pass.
+    NaN cells (lazy values not measured yet) are not counted.
+    """
+    values = column if rows is None else (column[row] for row in rows)
+    count, minimum, maximum, total = 0, math.inf, -math.inf, 0.0
+    for value in values:
+        if value != value:
+            continue
+        count += 1
+        total += value
+        if value < minimum:
+            minimum = value
+        if value > maximum:
+            maximum = value
+    if not count:
+        return ColumnSummary(0, NAN, NAN, 0.0)
+    return ColumnSummary(count, minimum, maximum, total)
+
+
+def argsort(column: Sequence[Any], numeric: bool) -> Sequence[int]:
+    """
+    Return the row order that sorts ``column`` ascending. The sort is
+    stable; NaN cells go last and text is compared as ``str``.
+    """
+    if numeric and np is not None:
+        values = np.frombuffer(column, dtype=float) if isinstance(column, array) else np.asarray(column, dtype=float)
+        return np.argsort(values, kind='stable')
+    if numeric:
+        known = [row for row, value in enumerate(column) if value == value]
+        known.sort(key=column.__getitem__)
+        return known + [row for row, value in enumerate(column) if value != value]
+    return sorted(range(len(column)), key=lambda row: str(column[row]))
+
+
+def inverse_permutation(order: Sequence[int]) -> Sequence[int]:
+    """Return the rank (position in ``order``) of every row"""
+    if np is not None and isinstance(order, np.ndarray):
+        ranks = np.empty(len(order), dtype=np.intp)
+        ranks[order] = np.arange(len(order))
+        return ranks
+    ranks = array('l', [0]) * len(order)
+    for rank, row in enumerate(order):
+        ranks[row] = rank
+    return ranks
+
+
+class ColumnIndex:
+    """
+    Sort permutations and summaries over the columns of a TableData.
+
+    A column's permutation is computed once by argsort and reused until
+    the column changes (see TableData.column_version), so re-sorting the
+    view or comparing two rows is a lookup. Lazy columns are resolved
+    for every row before they are sorted.
+    """
+
+    def __init__(self, data: TableData):
+        self.data = data
+        self._orders: Dict[str, Tuple[int, Sequence[int], Sequence[int]]] = {}  # key -> (version, order, ranks)
+
+    def _entry(self, key: str) -> Tuple[int, Sequence[int], Sequence[int]]:
+        if self.data.is_lazy(key):
+            self.data.resolve()
+        version = self.data.column_version(key)
+        entry = self._orders.get(key)
+        if entry is None or entry[0] != version:
+            order = argsort(self.data.column(key), self.data.is_numeric(key))
+            entry = self._orders[key] = (version, order, inverse_permutation(order))
+        return entry
+
+    def order(self, key: str) -> Sequence[int]:
+        """Return the rows in ascending order of column ``key``"""
+        return self._entry(key)[1]
+
+    def ranks(self, key: str) -> Sequence[int]:
+        """Return the position of every row in ``order(key)``"""
+        return self._entry(key)[2]
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop the cached permutation of ``key`` (default: every column)"""
+        if key is None:
+            self._orders.clear()
+        else:
+            self._orders.pop(key, None)
+
+    def summaries(self, keys: Iterable[str], rows: Optional[Iterable[int]] = None) -> Dict[str, ColumnSummary]:
+        """
+        Return a ColumnSummary of each numeric column in ``keys`` over
+        ``rows`` (default: every row). Lazy cells not measured yet are
+        left out rather than measured.
+        """
+        rows = None if rows is None else list(rows)
+        return {key: summarize(self.data.column(key), rows) for key in keys}
+
+
+def format_summary(summary: ColumnSummary, rows: int, unit: str = "", digits: int = 2) -> str:
+    """Describe a ColumnSummary for a summary bar, e.g. ``Σ 12.50 m³ (3/4 measured)``"""
+    text = f"Σ {summary.total:,.{digits}f}{' ' + unit if unit else ''}"
+    if summary.count < rows:
+        text += f" ({summary.count}/{rows} measured)"
+    return text
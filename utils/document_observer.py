@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+DocumentObserver - Collects FreeCAD document changes for incremental refresh
+"""
+
+from typing import Any, Callable, Optional, Set
+
+# Property changes that never affect takeoff quantities
+IGNORED_PROPERTIES = frozenset(['Visibility', 'ExpressionEngine', 'Label2'])
+
+
+class ChangeSet:
+    """
+    Object names created, changed and deleted since the last sync.
+
+    Events are coalesced: an object created and deleted before the next
+    sync disappears entirely, changes to a new object stay a creation and
+    a deletion supersedes earlier changes.
+    """
+
+    def __init__(self):
+        self.created: Set[str] = set()
+        self.changed: Set[str] = set()
+        self.deleted: Set[str] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.changed or self.deleted)
+
+    def add_created(self, name: str):
+        if name in self.deleted:
+            # Undo of a deletion: treat as a change of the existing row
+            self.deleted.discard(name)
+            self.changed.add(name)
+        else:
+            self.created.add(name)
+
+    def add_changed(self, name: str):
+        if name not in self.created and name not in self.deleted:
+            self.changed.add(name)
+
+    def add_deleted(self, name: str):
+        self.changed.discard(name)
+        if name in self.created:
+            self.created.discard(name)
+        else:
+            self.deleted.add(name)
+
+
+class DocumentObserver:
+    """
+    FreeCAD document observer that records object events of one document.
+
+    Register with ``FreeCAD.addDocumentObserver``. ``on_change`` is called
+    after every recorded event, typically to (re)start a coalescing timer;
+    the pending events are collected with ``take_changes``.
+    """
+
+    def __init__(self, document: Any, on_change: Optional[Callable[[], None]] = None):
+        self.document_name = document.Name
+        self.on_change = on_change
+        self.document_closed = False
+        self._changes = ChangeSet()
+
+    def _is_watched(self, obj: Any) -> bool:
+        document = getattr(obj, 'Document', None)
+        return document is not None and document.Name == self.document_name
+
+    def _notify(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def take_changes(self) -> ChangeSet:
+        """Return the pending changes and start a new change set"""
+        changes, self._changes = self._changes, ChangeSet()
+        return changes
+
+    def slotCreatedObject(self, obj):
+        if self._is_watched(obj):
+            self._changes.add_created(obj.Name)
+            self._notify()
+
+    def slotChangedObject(self, obj, prop):
+        if prop not in IGNORED_PROPERTIES and self._is_watched(obj):
+            self._changes.add_changed(obj.Name)
+            self._notify()
+
+    def slotDeletedObject(self, obj):
+        if self._is_watched(obj):
+            self._changes.add_deleted(obj.Name)
+            self._notify()
+
+    def slotDeletedDocument(self, doc):
+        if doc.Name == self.document_name:
+            self.document_closed = True
+            self._notify()
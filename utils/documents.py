@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Document helpers for headless (FreeCADCmd) takeoff runs
+"""
+
+from contextlib import contextmanager
+
+import FreeCAD
+
+
+def open_document(filename: str):
+    """Open a document without creating a view (hidden where supported)"""
+    try:
+        return FreeCAD.openDocument(filename, True)
+    except TypeError:
+        return FreeCAD.openDocument(filename)
+
+
+@contextmanager
+def opened_document(filename: str):
+    """Open a document for the duration of a ``with`` block, then close it"""
+    doc = open_document(filename)
+    try:
+        yield doc
+    finally:
+        # Close promptly so memory stays bounded over many documents
+        FreeCAD.closeDocument(doc.Name)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming exporters - write takeoff rows to CSV, XLSX or Parquet/Arrow
+"""
+
+import csv
+import os
+import zipfile
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # Parquet/Arrow export is optional
+    pyarrow = None
+
+# Rows are written and reported in chunks of this size
+CHUNK_SIZE = 1000
+
+ProgressCallback = Callable[[int], None]
+
+
+class ExportError(Exception):
+    """Raised when an export format is unknown or unavailable"""
+
+
+def chunked(rows: Iterable[Sequence[Any]], size: Optional[int] = None) -> Iterator[List[Sequence[Any]]]:
+    """Group an iterable of rows into lists of at most ``size`` (CHUNK_SIZE) rows"""
+    size = size or CHUNK_SIZE
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(path: str, header: Sequence[str], rows: Iterable[Sequence[Any]],
+              progress: Optional[ProgressCallback] = None) -> int:
+    """Stream rows to a CSV file; returns the number of rows written"""
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+        for chunk in chunked(rows):
+            writer.writerows(chunk)
+            written += len(chunk)
+            if progress:
+                progress(written)
+    return written
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_row(values: Sequence[Any]) -> str:
+    cells = []
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            text = escape(str(value), {'"': '&quot;'})
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+        else:
+            cells.append(f'<c><v>{value!r}</v></c>')
+    return '<row>' + ''.join(cells) + '</row>'
+
+
+def write_xlsx(path: str, header: Sequence[str], rows: Iterable[Sequence[Any]],
+               progress: Optional[ProgressCallback] = None, sheet_name: str = "BOQ") -> int:
+    """
+    Stream rows to a single-sheet XLSX workbook (pure Python).
+
+    Strings are written inline, so memory use does not grow with the
+    number of rows.
+    """
+    written = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        workbook.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+        workbook.writestr('xl/workbook.xml', _XLSX_WORKBOOK.format(sheet=escape(sheet_name)))
+        workbook.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+        with workbook.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                        b'<sheetData>')
+            sheet.write(_xlsx_row(header).encode('utf-8'))
+            for chunk in chunked(rows):
+                sheet.write(''.join(_xlsx_row(row) for row in chunk).encode('utf-8'))
+                written += len(chunk)
+                if progress:
+                    progress(written)
+            sheet.write(b'</sheetData></worksheet>')
+    return written
+
+
+def _arrow_batch(header: Sequence[str], chunk: List[Sequence[Any]]):
+    columns = list(zip(*chunk))
+    return pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array(list(values)) for values in columns], names=list(header))
+
+
+def write_arrow(path: str, header: Sequence[str], rows: Iterable[Sequence[Any]],
+                progress: Optional[ProgressCallback] = None) -> int:
+    """Stream rows to a Parquet (.parquet) or Arrow IPC (.arrow/.feather) file"""
+    if pyarrow is None:
+        raise ExportError("Parquet/Arrow export requires the 'pyarrow' package")
+
+    parquet = os.path.splitext(path)[1].lower() == '.parquet'
+    writer = None
+    written = 0
+    try:
+        for chunk in chunked(rows):
+            batch = _arrow_batch(header, chunk)
+            if writer is None:
+                if parquet:
+                    writer = pyarrow.parquet.ParquetWriter(path, batch.schema)
+                else:
+                    writer = pyarrow.ipc.new_file(path, batch.schema)
+            if parquet:
+                writer.write_table(pyarrow.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            written += len(chunk)
+            if progress:
+                progress(written)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        # No rows: still produce a file with the column names
+        table = pyarrow.table({name: pyarrow.array([], pyarrow.string()) for name in header})
+        if parquet:
+            pyarrow.parquet.write_table(table, path)
+        else:
+            with pyarrow.ipc.new_file(path, table.schema) as empty:
+                empty.write_table(table)
+    return written
+
+
+EXPORT_WRITERS: Dict[str, Callable[..., int]] = {
+    '.csv': write_csv,
+    '.xlsx': write_xlsx,
+    '.parquet': write_arrow,
+    '.arrow': write_arrow,
+    '.feather': write_arrow,
+}
+
+
+def available_formats() -> Dict[str, str]:
+    """Return file dialog filters of the formats usable in this environment"""
+    formats = {'.csv': "CSV Files (*.csv)", '.xlsx': "Excel Workbook (*.xlsx)"}
+    if pyarrow is not None:
+        formats['.parquet'] = "Parquet Files (*.parquet)"
+        formats['.arrow'] = "Arrow IPC Files (*.arrow *.feather)"
+    return formats
+
+
+def export_rows(path: str, header: Sequence[str], rows: Iterable[Sequence[Any]],
+                progress: Optional[ProgressCallback] = None) -> int:
+    """Export rows, choosing the format from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    writer = EXPORT_WRITERS.get(extension)
+    if writer is None:
+        raise ExportError(f"Unsupported export format: {extension or path}")
+    return writer(path, header, rows, progress)
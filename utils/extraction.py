@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Batch property extraction - measures many FreeCAD objects in one pass
+"""
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import FreeCAD
+
+from utils.approximation import EXACT, MESH, PRECISION_KEY, approximate_quantities, mesh_quantities
+from utils.geometry_cache import GeometryCache, shape_fingerprint
+from utils.instances import resolve_instance
+from utils.materials import MaterialCatalog
+from utils.measure_executor import MeasureExecutor, ShapeError
+from utils.profiling import count
+from utils.property_table import (
+    PropertyTable, multiply_round, nonzero, numeric_column, positive, scale_round, select
+)
+from utils.spatial_index import Bounds, box_bounds
+
+NAN = float('nan')
+
+# Columns that need the shape to be measured; see extract_properties(measure=False)
+LAZY_KEYS = ('Volume', 'Area', 'Unit_Weight')
+
+# Document objects that never carry a measurable solid (containers,
+# datum/sketch geometry, 2D drafting objects, spreadsheets, materials)
+SKIPPED_TYPES = frozenset({
+    'App::Part', 'App::DocumentObjectGroup', 'App::DocumentObjectGroupPython',
+    'App::Origin', 'App::Line', 'App::Plane', 'App::Point',
+    'PartDesign::Plane', 'PartDesign::Line', 'PartDesign::Point', 'PartDesign::CoordinateSystem',
+    'Sketcher::SketchObject', 'Sketcher::SketchObjectPython', 'Part::Part2DObjectPython',
+    'Spreadsheet::Sheet', 'App::MaterialObjectPython', 'App::TextDocument',
+})
+
+
+def is_takeoff_object(obj: Any) -> bool:
+    """
+    Cheap check whether an object can have a measurable solid.
+
+    Only TypeId and the presence of a Shape (or Mesh) property of the
+    linked or base object for links, clones and arrays are looked at;
+    the shape itself is not accessed, so skipped objects cost nothing.
+    """
+    if getattr(obj, 'TypeId', '') in SKIPPED_TYPES:
+        return False
+    source = resolve_instance(obj).source
+    return (getattr(source, 'TypeId', '') not in SKIPPED_TYPES
+            and (hasattr(source, 'Shape') or hasattr(source, 'Mesh')))
+
+
+def takeoff_objects(objects: Iterable[Any]) -> List[Any]:
+    """Return the objects that pass ``is_takeoff_object``"""
+    return [obj for obj in objects if is_takeoff_object(obj)]
+
+
+def _to_float(value: Any) -> float:
+    """Return a plain float from a number or a FreeCAD Quantity"""
+    return float(getattr(value, 'Value', value) or 0.0)
+
+
+def measure_shape(name: str, shape: Any, bbox: Any,
+                  cache: Optional[GeometryCache] = None) -> Tuple[float, float]:
+    """Return (volume, area) of a shape in mm³/mm², using ``cache`` when given"""
+    if cache is not None:
+        fingerprint = shape_fingerprint(shape, bbox)
+        cached = cache.get(name, fingerprint)
+        if cached is not None:
+            count('geometry_cache.hit')
+            return cached
+        count('geometry_cache.miss')
+    count('shape.measure')
+    volume = shape.Volume
+    area = getattr(shape, 'Area', 0.0) or 0.0
+    if cache is not None:
+        cache.put(name, fingerprint, volume, area)
+    return volume, area
+
+
+def _read_geometry(source: Any, measure: bool, cache: Optional[GeometryCache],
+                   with_bounds: bool = False,
+                   shape_values: Optional[Tuple[Any, float, float]] = None,
+                   approximate: bool = False) -> Tuple[Any, ...]:
+    """
+    Read the raw (mm) bounds, dimensions, volume and areas of a geometry
+    source and the precision tier of its volume/area; ``shape_values`` are
+    its (BoundBox, Volume, Area) if already measured. Mesh objects are
+    measured from their triangles. With ``approximate`` solids are not
+    measured: volume and area come from ``approximate_quantities``.
+    """
+    xl = yl = zl = volume = shape_area = object_area = 0.0
+    box = None
+    tier = EXACT
+    # Parametric dimensions (Arch objects) override the bounding box
+    lengths = [_to_float(source.Length) if hasattr(source, 'Length') else None,
+               _to_float(source.Width) if hasattr(source, 'Width') else None,
+               _to_float(source.Height) if hasattr(source, 'Height') else None]
+
+    if shape_values is None:
+        shape = getattr(source, 'Shape', None)
+        if shape:
+            count('shape.read')
+            bbox = shape.BoundBox
+            if measure and not approximate:
+                shape_values = (bbox,) + measure_shape(source.Name, shape, bbox, cache)
+            else:
+                shape_values = (bbox, 0.0, 0.0)
+        else:
+            shape_values = mesh_quantities(source)
+            if shape_values is not None:
+                tier = MESH
+    if shape_values is not None:
+        bbox, volume, shape_area = shape_values
+        if with_bounds:
+            box = box_bounds(bbox)
+        if approximate and tier != MESH:
+            volume, shape_area, tier = approximate_quantities(bbox, lengths)
+        xl, yl, zl = bbox.XLength, bbox.YLength, bbox.ZLength
+        if measure and not shape_area:
+            object_area = _to_float(getattr(source, 'Area', 0.0))
+    return box, xl, yl, zl, volume, shape_area, object_area, lengths, tier
+
+
+def _measure_on_executor(objects: Sequence[Any], measure: bool, cache: Optional[GeometryCache],
+                         executor: MeasureExecutor) -> Dict[str, Any]:
+    """
+    Measure the geometry sources of ``objects`` on ``executor``.
+
+    Shapes are read from the document and looked up in ``cache`` on this
+    thread; only BoundBox, then Volume/Area of cache misses, run on the
+    pool. Returns source Name -> (BoundBox, Volume, Area), or the
+    ShapeError of a shape that could not be measured.
+    """
+    shapes: Dict[str, Any] = {}
+    for obj in objects:
+        try:
+            source = resolve_instance(obj).source
+            if source.Name not in shapes:
+                shapes[source.Name] = getattr(source, 'Shape', None)
+        except Exception:
+            continue  # Reported when the extraction loop reads the object
+    shapes = {name: shape for name, shape in shapes.items() if shape}
+    count('shape.read', len(shapes))
+
+    results: Dict[str, Any] = {}
+    pending = []
+    for (name, shape), values in zip(shapes.items(), executor.map(list(shapes.values()), ('BoundBox',))):
+        if isinstance(values, ShapeError):
+            results[name] = values
+            continue
+        bbox = values[0]
+        results[name] = (bbox, 0.0, 0.0)
+        if not measure:
+            continue
+        fingerprint = None
+        if cache is not None:
+            try:
+                fingerprint = shape_fingerprint(shape, bbox)
+            except Exception as e:
+                results[name] = ShapeError(e)
+                continue
+            cached = cache.get(name, fingerprint)
+            if cached is not None:
+                count('geometry_cache.hit')
+                results[name] = (bbox,) + cached
+                continue
+            count('geometry_cache.miss')
+        pending.append((name, shape, fingerprint))
+
+    count('shape.measure', len(pending))
+    measured = executor.map([shape for _, shape, _ in pending], ('Volume', 'Area'))
+    for (name, shape, fingerprint), values in zip(pending, measured):
+        if isinstance(values, ShapeError):
+            results[name] = values
+            continue
+        volume, area = values[0], values[1] or 0.0
+        if cache is not None:
+            cache.put(name, fingerprint, volume, area)
+        results[name] = (results[name][0], volume, area)
+    return results
+
+
+def extract_properties(objects: Iterable[Any], cache: Optional[GeometryCache] = None,
+                       measure: bool = True, catalog: Optional[MaterialCatalog] = None,
+                       bounds: Optional[Dict[str, Bounds]] = None,
+                       executor: Optional[MeasureExecutor] = None,
+                       approximate: bool = False) -> PropertyTable:
+    """
+    Extract the takeoff properties of ``objects`` into a PropertyTable.
+
+    Every shape attribute is read once per object into raw (mm) columns;
+    unit conversion and rounding are then applied to whole columns.
+    Volume and Area are taken from ``cache`` when the shape is unchanged.
+    Unit_Weight is the volume of one instance times the ``catalog`` density
+    of its material.
+
+    With ``measure=False`` the LAZY_KEYS columns are left as NaN for a
+    lazy provider (see TableData.set_lazy) to fill in later.
+
+    ``bounds``, when given, receives the bounding box read for each object
+    measured through its own shape, e.g. for the spatial index.
+
+    With an ``executor``, shapes of independent objects are measured on
+    its worker threads; rows keep the order of ``objects``.
+
+    With ``approximate=True`` solids are not measured: Volume and Area
+    are estimated from parametric dimensions or the bounding box (see
+    utils.approximation), and a PRECISION_KEY column gives each row's
+    precision tier.
+    """
+    names, labels, types, materials = [], [], [], []
+    x_len, y_len, z_len, volumes, shape_areas, object_areas = [], [], [], [], [], []
+    param_length, param_width, param_height = [], [], []
+    has_length, has_width, has_height = [], [], []
+
+    counts, tiers = [], []
+    # Geometry shared by links, clones and arrays is read once per source
+    measured: Dict[int, Tuple[Any, ...]] = {}
+    shape_values: Dict[str, Any] = {}
+    if executor is not None:
+        objects = list(objects)
+        shape_values = _measure_on_executor(objects, measure and not approximate, cache, executor)
+
+    for obj in objects:
+        try:
+            name, label, type_id = obj.Name, obj.Label, obj.TypeId
+            source, instances = resolve_instance(obj)
+            material = getattr(obj, 'Material', getattr(source, 'Material', 'Unknown'))
+            geometry = measured.get(id(source))
+            if geometry is None:
+                values = shape_values.get(source.Name)
+                if isinstance(values, ShapeError):
+                    raise values.error
+                geometry = measured[id(source)] = _read_geometry(source, measure, cache,
+                                                                 bounds is not None, values, approximate)
+            box, xl, yl, zl, volume, shape_area, object_area, lengths, tier = geometry
+            # Links and arrays are placed elsewhere than their geometry source
+            if box is not None and source is obj:
+                bounds[name] = box
+        except Exception as e:
+            FreeCAD.Console.PrintError(f"Error extracting object properties: {e}\n")
+            name = getattr(obj, 'Name', 'Unknown')
+            label = getattr(obj, 'Label', 'Unknown')
+            type_id = getattr(obj, 'TypeId', 'Unknown')
+            material = 'Unknown'
+            instances = 1
+            xl = yl = zl = volume = shape_area = object_area = 0.0
+            lengths = [None, None, None]
+            tier = EXACT
+
+        names.append(name)
+        labels.append(label)
+        types.append(type_id)
+        materials.append(material)
+        counts.append(instances)
+        tiers.append(tier)
+        x_len.append(xl)
+        y_len.append(yl)
+        z_len.append(zl)
+        volumes.append(volume)
+        shape_areas.append(shape_area)
+        object_areas.append(object_area)
+        for values, flags, param in ((param_length, has_length, lengths[0]),
+                                     (param_width, has_width, lengths[1]),
+                                     (param_height, has_height, lengths[2])):
+            flags.append(param is not None)
+            values.append(param or 0.0)
+
+    # Convert from mm to m
+    length = scale_round(x_len, 1000, 2)
+    width = scale_round(y_len, 1000, 2)
+    height = scale_round(z_len, 1000, 2)
+    volume_m3 = scale_round(volumes, 1000000000, 6)  # mm³ to m³
+
+    # Prefer actual shape area, then the object's Area property, then the
+    # bounding box approximation for objects that have a height
+    zeros = numeric_column([0.0] * len(names))
+    area = select(positive(height), multiply_round(length, width, 2), zeros)
+    area = select(nonzero(object_areas), scale_round(object_areas, 1000000, 2), area)
+    area = select(nonzero(shape_areas), scale_round(shape_areas, 1000000, 2), area)
+
+    # Unit weight is per instance, so it comes from the volume of one copy
+    if catalog is not None:
+        weight = catalog.weights(materials, volume_m3)
+    else:
+        weight = numeric_column([0.0] * len(names))
+
+    # Links, clones and arrays: one measured geometry times the instance count
+    quantity = numeric_column(counts)
+    if any(instances != 1 for instances in counts):
+        volume_m3 = multiply_round(volume_m3, quantity, 6)
+        area = multiply_round(area, quantity, 2)
+    if not measure and not approximate:
+        volume_m3 = numeric_column([NAN] * len(names))
+        area = numeric_column([NAN] * len(names))
+        weight = numeric_column([NAN] * len(names))
+
+    length = select(has_length, scale_round(param_length, 1000, 2), length)
+    width = select(has_width, scale_round(param_width, 1000, 2), width)
+    height = select(has_height, scale_round(param_height, 1000, 2), height)
+
+    columns = {
+        'Name': names,
+        'Label': labels,
+        'Type': types,
+        'Material': materials,
+        'Length': length,
+        'Width': width,
+        'Height': height,
+        'Volume': volume_m3,
+        'Area': area,
+        'Quantity': quantity,
+        'Unit_Weight': weight,
+    }
+    if approximate:
+        columns[PRECISION_KEY] = tiers
+    return PropertyTable(columns)
+
+
+def is_live(obj: Any) -> bool:
+    """Return False for an object that was deleted from its document"""
+    try:
+        return obj.Name is not None
+    except Exception:
+        # FreeCAD raises on attribute access of deleted objects
+        return False
+
+
+def iter_property_chunks(objects: Iterable[Any], chunk_size: int,
+                         cache: Optional[GeometryCache] = None, measure: bool = True,
+                         catalog: Optional[MaterialCatalog] = None,
+                         bounds: Optional[Dict[str, Bounds]] = None,
+                         executor: Optional[MeasureExecutor] = None,
+                         approximate: bool = False) -> Iterator[PropertyTable]:
+    """
+    Extract ``objects`` lazily, ``chunk_size`` objects at a time.
+
+    Each PropertyTable is measured only when the next chunk is requested,
+    so callers can interleave extraction with UI updates or stop early.
+    Objects deleted before their chunk is reached are left out, so edits
+    made while loading do not stop the load. ``bounds`` is filled as
+    described in extract_properties.
+    """
+    iterator = iter(objects)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield extract_properties([obj for obj in chunk if is_live(obj)], cache, measure, catalog,
+                                 bounds, executor, approximate)
+
+
+def measure_objects(objects: Sequence[Any], cache: Optional[GeometryCache] = None,
+                    catalog: Optional[MaterialCatalog] = None,
+                    executor: Optional[MeasureExecutor] = None) -> Dict[str, List[float]]:
+    """
+    Measure the LAZY_KEYS columns of ``objects``, e.g. for a lazy provider.
+
+    ``None`` entries (objects deleted since their row was added) measure as 0.
+    """
+    present = [obj for obj in objects if obj is not None]
+    table = extract_properties(present, cache, catalog=catalog, executor=executor)
+    result: Dict[str, List[float]] = {key: [] for key in LAZY_KEYS}
+    index = 0
+    for obj in objects:
+        for key in LAZY_KEYS:
+            result[key].append(table.value(index, key) if obj is not None else 0.0)
+        if obj is not None:
+            index += 1
+    return result
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Face quantities - formwork, finish and net wall areas from classified faces
+"""
+
+from collections import OrderedDict
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+
+import FreeCAD
+
+from utils.instances import resolve_instance
+from utils.profiling import count
+from utils.property_table import FACE_KEYS, PropertyTable, scale_round
+
+# Face classes
+TOP = 'top'
+BOTTOM = 'bottom'
+SIDE = 'side'
+
+# A face is top/bottom when |normal.z| >= this (cos 30°), otherwise side
+HORIZONTAL_COSINE = 0.866
+DEFAULT_MAX_FACES = 200000
+
+
+class FaceInfo(NamedTuple):
+    """Classification and areas of one face (mm²)"""
+    face_class: str
+    area: float
+    gross_area: float  # Area inside the outer wire, i.e. with openings filled
+
+
+class FaceQuantities(NamedTuple):
+    """Per-object quantities derived from its faces (mm²)"""
+    top: float = 0.0
+    bottom: float = 0.0
+    side: float = 0.0
+    wall_net: float = 0.0
+    openings: float = 0.0
+
+    @property
+    def formwork(self) -> float:
+        """Vertical sides plus soffit"""
+        return self.side + self.bottom
+
+
+def _face_normal(face: Any) -> Any:
+    """Return the face normal at the middle of its parameter range"""
+    u_min, u_max, v_min, v_max = face.ParameterRange
+    return face.normalAt((u_min + u_max) / 2, (v_min + v_max) / 2)
+
+
+def _gross_area(face: Any, area: float) -> float:
+    """Return the area enclosed by the outer wire of a face with holes"""
+    if len(getattr(face, 'Wires', ())) < 2:
+        return area
+    try:
+        import Part
+        return Part.Face(face.Surface, face.OuterWire).Area
+    except Exception:
+        return area
+
+
+def classify_face(face: Any) -> FaceInfo:
+    """Classify one face as top/bottom/side by its normal and measure it"""
+    area = face.Area
+    normal_z = _face_normal(face).z
+    if normal_z >= HORIZONTAL_COSINE:
+        face_class = TOP
+    elif normal_z <= -HORIZONTAL_COSINE:
+        face_class = BOTTOM
+    else:
+        face_class = SIDE
+    gross_area = _gross_area(face, area) if face_class == SIDE else area
+    return FaceInfo(face_class, area, gross_area)
+
+
+def _same_face(cached: Any, face: Any) -> bool:
+    """Return True if ``cached`` and ``face`` share their B-rep face and location"""
+    if cached is face:
+        return True
+    try:
+        return cached.isSame(face)
+    except Exception:
+        return False
+
+
+class FaceClassifier:
+    """
+    Classifies faces once and derives every face quantity in one pass.
+
+    Results are cached per face by ``(hashCode(), Orientation)``; the hash
+    identifies the underlying B-rep face and location, so a recomputed
+    shape gets new entries while unchanged faces are reused. The hash is
+    derived from the face's address, so each entry keeps its face alive
+    (the address cannot be reused by another face) and a hit must also
+    pass ``isSame``. The cache lives for the session only, as hash codes
+    are not stable across runs.
+    """
+
+    def __init__(self, max_faces: int = DEFAULT_MAX_FACES):
+        self.max_faces = max_faces
+        self.hits = 0
+        self.misses = 0
+        self._faces: "OrderedDict[Tuple[int, str], Tuple[Any, FaceInfo]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._faces)
+
+    def face_info(self, face: Any) -> FaceInfo:
+        """Return the (cached) classification of a face"""
+        try:
+            key = (face.hashCode(), getattr(face, 'Orientation', ''))
+        except Exception:
+            return classify_face(face)
+        entry = self._faces.get(key)
+        if entry is not None and _same_face(entry[0], face):
+            self._faces.move_to_end(key)
+            self.hits += 1
+            count('face_cache.hit')
+            return entry[1]
+        self.misses += 1
+        count('face_cache.miss')
+        info = classify_face(face)
+        self._faces[key] = (face, info)
+        self._faces.move_to_end(key)
+        while len(self._faces) > self.max_faces:
+            self._faces.popitem(last=False)
+        return info
+
+    def quantities(self, shape: Any) -> FaceQuantities:
+        """Sum the classified face areas of a shape"""
+        top = bottom = side = wall_net = openings = 0.0
+        for face in shape.Faces:
+            info = self.face_info(face)
+            if info.face_class == TOP:
+                top += info.area
+            elif info.face_class == BOTTOM:
+                bottom += info.area
+            else:
+                side += info.area
+                # Net wall area: the largest vertical face (one wall face)
+                if info.area > wall_net:
+                    wall_net = info.area
+                    openings = info.gross_area - info.area
+        return FaceQuantities(top, bottom, side, wall_net, openings)
+
+    def clear(self):
+        """Drop all cached faces"""
+        self._faces.clear()
+
+
+_default_classifier = FaceClassifier()
+
+
+def default_classifier() -> FaceClassifier:
+    """Return the session-wide face classifier"""
+    return _default_classifier
+
+
+def extract_face_quantities(objects: Iterable[Any],
+                            classifier: Optional[FaceClassifier] = None) -> PropertyTable:
+    """
+    Extract face-based quantities (m²) of ``objects`` into a PropertyTable
+    with a Name column and the FACE_KEYS columns.
+    """
+    if classifier is None:
+        classifier = _default_classifier
+    names = []
+    values = {key: [] for key in FACE_KEYS}
+    for obj in objects:
+        quantities = FaceQuantities()
+        try:
+            name = obj.Name
+            # Links, clones and arrays: classify the shared geometry once
+            source, instances = resolve_instance(obj)
+            shape = getattr(source, 'Shape', None)
+            if shape:
+                quantities = FaceQuantities(*(value * instances for value in classifier.quantities(shape)))
+        except Exception as e:
+            FreeCAD.Console.PrintError(f"Error extracting face quantities: {e}\n")
+            name = getattr(obj, 'Name', 'Unknown')
+        names.append(name)
+        values['Formwork_Area'].append(quantities.formwork)
+        values['Top_Area'].append(quantities.top)
+        values['Wall_Net_Area'].append(quantities.wall_net)
+        values['Openings_Area'].append(quantities.openings)
+
+    columns = {'Name': names}
+    for key in FACE_KEYS:
+        columns[key] = scale_round(values[key], 1000000, 2)  # mm² to m²
+    return PropertyTable(columns)
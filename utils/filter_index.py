@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+FilterIndex - Precomputed search index for filtering object rows
+"""
+
+from typing import Dict, List, Optional, Sequence, Set
+
+
+class FilterIndex:
+    """
+    Name/Label search and TypeId filtering over table rows.
+
+    Lowercased Name/Label columns and a TypeId -> rows inverted index are
+    built once. A search whose text contains the previous search text
+    (e.g. typing one more character) only re-checks the previous result.
+    """
+
+    def __init__(self, names: Sequence[str], labels: Sequence[str], types: Sequence[str]):
+        self._names = [str(name).lower() for name in names]
+        self._labels = [str(label).lower() for label in labels]
+        self._type_rows: Dict[str, List[int]] = {}
+        for row, type_id in enumerate(types):
+            self._type_rows.setdefault(type_id, []).append(row)
+        self._last_text: Optional[str] = None
+        self._last_type: Optional[str] = None
+        self._last_result: Optional[Set[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def types(self) -> List[str]:
+        """Return the distinct object types, sorted"""
+        return sorted(self._type_rows)
+
+    def type_rows(self, type_filter: str) -> Set[int]:
+        """Rows whose type contains ``type_filter``"""
+        rows: Set[int] = set()
+        for type_id, type_rows in self._type_rows.items():
+            if type_filter in type_id:
+                rows.update(type_rows)
+        return rows
+
+    def search(self, text: str = "", type_filter: Optional[str] = None) -> Optional[Set[int]]:
+        """
+        Return the rows matching ``text`` (in Name or Label) and
+        ``type_filter``, or None when no filter is active.
+        """
+        text = text.lower()
+        if not text and type_filter is None:
+            self._last_text = self._last_type = self._last_result = None
+            return None
+
+        if (self._last_result is not None and self._last_type == type_filter
+                and self._last_text is not None and self._last_text in text):
+            # Narrow the previous result instead of rescanning every row
+            candidates = self._last_result
+        elif type_filter is not None:
+            candidates = self.type_rows(type_filter)
+        else:
+            candidates = range(len(self._names))
+
+        if text:
+            names, labels = self._names, self._labels
+            result = {row for row in candidates if text in names[row] or text in labels[row]}
+        else:
+            result = set(candidates)
+
+        self._last_text, self._last_type, self._last_result = text, type_filter, result
+        return result
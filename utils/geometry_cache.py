@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+GeometryCache - Persistent cache of measured shape quantities
+"""
+
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import FreeCAD
+
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 50000
+CACHE_SUFFIX = ".qto-cache.json"
+
+
+def shape_fingerprint(shape: Any, bbox: Any = None) -> str:
+    """
+    Build a cheap fingerprint of a shape.
+
+    Uses the bounding box and topology counts only; ``Shape.hashCode()``
+    is not used because it is not stable across FreeCAD sessions.
+    """
+    if bbox is None:
+        bbox = shape.BoundBox
+    bounds = [getattr(bbox, attr, 0.0) for attr in ('XMin', 'YMin', 'ZMin', 'XMax', 'YMax', 'ZMax')]
+    if not any(bounds):
+        bounds = [bbox.XLength, bbox.YLength, bbox.ZLength]
+    counts = [len(getattr(shape, attr, ())) for attr in ('Vertexes', 'Edges', 'Faces', 'Solids')]
+    parts = [getattr(shape, 'ShapeType', '')]
+    parts.extend(f"{value:.6f}" for value in bounds)
+    parts.extend(str(count) for count in counts)
+    return "|".join(parts)
+
+
+class GeometryCache:
+    """
+    LRU cache of (Volume, Area) per object, persisted as JSON.
+
+    Entries are keyed by object Name and validated with the shape
+    fingerprint, so a changed shape simply replaces its stale entry.
+    Values are stored in document units (mm³, mm²).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, float, float]]" = OrderedDict()
+        self._dirty = False
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str, fingerprint: str) -> Optional[Tuple[float, float]]:
+        """Return cached (volume, area) for ``name`` if the fingerprint matches"""
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != fingerprint:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, name: str, fingerprint: str, volume: float, area: float):
+        """Store measured values, evicting the least recently used entries"""
+        self._entries[name] = (fingerprint, float(volume), float(area))
+        self._entries.move_to_end(name)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def discard(self, name: str):
+        """Drop the entry for ``name``"""
+        if self._entries.pop(name, None) is not None:
+            self._dirty = True
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+        self._dirty = True
+
+    def load(self):
+        """Load entries from ``self.path``; a missing or corrupt file gives an empty cache"""
+        self._entries.clear()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+            if data.get('version') != CACHE_VERSION:
+                return
+            for name, fingerprint, volume, area in data.get('entries', []):
+                self._entries[name] = (fingerprint, float(volume), float(area))
+        except (OSError, ValueError, TypeError):
+            self._entries.clear()
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = False
+
+    def save(self):
+        """Write the cache to ``self.path`` if anything changed"""
+        if not self.path or not self._dirty:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            data = {
+                'version': CACHE_VERSION,
+                # Least recently used first, so eviction order survives reloads
+                'entries': [[name, *entry] for name, entry in self._entries.items()],
+            }
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(data, cache_file, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            FreeCAD.Console.PrintError(f"Error saving geometry cache: {e}\n")
+
+
+def user_cache_dir() -> str:
+    """Return the directory used for caches of unsaved documents"""
+    get_cache_path = getattr(FreeCAD, 'getUserCachePath', None)
+    base = get_cache_path() if get_cache_path else os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "QuantityTakeoff")
+
+
+def cache_path_for_document(doc: Any) -> str:
+    """Return the cache file path for a document (next to the .FCStd when saved)"""
+    filename = getattr(doc, 'FileName', '')
+    if filename:
+        return os.path.splitext(filename)[0] + CACHE_SUFFIX
+    return os.path.join(user_cache_dir(), getattr(doc, 'Name', 'Unnamed') + CACHE_SUFFIX)
+
+
+_document_caches: Dict[str, GeometryCache] = {}
+
+
+def cache_for_document(doc: Any) -> GeometryCache:
+    """Return the shared GeometryCache for ``doc``"""
+    path = cache_path_for_document(doc)
+    cache = _document_caches.get(path)
+    if cache is None:
+        cache = GeometryCache(path)
+        _document_caches[path] = cache
+    return cache
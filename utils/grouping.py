@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+BOQGroups - Grouped BOQ aggregation with incrementally maintained subtotals
+"""
+
+import re
+from bisect import insort
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.materials import material_name
+from utils.table_data import TableData
+
+# Columns summed per group
+SUM_KEYS = ('Volume', 'Area', 'Quantity', 'Unit_Weight', 'Material_Total', 'Labor_Total', 'Total')
+
+_TRAILING_NUMBER = re.compile(r'[\s_.-]*\d+$')
+
+
+def label_pattern(label: str) -> str:
+    """Strip the numeric suffix FreeCAD adds to copies ('Rebar017' -> 'Rebar')"""
+    return _TRAILING_NUMBER.sub('', str(label)) or str(label)
+
+
+# Group key of a row: (data, row) -> key
+GroupKey = Callable[[TableData, int], str]
+
+GROUP_BY: Dict[str, GroupKey] = {
+    'Type': lambda data, row: str(data.value(row, 'Type')),
+    'Material': lambda data, row: material_name(data.value(row, 'Material')),
+    'Label pattern': lambda data, row: label_pattern(data.value(row, 'Label')),
+}
+
+
+class Group:
+    """One BOQ group: its rows and the sums of SUM_KEYS over them"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.rows: List[int] = []
+        self.sums: Dict[str, float] = dict.fromkeys(SUM_KEYS, 0.0)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _apply(self, values: Sequence[float], sign: float):
+        for key, value in zip(SUM_KEYS, values):
+            self.sums[key] += sign * value
+
+
+class BOQGroups:
+    """
+    Groups the rows of a BOQ TableData by a key function.
+
+    Groups live in a dict keyed by group key. Each row remembers its
+    group and the values it contributed, so changing, adding or removing
+    a row only adjusts the sums of the groups involved.
+
+    Lazy cells that have not been measured yet count as 0, so grouping
+    never forces a measurement; call ``update_rows`` once they are resolved.
+    """
+
+    def __init__(self, data: TableData, group_key: GroupKey):
+        self.data = data
+        self.group_key = group_key
+        self.groups: Dict[str, Group] = {}
+        self.order: List[str] = []  # Display order of the group keys (sorted)
+        self._index: Optional[Dict[str, int]] = None  # Group key -> display position
+        self._row_keys: List[str] = []
+        self._row_values: List[Tuple[float, ...]] = []
+        self.rebuild()
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def group(self, index: int) -> Group:
+        """Return the group at display position ``index``"""
+        return self.groups[self.order[index]]
+
+    def index_of(self, key: str) -> int:
+        """Return the display position of a group key"""
+        if self._index is None:
+            self._index = {key: index for index, key in enumerate(self.order)}
+        return self._index[key]
+
+    def row_group(self, row: int) -> Group:
+        """Return the group a table row belongs to"""
+        return self.groups[self._row_keys[row]]
+
+    def _row_contribution(self, row: int) -> Tuple[float, ...]:
+        values = []
+        for key in SUM_KEYS:
+            # Read the stored cell: value() would measure pending lazy cells
+            value = self.data.column(key)[row]
+            values.append(0.0 if value != value else float(value))
+        return tuple(values)
+
+    def _add(self, row: int, key: str, values: Tuple[float, ...]) -> bool:
+        """Add a row to its group; returns True if the group is new"""
+        group = self.groups.get(key)
+        created = group is None
+        if created:
+            group = self.groups[key] = Group(key)
+            insort(self.order, key)
+            self._index = None
+        group.rows.append(row)
+        group._apply(values, 1.0)
+        return created
+
+    def _discard_group(self, key: str):
+        del self.groups[key]
+        self.order.remove(key)
+        self._index = None
+
+    def rebuild(self):
+        """Regroup every row and recompute all sums"""
+        self.groups, self.order, self._index = {}, [], None
+        self._row_keys, self._row_values = [], []
+        for row in range(len(self.data)):
+            self.add_row(row)
+
+    def add_row(self, row: int) -> bool:
+        """Add a new (last) row; returns True if a group was created"""
+        key = self.group_key(self.data, row)
+        values = self._row_contribution(row)
+        self._row_keys.append(key)
+        self._row_values.append(values)
+        return self._add(row, key, values)
+
+    def add_rows(self, rows: Sequence[int]) -> bool:
+        """Add new rows; returns True if any group was created"""
+        created = False
+        for row in rows:
+            created = self.add_row(row) or created
+        return created
+
+    def update_row(self, row: int) -> bool:
+        """
+        Apply the change of one row to the sums.
+
+        Returns True if the row moved to another group (the grouping
+        structure changed), False if only sums changed.
+        """
+        old_key, old_values = self._row_keys[row], self._row_values[row]
+        key = self.group_key(self.data, row)
+        values = self._row_contribution(row)
+        self._row_values[row] = values
+        if key == old_key:
+            group = self.groups[key]
+            group._apply(old_values, -1.0)
+            group._apply(values, 1.0)
+            return False
+
+        old_group = self.groups[old_key]
+        old_group._apply(old_values, -1.0)
+        old_group.rows.remove(row)
+        if not old_group.rows:
+            self._discard_group(old_key)
+        self._row_keys[row] = key
+        self._add(row, key, values)
+        old_group.rows.sort()
+        self.groups[key].rows.sort()
+        return True
+
+    def update_rows(self, rows: Sequence[int]) -> bool:
+        """Apply the change of several rows (e.g. resolved lazy cells); True if any row moved"""
+        moved = False
+        for row in rows:
+            moved = self.update_row(row) or moved
+        return moved
+
+    def remove_rows(self, rows: Sequence[int]):
+        """Remove rows (call alongside TableData.remove_rows); later rows are renumbered"""
+        removed = set(rows)
+        if not removed:
+            return
+        for row in removed:
+            group = self.groups[self._row_keys[row]]
+            group._apply(self._row_values[row], -1.0)
+        self._row_keys = [key for row, key in enumerate(self._row_keys) if row not in removed]
+        self._row_values = [values for row, values in enumerate(self._row_values) if row not in removed]
+        for group in self.groups.values():
+            group.rows = []
+        for row, key in enumerate(self._row_keys):
+            self.groups[key].rows.append(row)
+        for key in [key for key in self.order if not self.groups[key].rows]:
+            self._discard_group(key)
+
+    def totals(self) -> Dict[str, float]:
+        """Return the sums over all groups"""
+        totals = dict.fromkeys(SUM_KEYS, 0.0)
+        for group in self.groups.values():
+            for key, value in group.sums.items():
+                totals[key] += value
+        return totals
+
+
+def group_boq(data: TableData, group_by: str) -> Optional[BOQGroups]:
+    """Group ``data`` by a GROUP_BY name, or return None for no grouping"""
+    group_key = GROUP_BY.get(group_by)
+    return BOQGroups(data, group_key) if group_key else None
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Instance resolution - find the shared geometry behind links, clones and arrays
+"""
+
+from typing import Any, NamedTuple, Optional
+
+# Draft array proxies whose elements are copies of their Base
+ARRAY_TYPES = ('Array', 'PathArray', 'PathTwistedArray', 'PointArray')
+# Links/clones/arrays nested deeper than this are measured as they are
+MAX_DEPTH = 16
+
+
+class Instance(NamedTuple):
+    """The object whose shape is measured, and how many copies ``obj`` stands for"""
+    source: Any
+    count: int = 1
+
+
+def proxy_type(obj: Any) -> str:
+    """Return the Proxy.Type of a Python feature (e.g. 'Clone', 'Array'), or ''"""
+    return str(getattr(getattr(obj, 'Proxy', None), 'Type', '') or '')
+
+
+def linked_object(obj: Any) -> Optional[Any]:
+    """Return the object an App::Link points to, or None"""
+    get_linked = getattr(obj, 'getLinkedObject', None)
+    target = get_linked(True) if get_linked else getattr(obj, 'LinkedObject', None)
+    return None if target is obj else target
+
+
+def array_count(obj: Any) -> Optional[int]:
+    """Return the number of elements of a Draft array without building them"""
+    count = getattr(obj, 'Count', None)
+    if count:
+        return int(count)
+    array_type = getattr(obj, 'ArrayType', '')
+    if array_type == 'ortho':
+        return int(obj.NumberX) * int(obj.NumberY) * int(obj.NumberZ)
+    if array_type == 'polar':
+        return int(obj.NumberPolar)
+    return None
+
+
+def _unit_scale(scale: Any) -> bool:
+    """Return True for no scale, a scale factor of 1 or a (1, 1, 1) scale vector"""
+    if scale is None:
+        return True
+    if isinstance(scale, (int, float)):
+        return abs(scale - 1.0) < 1e-9
+    return all(abs(getattr(scale, axis, 1.0) - 1.0) < 1e-9 for axis in ('x', 'y', 'z'))
+
+
+def resolve_instance(obj: Any, depth: int = 0) -> Instance:
+    """
+    Resolve ``obj`` to the object that owns its geometry.
+
+    Unscaled App::Links (and link arrays, via ElementCount) and Draft
+    Clones resolve to their target; scaled ones are measured as they are; unfused Draft arrays resolve to
+    their Base with the element count. Only properties are read, so no
+    shape is built for the individual elements.
+    """
+    if depth >= MAX_DEPTH:
+        return Instance(obj)
+
+    if getattr(obj, 'TypeId', '').startswith('App::Link'):
+        target = linked_object(obj)
+        unscaled = _unit_scale(getattr(obj, 'Scale', None)) and _unit_scale(getattr(obj, 'ScaleVector', None))
+        if target is not None and unscaled:
+            inner = resolve_instance(target, depth + 1)
+            count = max(int(getattr(obj, 'ElementCount', 0) or 0), 1)
+            return Instance(inner.source, count * inner.count)
+
+    kind = proxy_type(obj)
+    if kind == 'Clone':
+        bases = getattr(obj, 'Objects', None) or []
+        if len(bases) == 1 and _unit_scale(getattr(obj, 'Scale', None)):
+            return resolve_instance(bases[0], depth + 1)
+    elif kind in ARRAY_TYPES and not getattr(obj, 'Fuse', False):
+        base = getattr(obj, 'Base', None)
+        count = array_count(obj)
+        if base is not None and count:
+            inner = resolve_instance(base, depth + 1)
+            return Instance(inner.source, count * inner.count)
+
+    return Instance(obj)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+MaterialCatalog - Densities, unit prices and labor rates per material
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import FreeCAD
+
+from utils.property_table import Column, multiply_round, np, numeric_column
+
+MATERIALS_FILENAME = "materials.json"
+MATERIALS_SUFFIX = ".materials"
+BUNDLED_CATALOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "resources", MATERIALS_FILENAME)
+
+
+class MaterialSpec(NamedTuple):
+    """
+    Catalog entry: density (kg/m³), material price and labor rate per
+    piece. Prices fill the BOQ's Material/unit and Labor/unit columns,
+    which are multiplied by Quantity (the object or instance count).
+    """
+    density: float = 0.0
+    unit_price: float = 0.0
+    labor_rate: float = 0.0
+
+
+UNKNOWN_MATERIAL = MaterialSpec()
+
+
+def material_name(material: Any) -> str:
+    """Return the name of a Material property value (string or material object)"""
+    if isinstance(material, str):
+        return material
+    return str(getattr(material, 'Label', material))
+
+
+def _card_density(material: Any) -> float:
+    """Read the density from an Arch material card, e.g. '2400 kg/m^3'"""
+    card = getattr(material, 'Material', None)
+    if not isinstance(card, dict):
+        return 0.0
+    try:
+        return float(str(card.get('Density', '')).split()[0])
+    except (ValueError, IndexError):
+        return 0.0
+
+
+class MaterialCatalog:
+    """
+    Material lookup by name (case-insensitive).
+
+    Each distinct Material value is resolved once and remembered, so a
+    BOQ with thousands of rows costs one lookup per material.
+    """
+
+    def __init__(self, materials: Optional[Dict[str, MaterialSpec]] = None):
+        self._materials: Dict[str, MaterialSpec] = {}
+        self._resolved: Dict[str, MaterialSpec] = {}
+        for name, spec in (materials or {}).items():
+            self.add(name, spec)
+
+    def __len__(self) -> int:
+        return len(self._materials)
+
+    def __contains__(self, name: str) -> bool:
+        return name.strip().lower() in self._materials
+
+    def add(self, name: str, spec: MaterialSpec):
+        """Add or replace a material"""
+        self._materials[name.strip().lower()] = spec
+        self._resolved.clear()
+
+    def update(self, other: 'MaterialCatalog'):
+        """Add the materials of ``other``, overriding entries with the same name"""
+        self._materials.update(other._materials)
+        self._resolved.clear()
+
+    def resolve(self, material: Any) -> MaterialSpec:
+        """Return the entry for a Material value, or UNKNOWN_MATERIAL"""
+        key = material_name(material)
+        spec = self._resolved.get(key)
+        if spec is None:
+            spec = self._materials.get(key.strip().lower())
+            if spec is None:
+                # Arch materials carry their own density in the material card
+                density = _card_density(material)
+                spec = MaterialSpec(density=density) if density else UNKNOWN_MATERIAL
+            self._resolved[key] = spec
+        return spec
+
+    def columns(self, materials: Sequence[Any]) -> Dict[str, Column]:
+        """
+        Return Density, Material_Unit and Labor_Unit columns for a
+        Material column, resolving each distinct material once.
+        """
+        index: Dict[str, int] = {}
+        specs: List[MaterialSpec] = []
+        codes = []
+        for material in materials:
+            key = material_name(material)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(specs)
+                specs.append(self.resolve(material))
+            codes.append(code)
+
+        result = {}
+        for key, field in (('Density', 'density'), ('Material_Unit', 'unit_price'), ('Labor_Unit', 'labor_rate')):
+            values = [getattr(spec, field) for spec in specs]
+            if np is not None:
+                result[key] = np.asarray(values, dtype=float)[np.asarray(codes, dtype=int)] if codes else numeric_column([])
+            else:
+                result[key] = numeric_column([values[code] for code in codes])
+        return result
+
+    def weights(self, materials: Sequence[Any], volumes: Column) -> Column:
+        """Weight (kg) column from a Material column and a Volume (m³) column"""
+        return multiply_round(volumes, self.columns(materials)['Density'], 2)
+
+
+def _load_json(path: str) -> Dict[str, MaterialSpec]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {name: MaterialSpec(float(entry.get('density', 0.0)),
+                               float(entry.get('unit_price', 0.0)),
+                               float(entry.get('labor_rate', 0.0)))
+            for name, entry in data.get('materials', {}).items()}
+
+
+def _load_sqlite(path: str) -> Dict[str, MaterialSpec]:
+    connection = sqlite3.connect(path)
+    try:
+        rows = connection.execute(
+            "SELECT name, density, unit_price, labor_rate FROM materials").fetchall()
+    finally:
+        connection.close()
+    return {name: MaterialSpec(float(density or 0.0), float(unit_price or 0.0), float(labor_rate or 0.0))
+            for name, density, unit_price, labor_rate in rows}
+
+
+def load_catalog(path: str) -> MaterialCatalog:
+    """
+    Load a catalog from JSON (``{"materials": {name: {density, unit_price,
+    labor_rate}}}``) or from SQLite (``.sqlite``/``.db`` with a
+    ``materials(name, density, unit_price, labor_rate)`` table).
+    """
+    if os.path.splitext(path)[1].lower() in ('.sqlite', '.sqlite3', '.db'):
+        return MaterialCatalog(_load_sqlite(path))
+    return MaterialCatalog(_load_json(path))
+
+
+def catalog_paths(filename: str = "") -> List[str]:
+    """
+    Return the catalog files that apply to a document file, lowest
+    priority first: the bundled catalog, the user's catalog and the
+    project catalog next to the .FCStd (``<name>.materials.json``/``.sqlite``).
+    """
+    paths = [BUNDLED_CATALOG]
+    get_data_path = getattr(FreeCAD, 'getUserAppDataDir', None)
+    if get_data_path:
+        user_dir = os.path.join(get_data_path(), "QuantityTakeoff")
+        paths.extend(os.path.join(user_dir, "materials" + ext) for ext in ('.json', '.sqlite'))
+    if filename:
+        base = os.path.splitext(filename)[0] + MATERIALS_SUFFIX
+        paths.extend(base + ext for ext in ('.json', '.sqlite'))
+    return paths
+
+
+def load_catalogs(paths: Iterable[str]) -> MaterialCatalog:
+    """Merge the existing catalog files of ``paths``; later files override earlier ones"""
+    catalog = MaterialCatalog()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            catalog.update(load_catalog(path))
+        except Exception as e:
+            FreeCAD.Console.PrintError(f"Error loading material catalog {path}: {e}\n")
+    return catalog
+
+
+_document_catalogs: Dict[str, MaterialCatalog] = {}
+
+
+def catalog_for_file(filename: str = "") -> MaterialCatalog:
+    """Return the (memoized) merged material catalog for a document file"""
+    catalog = _document_catalogs.get(filename)
+    if catalog is None:
+        catalog = _document_catalogs[filename] = load_catalogs(catalog_paths(filename))
+    return catalog
+
+
+def catalog_for_document(doc: Any = None) -> MaterialCatalog:
+    """Return the material catalog for an open document (or the defaults)"""
+    return catalog_for_file(getattr(doc, 'FileName', '') if doc is not None else '')
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+MeasureExecutor - Thread pool for shape measurements of independent objects
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Shape operations that may run off the main thread: read-only OCC queries
+# on a shape copy that touch neither the document nor Python-side caches.
+# Everything else (document properties, Vertexes/Faces lists, booleans)
+# stays on the calling thread.
+THREAD_SAFE_OPERATIONS = frozenset({'BoundBox', 'Volume', 'Area'})
+
+# Below this many shapes a batch is measured serially; the pool costs more
+MIN_PARALLEL_SHAPES = 64
+# Chunks per worker, so uneven shapes still spread over the pool
+CHUNKS_PER_WORKER = 4
+# Environment variable opting the dialogs into threaded measurement
+THREADS_ENV = 'QTO_MEASURE_THREADS'
+
+
+class ShapeError:
+    """Exception raised by one shape's operations, re-raised by the caller"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def shape_values(shape: Any, operations: Sequence[str]) -> Tuple[Any, ...]:
+    """Return the ``operations`` attributes of ``shape``, e.g. (BoundBox, Volume)"""
+    return tuple(getattr(shape, operation) for operation in operations)
+
+
+def _measure_chunk(shapes: Sequence[Any], operations: Sequence[str]) -> List[Any]:
+    results = []
+    for shape in shapes:
+        try:
+            results.append(shape_values(shape, operations))
+        except Exception as e:
+            results.append(ShapeError(e))
+    return results
+
+
+class MeasureExecutor:
+    """
+    Runs allow-listed shape operations of independent objects on a pool
+    of threads.
+
+    Only worth enabling where the geometry kernel releases the GIL while
+    measuring; see tests/benchmarks/test_measure_benchmarks.py. Shapes
+    are read from their objects by the caller (document access stays on
+    one thread) and results come back in the order of the shapes given.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_parallel: int = MIN_PARALLEL_SHAPES):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> 'MeasureExecutor':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def map(self, shapes: Sequence[Any], operations: Sequence[str]) -> List[Any]:
+        """
+        Return ``shape_values(shape, operations)`` for each shape, in order.
+
+        A shape whose operations raise gets a ShapeError in its place, so
+        one bad shape does not fail the batch. Raises ValueError for an
+        operation outside THREAD_SAFE_OPERATIONS.
+        """
+        unsafe = set(operations) - THREAD_SAFE_OPERATIONS
+        if unsafe:
+            raise ValueError(f"Shape operations not allowed on worker threads: {sorted(unsafe)}")
+        if self.workers <= 1 or len(shapes) < self.min_parallel:
+            return _measure_chunk(shapes, operations)
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='qto-measure')
+        size = -(-len(shapes) // (self.workers * CHUNKS_PER_WORKER))
+        futures = [self._pool.submit(_measure_chunk, shapes[start:start + size], operations)
+                   for start in range(0, len(shapes), size)]
+        # Chunks finish in any order; collecting them in submit order restores shape order
+        results: List[Any] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def close(self):
+        """Shut the worker threads down"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# Process-wide executor shared by the dialogs, created when opted in
+_default_executor: Optional[MeasureExecutor] = None
+
+
+def default_executor() -> Optional[MeasureExecutor]:
+    """
+    Return the shared executor if threaded measurement is enabled with
+    the QTO_MEASURE_THREADS environment variable (a thread count, 0 for
+    one per CPU), or None to measure on the calling thread.
+    """
+    global _default_executor
+    setting = os.environ.get(THREADS_ENV, '').strip()
+    if not setting:
+        return None
+    try:
+        workers = int(setting)
+    except ValueError:
+        return None
+    if workers == 1:
+        return None
+    executor = MeasureExecutor(workers or None)
+    if _default_executor is None or _default_executor.workers != executor.workers:
+        if _default_executor is not None:
+            _default_executor.close()
+        _default_executor = executor
+    return _default_executor
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel takeoff - spreads documents (or object chunks) over worker processes
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from utils.property_table import PropertyRecord, PropertyTable
+
+
+class TakeoffTask(NamedTuple):
+    """One unit of work: chunk ``chunk`` of ``chunks`` of a document's objects"""
+    index: int
+    filename: str
+    chunk: int = 0
+    chunks: int = 1
+    use_cache: bool = True
+
+
+class RowBatch(NamedTuple):
+    """Result of a TakeoffTask: property records, or the error that stopped it"""
+    task: TakeoffTask
+    records: List[PropertyRecord]
+    error: Optional[str] = None
+
+
+def make_tasks(filenames: Iterable[str], chunks: int = 1, use_cache: bool = True) -> List[TakeoffTask]:
+    """Split every document into ``chunks`` tasks, in a stable order"""
+    tasks = []
+    for filename in filenames:
+        for chunk in range(chunks):
+            tasks.append(TakeoffTask(len(tasks), filename, chunk, chunks, use_cache))
+    return tasks
+
+
+def takeoff_task(task: TakeoffTask) -> RowBatch:
+    """
+    Worker entry point: open the document in this process's own FreeCAD
+    instance and measure its share of the objects.
+    """
+    # Imported here so only worker processes load FreeCAD for this module
+    from utils.documents import opened_document
+    from utils.extraction import extract_properties, takeoff_objects
+    from utils.geometry_cache import cache_for_document
+    from utils.materials import catalog_for_document
+
+    with opened_document(task.filename) as doc:
+        objects = takeoff_objects(doc.Objects)
+        start = len(objects) * task.chunk // task.chunks
+        stop = len(objects) * (task.chunk + 1) // task.chunks
+        # Chunks of one document share a cache file, so only whole-document tasks use it
+        cache = cache_for_document(doc) if task.use_cache and task.chunks == 1 else None
+        table = extract_properties(objects[start:stop], cache, catalog=catalog_for_document(doc))
+        if cache is not None:
+            cache.save()
+    return RowBatch(task, list(table.records()))
+
+
+def _run_in_process(worker: Callable[[TakeoffTask], RowBatch], task: TakeoffTask) -> RowBatch:
+    try:
+        return worker(task)
+    except Exception as e:
+        return RowBatch(task, [], f"{type(e).__name__}: {e}")
+
+
+def parallel_takeoff(tasks: Iterable[TakeoffTask], workers: Optional[int] = None,
+                     worker: Callable[[TakeoffTask], RowBatch] = takeoff_task,
+                     mp_context: str = "spawn") -> Iterator[RowBatch]:
+    """
+    Run ``tasks`` on a pool of ``workers`` processes (0 runs them in this
+    process) and yield their RowBatches in task order.
+
+    A task that raises yields a batch with ``error`` set. If a worker
+    process dies, the first unfinished task is rerun alone in a fresh
+    process and only reported as failed if it dies there too; the
+    remaining tasks then continue on a new pool.
+    """
+    tasks = list(tasks)
+    if workers == 0:
+        for task in tasks:
+            yield _run_in_process(worker, task)
+        return
+
+    context = multiprocessing.get_context(mp_context)
+    position = 0
+    while position < len(tasks):
+        broken = False
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(worker, task) for task in tasks[position:]]
+            for future in futures:
+                task = tasks[position]
+                try:
+                    batch = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    break
+                except Exception as e:
+                    batch = RowBatch(task, [], f"{type(e).__name__}: {e}")
+                yield batch
+                position += 1
+        if broken:
+            # Any running task may have killed the pool; isolate this one
+            yield _run_isolated(worker, tasks[position], context)
+            position += 1
+
+
+def _run_isolated(worker: Callable[[TakeoffTask], RowBatch], task: TakeoffTask, context) -> RowBatch:
+    """Run one task in its own single-process pool"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        try:
+            return pool.submit(worker, task).result()
+        except BrokenProcessPool as e:
+            return RowBatch(task, [], f"worker process died: {e}")
+        except Exception as e:
+            return RowBatch(task, [], f"{type(e).__name__}: {e}")
+
+
+def merge_batches(batches: Iterable[RowBatch]) -> Iterator[Tuple[str, PropertyTable, List[str]]]:
+    """
+    Merge ordered batches into one (filename, PropertyTable, errors) per
+    document, yielded as soon as its last chunk arrives.
+    """
+    records: List[PropertyRecord] = []
+    errors: List[str] = []
+    for batch in batches:
+        records.extend(batch.records)
+        if batch.error:
+            errors.append(batch.error)
+        if batch.task.chunk == batch.task.chunks - 1:
+            yield batch.task.filename, PropertyTable.from_records(records), errors
+            records, errors = [], []
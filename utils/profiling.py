@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Profiling - timed spans and counters written as a Chrome trace or cProfile stats
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import FreeCAD
+
+# Trace formats by file extension; anything else is written as Chrome trace JSON
+CPROFILE_EXTENSIONS = ('.prof', '.pstats')
+
+
+class Profiler:
+    """
+    Collects timed spans and named counters while enabled.
+
+    Disabled (the default), ``span`` and ``count`` only check a flag, so
+    the instrumentation can stay in hot paths. Enabled with a ``.json``
+    path, spans become Chrome trace events (chrome://tracing, Perfetto);
+    with a ``.prof`` path, cProfile also runs and its stats are written.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self._profile: Optional[cProfile.Profile] = None
+        self._start = 0.0
+
+    def start(self, path: str):
+        """Start recording; the trace is written to ``path`` by ``stop``"""
+        self.path = path
+        self.events = []
+        self.counters = {}
+        self._start = time.perf_counter()
+        if os.path.splitext(path)[1].lower() in CPROFILE_EXTENSIONS:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self.enabled = True
+
+    def stop(self) -> Optional[str]:
+        """Stop recording and write the trace; returns its path"""
+        if not self.enabled:
+            return None
+        self.enabled = False
+        try:
+            if self._profile is not None:
+                self._profile.disable()
+                self._profile.dump_stats(self.path)
+            else:
+                self.write_chrome_trace(self.path)
+        except OSError as e:
+            FreeCAD.Console.PrintError(f"Error writing profiling trace: {e}\n")
+            return None
+        finally:
+            self._profile = None
+        return self.path
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._start) * 1e6
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Time the enclosed block as a span called ``name``"""
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self.events.append({
+                'name': name, 'ph': 'X', 'ts': start, 'dur': self._now_us() - start,
+                'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args,
+            })
+
+    def count(self, name: str, amount: int = 1):
+        """Add ``amount`` to the counter ``name``"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return the number of calls and total milliseconds per span name"""
+        result: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            entry = result.setdefault(event['name'], {'calls': 0, 'ms': 0.0})
+            entry['calls'] += 1
+            entry['ms'] += event['dur'] / 1000.0
+        return result
+
+    def write_chrome_trace(self, path: str):
+        """Write spans and final counter values in the Chrome trace event format"""
+        events = list(self.events)
+        end = self._now_us()
+        for name, value in sorted(self.counters.items()):
+            events.append({'name': name, 'ph': 'C', 'ts': end, 'pid': os.getpid(), 'args': {name: value}})
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'counters': self.counters}}, trace_file)
+
+
+# Process-wide profiler used by the dialogs and calculators
+PROFILER = Profiler()
+span = PROFILER.span
+count = PROFILER.count
+
+
+def default_trace_path(extension: str = ".json") -> str:
+    """Return a timestamped trace path in the user cache directory"""
+    from utils.geometry_cache import user_cache_dir
+    return os.path.join(user_cache_dir(), time.strftime("qto-trace-%Y%m%d-%H%M%S") + extension)
+
+
+def toggle_profiling(path: Optional[str] = None, enable: Optional[bool] = None) -> bool:
+    """
+    Start profiling (to ``path`` or a new trace file), or stop it and
+    report the trace. ``enable`` (e.g. a menu item's checked state)
+    starts or stops it explicitly instead of toggling. Returns True if
+    profiling is now running.
+    """
+    if enable is None:
+        enable = not PROFILER.enabled
+    if enable == PROFILER.enabled:
+        return PROFILER.enabled
+    if PROFILER.enabled:
+        written = PROFILER.stop()
+        for name, entry in sorted(PROFILER.summary().items()):
+            FreeCAD.Console.PrintMessage(f"  {name}: {entry['calls']} calls, {entry['ms']:.1f} ms\n")
+        for name, value in sorted(PROFILER.counters.items()):
+            FreeCAD.Console.PrintMessage(f"  {name}: {value}\n")
+        if written:
+            FreeCAD.Console.PrintMessage(f"Profiling trace written to {written}\n")
+        return False
+    PROFILER.start(path or default_trace_path())
+    FreeCAD.Console.PrintMessage(f"Profiling started, trace: {PROFILER.path}\n")
+    return True
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+PropertyTable - Columnar storage for extracted object properties
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional inside FreeCAD
+    np = None
+
+
+class PropertyRecord(NamedTuple):
+    """
+    Properties of one object, as returned by
+    QTOCalculator.get_object_properties and PropertyTable.row/records.
+
+    A tuple with named fields: no per-row dict, numbers stay numbers
+    (dimensions in m, Volume in m³, Area in m²) and are only formatted
+    when shown or exported. ``record['Area']`` also works, like the
+    property dicts it replaces.
+    """
+    Name: str
+    Label: str
+    Type: str
+    Material: Any
+    Length: float
+    Width: float
+    Height: float
+    Volume: float
+    Area: float
+    Quantity: int
+    Unit_Weight: float
+
+    def __getitem__(self, key: Union[str, int, slice]) -> Any:
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def keys(self) -> Sequence[str]:
+        """Return the field names, like dict.keys()"""
+        return self._fields
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by name, or ``default`` for unknown names"""
+        return getattr(self, key) if key in self._fields else default
+
+
+PROPERTY_KEYS = PropertyRecord._fields
+TEXT_KEYS = ('Name', 'Label', 'Type', 'Material')
+NUMERIC_KEYS = ('Length', 'Width', 'Height', 'Volume', 'Area', 'Quantity', 'Unit_Weight')
+INTEGER_KEYS = ('Quantity',)
+# Face-based quantities (utils/face_quantities.py), in m²
+FACE_KEYS = ('Formwork_Area', 'Top_Area', 'Wall_Net_Area', 'Openings_Area')
+
+Column = Union[List[Any], 'array', Any]
+
+
+def numeric_column(values: Sequence[float]) -> Column:
+    """Build a float column (NumPy array, or array('d') without NumPy)"""
+    if np is not None:
+        return np.asarray(values, dtype=float)
+    return array('d', values)
+
+
+def scale_round(column: Column, divisor: float, ndigits: int) -> Column:
+    """Divide a whole column by ``divisor`` and round it to ``ndigits``"""
+    if np is not None:
+        return np.round(np.asarray(column, dtype=float) / divisor, ndigits)
+    return array('d', [round(value / divisor, ndigits) for value in column])
+
+
+def multiply_round(left: Column, right: Column, ndigits: int) -> Column:
+    """Element-wise product of two columns, rounded to ``ndigits``"""
+    if np is not None:
+        return np.round(np.asarray(left) * np.asarray(right), ndigits)
+    return array('d', [round(a * b, ndigits) for a, b in zip(left, right)])
+
+
+def select(mask: Sequence[bool], when_true: Column, when_false: Column) -> Column:
+    """Element-wise ``when_true if mask else when_false``"""
+    if np is not None:
+        return np.where(np.asarray(mask, dtype=bool), when_true, when_false)
+    return array('d', [a if m else b for m, a, b in zip(mask, when_true, when_false)])
+
+
+def nonzero(column: Column) -> Column:
+    """Boolean mask of the non-zero entries of a column"""
+    if np is not None:
+        return np.asarray(column) != 0
+    return [value != 0 for value in column]
+
+
+def positive(column: Column) -> Column:
+    """Boolean mask of the strictly positive entries of a column"""
+    if np is not None:
+        return np.asarray(column) > 0
+    return [value > 0 for value in column]
+
+
+class PropertyTable:
+    """
+    Column-oriented table of object properties.
+
+    Text columns are plain lists, numeric columns are NumPy arrays when
+    NumPy is available and ``array('d')`` otherwise.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, Column]] = None):
+        self._columns: Dict[str, Column] = {}
+        if columns:
+            self._columns.update(columns)
+        else:
+            for key in PROPERTY_KEYS:
+                self._columns[key] = [] if key in TEXT_KEYS else numeric_column([])
+
+    def __len__(self) -> int:
+        return len(self._columns['Name'])
+
+    def keys(self):
+        """Return the column names"""
+        return self._columns.keys()
+
+    def column(self, key: str) -> Column:
+        """Return a whole column"""
+        return self._columns[key]
+
+    def add_column(self, key: str, values: Column):
+        """Add a column kept alongside PROPERTY_KEYS (e.g. the precision tier)"""
+        self._columns[key] = values
+
+    def value(self, index: int, key: str) -> Any:
+        """Return a single cell with its natural Python type"""
+        value = self._columns[key][index]
+        if key in INTEGER_KEYS:
+            return int(value)
+        if key in NUMERIC_KEYS or key in FACE_KEYS:
+            return float(value)
+        return value
+
+    def row(self, index: int) -> PropertyRecord:
+        """Return one row as a PropertyRecord (same as get_object_properties)"""
+        return PropertyRecord._make([self.value(index, key) for key in PROPERTY_KEYS])
+
+    def rows(self) -> Iterator[PropertyRecord]:
+        """Iterate over all rows as PropertyRecords"""
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def records(self) -> Iterator[PropertyRecord]:
+        """
+        Iterate over rows as PropertyRecords.
+
+        Material links (e.g. Arch materials) are reduced to their label so
+        the records can be pickled and sent between processes.
+        """
+        for record in self.rows():
+            if not isinstance(record.Material, str):
+                record = record._replace(Material=str(getattr(record.Material, 'Label', record.Material)))
+            yield record
+
+    @classmethod
+    def from_records(cls, records: Iterable[Sequence[Any]]) -> 'PropertyTable':
+        """Build a table from PropertyRecords (or tuples in PROPERTY_KEYS order)"""
+        columns: Dict[str, List[Any]] = {key: [] for key in PROPERTY_KEYS}
+        for record in records:
+            for key, value in zip(PROPERTY_KEYS, record):
+                columns[key].append(value)
+        return cls({key: values if key in TEXT_KEYS else numeric_column(values)
+                    for key, values in columns.items()})
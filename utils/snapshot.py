@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Takeoff snapshots - BOQ table data saved next to the document for fast reload
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import FreeCAD
+
+from utils.document_observer import ChangeSet
+from utils.geometry_cache import shape_fingerprint, user_cache_dir
+from utils.instances import resolve_instance
+from utils.materials import material_name
+from utils.spatial_index import Bounds, box_bounds
+from utils.table_data import TableData
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAGIC = b"QTOSNAP\x01"
+SNAPSHOT_SUFFIX = ".qto-snapshot"
+# Per-row object signature, stored in the table data alongside the BOQ columns
+SIGNATURE_KEY = 'Signature'
+
+_HEADER_SIZE = struct.Struct('<I')
+
+
+class Snapshot(NamedTuple):
+    """Columns of a saved BOQ, keyed like the TableData they came from"""
+    columns: Dict[str, Any]
+    rows: int
+
+
+def object_signature(obj: Any, bounds: Optional[Dict[str, Bounds]] = None) -> str:
+    """
+    Hash the takeoff-relevant state of an object: identity, label,
+    material, instance count and the shape fingerprint of its geometry
+    source. Cheap enough to check every object on load; the shape is
+    only asked for its bounding box and topology counts. That box is
+    stored in ``bounds`` (when given) if the object is its own source.
+    """
+    source, count = resolve_instance(obj)
+    shape = getattr(source, 'Shape', None)
+    parts = [obj.Name, obj.Label, obj.TypeId, source.Name, str(count),
+             material_name(getattr(obj, 'Material', getattr(source, 'Material', 'Unknown')))]
+    if shape:
+        bbox = shape.BoundBox
+        parts.append(shape_fingerprint(shape, bbox))
+        if bounds is not None and source is obj:
+            bounds[obj.Name] = box_bounds(bbox)
+    for attr in ('Length', 'Width', 'Height'):
+        value = getattr(source, attr, None)
+        parts.append(str(getattr(value, 'Value', value)))
+    return hashlib.blake2b("|".join(parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def object_signatures(objects: Iterable[Any], bounds: Optional[Dict[str, Bounds]] = None) -> List[str]:
+    """Signatures of ``objects``; an object that cannot be read gets an empty one"""
+    result = []
+    for obj in objects:
+        try:
+            result.append(object_signature(obj, bounds))
+        except Exception:
+            result.append("")
+    return result
+
+
+def snapshot_path_for_document(doc: Any) -> str:
+    """Return the snapshot path for a document (next to the .FCStd when saved)"""
+    filename = getattr(doc, 'FileName', '')
+    if filename:
+        return os.path.splitext(filename)[0] + SNAPSHOT_SUFFIX
+    return os.path.join(user_cache_dir(), getattr(doc, 'Name', 'Unnamed') + SNAPSHOT_SUFFIX)
+
+
+def save_snapshot(path: str, data: TableData):
+    """
+    Write every column of ``data`` to a binary columnar file.
+
+    Layout: magic, header length, JSON header, then each numeric column
+    as raw float64 bytes followed by one JSON block with the text columns.
+    """
+    numeric, text = [], {}
+    for key in data.keys():
+        column = data.column(key)
+        if isinstance(column, array):
+            numeric.append(key)
+        else:
+            text[key] = [value if isinstance(value, str) else material_name(value) for value in column]
+    header = json.dumps({
+        'version': SNAPSHOT_VERSION,
+        'rows': len(data),
+        'byteorder': sys.byteorder,
+        'numeric': numeric,
+    }, separators=(',', ':')).encode('utf-8')
+
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as snapshot_file:
+            snapshot_file.write(SNAPSHOT_MAGIC)
+            snapshot_file.write(_HEADER_SIZE.pack(len(header)))
+            snapshot_file.write(header)
+            for key in numeric:
+                data.column(key).tofile(snapshot_file)
+            snapshot_file.write(json.dumps(text, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        os.replace(temp_path, path)
+    except OSError as e:
+        FreeCAD.Console.PrintError(f"Error saving takeoff snapshot: {e}\n")
+
+
+def load_snapshot(path: str) -> Optional[Snapshot]:
+    """Read a snapshot with a single bulk read; returns None if missing or invalid"""
+    try:
+        with open(path, 'rb') as snapshot_file:
+            raw = snapshot_file.read()
+    except OSError:
+        return None
+    try:
+        if not raw.startswith(SNAPSHOT_MAGIC):
+            return None
+        offset = len(SNAPSHOT_MAGIC)
+        (header_size,) = _HEADER_SIZE.unpack_from(raw, offset)
+        offset += _HEADER_SIZE.size
+        header = json.loads(raw[offset:offset + header_size].decode('utf-8'))
+        offset += header_size
+        if header.get('version') != SNAPSHOT_VERSION:
+            return None
+
+        rows = int(header['rows'])
+        view = memoryview(raw)
+        columns: Dict[str, Any] = {}
+        for key in header['numeric']:
+            column = array('d')
+            column.frombytes(view[offset:offset + rows * column.itemsize])
+            if header.get('byteorder') != sys.byteorder:
+                column.byteswap()
+            offset += rows * column.itemsize
+            columns[key] = column
+        columns.update(json.loads(raw[offset:].decode('utf-8')))
+        if any(len(column) != rows for column in columns.values()):
+            return None
+        return Snapshot(columns, rows)
+    except (ValueError, KeyError, struct.error, UnicodeDecodeError) as e:
+        FreeCAD.Console.PrintError(f"Ignoring invalid takeoff snapshot {path}: {e}\n")
+        return None
+
+
+def stale_changes(names: Sequence[str], signatures: Sequence[str],
+                  objects: Iterable[Any], bounds: Optional[Dict[str, Bounds]] = None) -> ChangeSet:
+    """
+    Compare snapshot rows (object ``names`` and their ``signatures``)
+    with the current ``objects``: new objects are created, objects whose
+    signature differs are changed and rows without an object are deleted.
+    ``bounds`` is filled as in object_signature.
+    """
+    saved = dict(zip(names, signatures))
+    changes = ChangeSet()
+    seen = set()
+    for obj, signature in zip(objects, object_signatures(objects, bounds)):
+        name = obj.Name
+        seen.add(name)
+        if name not in saved:
+            changes.add_created(name)
+        elif not signature or saved[name] != signature:
+            changes.add_changed(name)
+    for name in saved:
+        if name not in seen:
+            changes.add_deleted(name)
+    return changes
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+SpatialGrid - Uniform-grid index over object bounding boxes for region takeoff
+"""
+
+import math
+from bisect import bisect_left, insort
+from itertools import product
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.instances import proxy_type, resolve_instance
+
+# (XMin, YMin, ZMin, XMax, YMax, ZMax) in mm
+Bounds = Tuple[float, float, float, float, float, float]
+
+# Grid cell edge (mm); about one structural bay
+DEFAULT_CELL_SIZE = 5000.0
+# Objects covering more cells than this are kept in a list checked on every query
+MAX_CELLS_PER_OBJECT = 512
+# Tolerance (mm) for level boundaries and solid intersection tests
+TOLERANCE = 1e-6
+# IfcType/IfcRole of Arch BuildingPart levels, and the proxy type of legacy Arch Floors
+LEVEL_IFC_TYPES = ('Building Storey',)
+LEVEL_PROXY_TYPES = ('Floor',)
+
+
+def box_bounds(bbox: Any) -> Bounds:
+    """Return the bounds of a FreeCAD BoundBox"""
+    return (bbox.XMin, bbox.YMin, bbox.ZMin, bbox.XMax, bbox.YMax, bbox.ZMax)
+
+
+def object_bounds(obj: Any) -> Optional[Bounds]:
+    """
+    Return the placed bounding box of an object, or None without a shape.
+
+    The object's own Shape is used so links and arrays report where their
+    copies are; the geometry source is only a fallback.
+    """
+    shape = getattr(obj, 'Shape', None) or getattr(resolve_instance(obj).source, 'Shape', None)
+    if not shape:
+        return None
+    try:
+        return box_bounds(shape.BoundBox)
+    except Exception:
+        return None
+
+
+def is_finite(bounds: Bounds) -> bool:
+    """Return False for bounds with an infinite or NaN coordinate"""
+    return all(math.isfinite(value) for value in bounds)
+
+
+def union_bounds(bounds: Iterable[Bounds]) -> Optional[Bounds]:
+    """Return the box enclosing all ``bounds``, or None if there are none"""
+    bounds = list(bounds)
+    if not bounds:
+        return None
+    return (min(b[0] for b in bounds), min(b[1] for b in bounds), min(b[2] for b in bounds),
+            max(b[3] for b in bounds), max(b[4] for b in bounds), max(b[5] for b in bounds))
+
+
+def intersects(a: Bounds, b: Bounds) -> bool:
+    """Return True if two boxes overlap or touch"""
+    return (a[0] <= b[3] and b[0] <= a[3] and a[1] <= b[4] and b[1] <= a[4]
+            and a[2] <= b[5] and b[2] <= a[5])
+
+
+class SpatialGrid:
+    """
+    Object names indexed by bounding box on a uniform 3D grid.
+
+    Each object is registered in every cell its box covers, so a box query
+    only visits the cells of the query box; very large objects are kept
+    aside and checked directly. Bottom elevations are also kept sorted,
+    so level queries are a binary search. Objects are added, moved and
+    removed one at a time as the document changes.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self._bounds: Dict[str, Bounds] = {}
+        self._cells: Dict[Tuple[int, int, int], Set[str]] = {}
+        self._oversized: Set[str] = set()
+        self._bottoms: List[Tuple[float, str]] = []  # (ZMin, name), sorted
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._bounds
+
+    def bounds(self, name: str) -> Optional[Bounds]:
+        """Return the indexed bounding box of an object"""
+        return self._bounds.get(name)
+
+    def _cell_range(self, bounds: Bounds) -> List[range]:
+        size = self.cell_size
+        return [range(math.floor(bounds[axis] / size), math.floor(bounds[axis + 3] / size) + 1)
+                for axis in range(3)]
+
+    @staticmethod
+    def _cell_count(ranges: List[range]) -> int:
+        # len() of a range overflows for FreeCAD's huge void boxes
+        return math.prod(r.stop - r.start for r in ranges)
+
+    def insert(self, name: str, bounds: Bounds):
+        """Index (or re-index) an object's bounding box"""
+        if name in self._bounds:
+            self.remove(name)
+        self._bounds[name] = bounds
+        if bounds[2] == bounds[2]:
+            # A NaN bottom cannot be sorted, so such an object is on no level
+            insort(self._bottoms, (bounds[2], name))
+        # Non-finite boxes have no cell range and are checked on every query
+        ranges = self._cell_range(bounds) if is_finite(bounds) else None
+        if ranges is None or self._cell_count(ranges) > MAX_CELLS_PER_OBJECT:
+            self._oversized.add(name)
+            return
+        for cell in product(*ranges):
+            self._cells.setdefault(cell, set()).add(name)
+
+    def remove(self, name: str):
+        """Remove an object from the index (no-op if it is not indexed)"""
+        bounds = self._bounds.pop(name, None)
+        if bounds is None:
+            return
+        if bounds[2] == bounds[2]:
+            del self._bottoms[bisect_left(self._bottoms, (bounds[2], name))]
+        if name in self._oversized:
+            self._oversized.discard(name)
+            return
+        for cell in product(*self._cell_range(bounds)):
+            names = self._cells[cell]
+            names.discard(name)
+            if not names:
+                del self._cells[cell]
+
+    def insert_objects(self, objects: Iterable[Any], known: Optional[Dict[str, Bounds]] = None):
+        """
+        Index the bounding boxes of ``objects``; objects without a shape are removed.
+
+        ``known`` holds bounds already read by name (e.g. filled by
+        extract_properties), so those shapes are not asked again.
+        """
+        known = known or {}
+        for obj in objects:
+            bounds = known.get(obj.Name) or object_bounds(obj)
+            if bounds is None:
+                self.remove(obj.Name)
+            else:
+                self.insert(obj.Name, bounds)
+
+    def clear(self):
+        """Remove every object"""
+        self._bounds, self._cells, self._oversized, self._bottoms = {}, {}, set(), []
+
+    def query_box(self, bounds: Bounds) -> Set[str]:
+        """Return the objects whose bounding box overlaps ``bounds``"""
+        if not is_finite(bounds):
+            return {name for name, box in self._bounds.items() if intersects(box, bounds)}
+        ranges = self._cell_range(bounds)
+        if self._cell_count(ranges) <= len(self._cells):
+            cells = (self._cells.get(cell) for cell in product(*ranges))
+        else:
+            # Query box larger than the occupied grid: scan the occupied cells
+            cells = (names for cell, names in self._cells.items()
+                     if all(r.start <= index < r.stop for r, index in zip(ranges, cell)))
+        candidates = set(self._oversized)
+        for names in cells:
+            if names:
+                candidates.update(names)
+        return {name for name in candidates if intersects(self._bounds[name], bounds)}
+
+    def query_level(self, bottom: float, top: float) -> Set[str]:
+        """
+        Return the objects that start on a level: bounding box bottom in
+        ``[bottom, top)``, so every object belongs to exactly one level.
+        """
+        start = bisect_left(self._bottoms, (bottom - TOLERANCE, ''))
+        stop = bisect_left(self._bottoms, (top - TOLERANCE, ''))
+        return {name for _, name in self._bottoms[start:stop]}
+
+
+def intersects_solid(shape: Any, other: Any) -> bool:
+    """Return True if two shapes share volume (touching faces do not count)"""
+    try:
+        return shape.common(other).Volume > TOLERANCE
+    except Exception:
+        return False
+
+
+def query_solid(index: SpatialGrid, solid: Any, get_object: Callable[[str], Any]) -> Set[str]:
+    """
+    Return the names of objects intersecting the shape of ``solid``:
+    candidates come from the grid, only they get an exact boolean test.
+    """
+    shape = solid.Shape
+    bbox = shape.BoundBox
+    candidates = index.query_box((bbox.XMin, bbox.YMin, bbox.ZMin, bbox.XMax, bbox.YMax, bbox.ZMax))
+    candidates.discard(solid.Name)
+    result = set()
+    for name in candidates:
+        obj = get_object(name)
+        other = getattr(obj, 'Shape', None) if obj is not None else None
+        if other and intersects_solid(shape, other):
+            result.add(name)
+    return result
+
+
+def is_level(obj: Any) -> bool:
+    """Return True for a building storey (Arch BuildingPart level or Arch Floor)"""
+    if proxy_type(obj) in LEVEL_PROXY_TYPES:
+        return True
+    return any(str(getattr(obj, attr, '') or '') in LEVEL_IFC_TYPES for attr in ('IfcType', 'IfcRole'))
+
+
+def level_range(level: Any) -> Optional[Tuple[float, float]]:
+    """
+    Return the (bottom, top) elevation in mm of a level object (Arch
+    BuildingPart/Floor with a Height), or None if ``level`` is not a
+    level (e.g. a wall, which has a Height too) or has no height.
+    """
+    if not is_level(level):
+        return None
+    height = getattr(level, 'Height', None)
+    height = float(getattr(height, 'Value', height) or 0.0)
+    if height <= 0:
+        return None
+    get_placement = getattr(level, 'getGlobalPlacement', None)
+    placement = get_placement() if get_placement else getattr(level, 'Placement', None)
+    bottom = float(placement.Base.z) if placement is not None else 0.0
+    return bottom, bottom + height
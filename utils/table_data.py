@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+TableData - Columnar row storage and per-column rules for table views
+"""
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from utils.property_table import INTEGER_KEYS, PropertyTable
+
+# Background colour rule: value -> (r, g, b) or None
+ColorRule = Callable[[Any], Optional[Tuple[int, int, int]]]
+# Note rule: value of the note column -> note text (tooltip), or None
+NoteRule = Callable[[Any], Optional[str]]
+# Lazy column provider: rows -> {column key: values for those rows}
+LazyProvider = Callable[[List[int]], Dict[str, Sequence[float]]]
+
+# Rows computed together when a lazy cell is first needed
+LAZY_BATCH_SIZE = 100
+
+
+class ColumnSpec:
+    """
+    Describes one table column: storage kind, display format and the
+    rules (editability, background colour) that apply to every cell.
+
+    A ``note`` rule annotates cells from another column of the same row
+    (``note_key``), e.g. how precisely a quantity was measured.
+    """
+
+    def __init__(self, key: str, header: str, numeric: bool = False,
+                 formatter: Callable[[Any], str] = str, editable: bool = False,
+                 background: Optional[ColorRule] = None, width: int = 100,
+                 note_key: Optional[str] = None, note: Optional[NoteRule] = None):
+        self.key = key
+        self.header = header
+        self.numeric = numeric
+        self.formatter = formatter
+        self.editable = editable
+        self.background = background
+        self.width = width
+        self.note_key = note_key
+        self.note = note
+
+
+class TableData:
+    """
+    Column-oriented storage for table rows.
+
+    Numeric columns are ``array('d')`` and text columns are lists; display
+    strings are only produced on demand through the column formatter.
+
+    Numeric columns can be declared lazy with ``set_lazy``: their NaN
+    cells are filled by a provider the first time they are read, so
+    expensive values are only computed for rows that are shown or exported.
+
+    Every change advances ``column_version`` of the columns it touches,
+    so values derived from a column (e.g. sort orders) know when to update.
+    """
+
+    def __init__(self, specs: Sequence[ColumnSpec], extra_keys: Iterable[str] = ()):
+        self.specs: List[ColumnSpec] = list(specs)
+        self._columns: Dict[str, Any] = {}
+        for spec in self.specs:
+            self._columns[spec.key] = array('d') if spec.numeric else []
+        # Columns kept alongside the visible ones (e.g. Label for searching)
+        for key in extra_keys:
+            self._columns.setdefault(key, [])
+        self._lazy_keys: Tuple[str, ...] = ()
+        self._lazy_provider: Optional[LazyProvider] = None
+        self._on_resolved: Optional[Callable[[List[int]], None]] = None
+        self.lazy_batch_size = LAZY_BATCH_SIZE
+        self._change_count = 0
+        self._rows_version = 0  # Last change of the rows (append/remove/replace)
+        self._versions: Dict[str, int] = {}  # Column key -> last change of its values
+
+    def __len__(self) -> int:
+        return len(self._columns[self.specs[0].key])
+
+    def keys(self):
+        """Return the stored column names"""
+        return self._columns.keys()
+
+    def column(self, key: str) -> Any:
+        """Return a whole column"""
+        return self._columns[key]
+
+    def is_numeric(self, key: str) -> bool:
+        """Return True for a numeric column"""
+        return isinstance(self._columns[key], array)
+
+    def is_lazy(self, key: str) -> bool:
+        """Return True for a column filled by the lazy provider"""
+        return key in self._lazy_keys
+
+    def column_version(self, key: str) -> int:
+        """Return a number that changes whenever column ``key`` or the rows change"""
+        return max(self._versions.get(key, 0), self._rows_version)
+
+    def _changed(self, keys: Optional[Iterable[str]] = None):
+        """Record a change of ``keys`` (default: the rows, i.e. every column)"""
+        self._change_count += 1
+        if keys is None:
+            self._rows_version = self._change_count
+        else:
+            for key in keys:
+                self._versions[key] = self._change_count
+
+    def value(self, row: int, key: str) -> Any:
+        """Return one raw cell value, computing pending lazy cells first"""
+        value = self._columns[key][row]
+        if value != value and key in self._lazy_keys:
+            # NaN marks a lazy cell that has not been computed yet
+            self.resolve(range(row, min(row + self.lazy_batch_size, len(self))))
+            value = self._columns[key][row]
+        return value
+
+    def set_value(self, row: int, key: str, value: Any):
+        """Set one raw cell value"""
+        column = self._columns[key]
+        column[row] = float(value) if isinstance(column, array) else value
+        self._changed((key,))
+
+    def set_column(self, key: str, values: Iterable[Any]):
+        """Replace a whole column (same length as the table)"""
+        column = self._columns[key]
+        self._columns[key] = array('d', values) if isinstance(column, array) else list(values)
+        self._changed((key,))
+
+    def replace_columns(self, columns: Dict[str, Sequence[Any]], rows: int):
+        """
+        Replace every column at once with ``rows`` rows (e.g. from a saved
+        snapshot); columns missing from ``columns`` default to 0 / empty string.
+        """
+        for key, column in self._columns.items():
+            values = columns.get(key)
+            if values is None:
+                values = [0.0 if isinstance(column, array) else ""] * rows
+            self._columns[key] = array('d', values) if isinstance(column, array) else list(values)
+        self._changed()
+
+    def display(self, row: int, col: int) -> str:
+        """Return the display string of a cell"""
+        spec = self.specs[col]
+        return spec.formatter(self.value(row, spec.key))
+
+    def note(self, row: int, col: int) -> Optional[str]:
+        """Return the note of a cell (see ColumnSpec.note), or None"""
+        spec = self.specs[col]
+        if spec.note is None or spec.note_key not in self._columns:
+            return None
+        return spec.note(self._columns[spec.note_key][row])
+
+    def headers(self) -> List[str]:
+        """Return the column headers"""
+        return [spec.header for spec in self.specs]
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> Iterator[List[Any]]:
+        """
+        Yield rows as raw values in column order (numbers stay numeric),
+        for all rows or only ``rows``.
+        """
+        rows = range(len(self)) if rows is None else list(rows)
+        self.resolve(rows)
+        columns = [(spec.key in INTEGER_KEYS, spec.numeric, self._columns[spec.key])
+                   for spec in self.specs]
+        for row in rows:
+            values = []
+            for integer, numeric, column in columns:
+                value = column[row]
+                if integer:
+                    value = int(value)
+                elif not numeric and not isinstance(value, str):
+                    value = str(getattr(value, 'Label', value))
+                values.append(value)
+            yield values
+
+    def set_lazy(self, keys: Iterable[str], provider: LazyProvider,
+                 on_resolved: Optional[Callable[[List[int]], None]] = None):
+        """
+        Declare ``keys`` as lazy columns filled by ``provider(rows)``.
+
+        The provider is called with batches of row numbers and must return
+        a value for every requested row and key. ``on_resolved(rows)`` is
+        called after the values of a batch were stored.
+        """
+        self._lazy_keys = tuple(keys)
+        self._lazy_provider = provider
+        self._on_resolved = on_resolved
+
+    def is_pending(self, row: int, key: str) -> bool:
+        """Return True if a lazy cell has not been computed yet"""
+        value = self._columns[key][row]
+        return value != value
+
+    def resolve(self, rows: Optional[Iterable[int]] = None):
+        """Compute the pending lazy cells of ``rows`` (default: every row)"""
+        if self._lazy_provider is None:
+            return
+        lazy_columns = [self._columns[key] for key in self._lazy_keys]
+        pending = [row for row in (range(len(self)) if rows is None else rows)
+                   if any(column[row] != column[row] for column in lazy_columns)]
+        for start in range(0, len(pending), self.lazy_batch_size):
+            batch = pending[start:start + self.lazy_batch_size]
+            for key, values in self._lazy_provider(batch).items():
+                column = self._columns[key]
+                for row, value in zip(batch, values):
+                    column[row] = float(value)
+            # A value the provider could not compute must not be retried forever
+            for column in lazy_columns:
+                for row in batch:
+                    if column[row] != column[row]:
+                        column[row] = 0.0
+            self._changed(self._lazy_keys)
+            if self._on_resolved is not None:
+                self._on_resolved(batch)
+
+    def snapshot(self) -> 'TableData':
+        """
+        Return a copy whose columns are independent of further edits.
+
+        Lazy cells are copied as they are; call ``resolve`` first when the
+        copy is read where the provider cannot run (e.g. another thread).
+        """
+        copy = TableData(self.specs)
+        copy._columns = {key: column[:] for key, column in self._columns.items()}
+        return copy
+
+    def clear(self):
+        """Remove all rows"""
+        for key, column in self._columns.items():
+            self._columns[key] = array('d') if isinstance(column, array) else []
+        self._changed()
+
+    def append_properties(self, properties: PropertyTable,
+                          extra: Optional[Dict[str, Sequence[Any]]] = None) -> range:
+        """
+        Append the rows of a PropertyTable; columns it does not provide are
+        taken from ``extra`` or default to 0 / empty string.
+
+        Returns the range of new row numbers.
+        """
+        start = len(self)
+        count = len(properties)
+        extra = extra or {}
+        for key, column in self._columns.items():
+            if key in extra:
+                values = extra[key]
+            elif key in properties.keys():
+                values = properties.column(key)
+            else:
+                values = [0.0 if isinstance(column, array) else ""] * count
+            if isinstance(column, array):
+                column.extend(float(value) for value in values)
+            else:
+                column.extend(values)
+        self._changed()
+        return range(start, start + count)
+
+    def update_properties(self, row: int, properties: PropertyTable, index: int):
+        """Overwrite the property columns of ``row`` with row ``index`` of ``properties``"""
+        for key in properties.keys():
+            if key in self._columns:
+                self.set_value(row, key, properties.value(index, key))
+
+    def remove_rows(self, rows: Iterable[int]):
+        """Remove the given rows"""
+        removed = set(rows)
+        if not removed:
+            return
+        for key, column in self._columns.items():
+            kept = (value for row, value in enumerate(column) if row not in removed)
+            self._columns[key] = array('d', kept) if isinstance(column, array) else list(kept)
+        self._changed()
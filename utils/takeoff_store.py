@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+TakeoffStore - Per-document takeoff values shared by every dialog and command
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import FreeCAD
+
+from utils.approximation import EXACT, PRECISION_KEY
+from utils.document_observer import ChangeSet, DocumentObserver
+from utils.extraction import LAZY_KEYS, extract_properties, is_live, measure_objects
+from utils.face_quantities import extract_face_quantities
+from utils.geometry_cache import cache_for_document
+from utils.instances import resolve_instance
+from utils.materials import catalog_for_document
+from utils.measure_executor import default_executor
+from utils.profiling import count
+from utils.property_table import FACE_KEYS, PropertyRecord, PropertyTable
+from utils.spatial_index import Bounds
+
+NAN = float('nan')
+
+
+class StoreSubscription:
+    """
+    One view's connection to a TakeoffStore: document changes recorded
+    for the view since its last ``take_changes``.
+
+    Offers the same ``document_name``/``document_closed``/``take_changes``
+    interface as DocumentObserver, so a view can use either.
+    """
+
+    def __init__(self, store: 'TakeoffStore', on_change: Optional[Callable[[], None]] = None):
+        self.store = store
+        self.document_name = store.document_name
+        self.on_change = on_change
+        self._changes = ChangeSet()
+
+    @property
+    def document_closed(self) -> bool:
+        return self.store.closed
+
+    def take_changes(self) -> ChangeSet:
+        """Return the pending changes and start a new change set"""
+        changes, self._changes = self._changes, ChangeSet()
+        return changes
+
+    def close(self):
+        """Stop receiving changes"""
+        self.store.unsubscribe(self)
+
+
+class TakeoffStore:
+    """
+    Takeoff values of one document, extracted once and shared by views.
+
+    Property rows, approximate rows (see utils.approximation) and measured
+    quantities (Volume/Area/weight and face quantities) are kept per
+    object name. One document observer feeds the
+    store: an edited object (and every link, clone or array of it) is
+    dropped so its next read re-extracts it, and the change is passed on
+    to each subscribed view.
+    """
+
+    def __init__(self, doc: Any):
+        self.document_name = doc.Name
+        self.cache = cache_for_document(doc)
+        self.catalog = catalog_for_document(doc)
+        self.closed = False
+        self._records: Dict[str, PropertyRecord] = {}  # Name -> record (lazy keys NaN)
+        self._estimates: Dict[str, Tuple[PropertyRecord, str]] = {}  # Name -> (approximate record, tier)
+        self._values: Dict[str, Dict[str, float]] = {}  # Name -> measured quantities
+        self.bounds: Dict[str, Bounds] = {}  # Name -> bounding box read while extracting
+        self._instances: Dict[str, Set[str]] = {}  # Source name -> names measured from it
+        self._subscriptions: List[StoreSubscription] = []
+        self.observer = DocumentObserver(doc, self._document_changed)
+
+    # Views
+
+    def subscribe(self, on_change: Optional[Callable[[], None]] = None) -> StoreSubscription:
+        """Register a view; ``on_change`` is called after every recorded change"""
+        subscription = StoreSubscription(self, on_change)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: StoreSubscription):
+        """Remove a view (no-op if it is not subscribed)"""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def _document_changed(self):
+        changes = self.observer.take_changes()
+        if self.observer.document_closed:
+            self.closed = True
+        self.invalidate(changes.changed | changes.deleted)
+        for subscription in list(self._subscriptions):
+            pending = subscription._changes
+            for name in changes.created:
+                pending.add_created(name)
+            for name in changes.changed:
+                pending.add_changed(name)
+            for name in changes.deleted:
+                pending.add_deleted(name)
+            if subscription.on_change is not None:
+                subscription.on_change()
+
+    def invalidate(self, names: Iterable[str]):
+        """Forget the values of objects (and of their links, clones and arrays)"""
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            self._records.pop(name, None)
+            self._estimates.pop(name, None)
+            self._values.pop(name, None)
+            self.bounds.pop(name, None)
+            pending.extend(self._instances.pop(name, ()))
+
+    # Values
+
+    def _track_instances(self, objects: Sequence[Any]):
+        for obj in objects:
+            source = resolve_instance(obj).source
+            if source is not obj:
+                self._instances.setdefault(source.Name, set()).add(obj.Name)
+
+    def properties(self, objects: Sequence[Any], approximate: bool = False) -> PropertyTable:
+        """
+        Return the property rows of ``objects``; only objects not seen
+        since their last change are extracted. Quantities measured before
+        are filled in, the others are NaN for a lazy provider, or
+        estimated (with a PRECISION_KEY column) if ``approximate``.
+        """
+        if approximate:
+            return self._approximate_properties(objects)
+        missing = [obj for obj in objects if obj.Name not in self._records]
+        count('store.hit', len(objects) - len(missing))
+        if missing:
+            count('store.miss', len(missing))
+            for record in extract_properties(missing, self.cache, measure=False, bounds=self.bounds).records():
+                self._records[record.Name] = record
+            self._track_instances(missing)
+
+        records = []
+        for obj in objects:
+            record = self._records[obj.Name]
+            values = self._values.get(obj.Name)
+            if values is not None and all(key in values for key in LAZY_KEYS):
+                record = record._replace(**{key: values[key] for key in LAZY_KEYS})
+            records.append(record)
+        return PropertyTable.from_records(records)
+
+    def _approximate_properties(self, objects: Sequence[Any]) -> PropertyTable:
+        missing = [obj for obj in objects if obj.Name not in self._estimates]
+        count('store.hit', len(objects) - len(missing))
+        if missing:
+            count('store.miss', len(missing))
+            table = extract_properties(missing, catalog=self.catalog, bounds=self.bounds, approximate=True)
+            for record, tier in zip(table.records(), table.column(PRECISION_KEY)):
+                self._estimates[record.Name] = (record, tier)
+            self._track_instances(missing)
+
+        records, tiers = [], []
+        for obj in objects:
+            record, tier = self._estimates[obj.Name]
+            values = self._values.get(obj.Name)
+            if values is not None and all(key in values for key in LAZY_KEYS):
+                # Measured before: exact values cost nothing
+                record = record._replace(**{key: values[key] for key in LAZY_KEYS})
+                tier = EXACT
+            records.append(record)
+            tiers.append(tier)
+        table = PropertyTable.from_records(records)
+        table.add_column(PRECISION_KEY, tiers)
+        return table
+
+    def iter_properties(self, objects: Sequence[Any], chunk_size: int,
+                        approximate: bool = False) -> Iterator[Tuple[List[Any], PropertyTable]]:
+        """
+        Yield ``(objects, properties)`` for chunks of ``chunk_size`` of
+        ``objects``. Objects deleted before their chunk is reached are
+        left out, so edits made while loading do not stop the load.
+        """
+        for start in range(0, len(objects), chunk_size):
+            chunk = [obj for obj in objects[start:start + chunk_size] if is_live(obj)]
+            yield chunk, self.properties(chunk, approximate)
+
+    def measure(self, objects: Sequence[Any], keys: Sequence[str] = LAZY_KEYS) -> Dict[str, List[float]]:
+        """
+        Return ``keys`` (LAZY_KEYS and/or FACE_KEYS) for ``objects``,
+        measuring only objects without stored values; ``None`` entries
+        measure as 0.
+        """
+        for group, measure in ((LAZY_KEYS, self._measure_lazy), (FACE_KEYS, self._measure_faces)):
+            if not any(key in group for key in keys):
+                continue
+            missing = [obj for obj in objects if obj is not None
+                       and not all(key in self._values.get(obj.Name, ()) for key in group)]
+            if missing:
+                measure(missing)
+                self._track_instances(missing)
+        return {key: [self._values.get(obj.Name, {}).get(key, 0.0) if obj is not None else 0.0
+                      for obj in objects]
+                for key in keys}
+
+    def _store(self, objects: Sequence[Any], columns: Dict[str, Sequence[float]]):
+        for key, values in columns.items():
+            for obj, value in zip(objects, values):
+                self._values.setdefault(obj.Name, {})[key] = float(value)
+
+    def _measure_lazy(self, objects: Sequence[Any]):
+        self._store(objects, measure_objects(objects, self.cache, self.catalog, default_executor()))
+
+    def _measure_faces(self, objects: Sequence[Any]):
+        table = extract_face_quantities(objects)
+        self._store(objects, {key: table.column(key) for key in FACE_KEYS})
+
+    def known_values(self, objects: Sequence[Any], keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Return stored ``keys`` of ``objects`` without measuring (NaN if not measured yet)"""
+        return {key: [self._values.get(obj.Name, {}).get(key, NAN) for obj in objects] for key in keys}
+
+    def save(self):
+        """Persist measured volumes and areas to the geometry cache"""
+        self.cache.save()
+
+
+# Process-wide stores, one per open document
+_stores: Dict[str, TakeoffStore] = {}
+
+
+def store_for_document(doc: Any) -> TakeoffStore:
+    """
+    Return the shared TakeoffStore of ``doc``, creating it (and
+    registering its document observer) on first use.
+    """
+    for name, store in list(_stores.items()):
+        if store.closed:
+            # Observers are removed here rather than from their own callback
+            _remove_observer(store)
+            del _stores[name]
+    store = _stores.get(doc.Name)
+    if store is None:
+        store = _stores[doc.Name] = TakeoffStore(doc)
+        add_observer = getattr(FreeCAD, 'addDocumentObserver', None)
+        if add_observer is not None:
+            add_observer(store.observer)
+    return store
+
+
+def _remove_observer(store: TakeoffStore):
+    remove_observer = getattr(FreeCAD, 'removeDocumentObserver', None)
+    if remove_observer is not None:
+        remove_observer(store.observer)